@@ -0,0 +1,206 @@
+"""Compilación por lotes: reparte archivos .js entre un pool de procesos.
+
+Cada proceso trabajador construye su propia `CompilerSession` una sola vez (en el
+inicializador del pool) y la reutiliza para todos los archivos que recibe. Los
+resultados se emiten como líneas JSON a medida que terminan, en el orden en que
+se completan y no en el de entrada.
+
+Los errores de cada archivo pasan por un `DiagnosticEngine` propio que descarta
+repetidos y se queda con los `--max-diagnostics` primeros; además de los campos
+de texto de siempre, cada resultado los lleva estructurados en `"diagnostics"`.
+Con `--diagnostics-out` se escriben también, uno por línea JSON, en un archivo
+aparte.
+
+Uso:
+    python analisis_semantico/batch.py ejemplos/ 'src/**/*.js' -j 8
+    python analisis_semantico/batch.py src/ --max-diagnostics 20 --diagnostics-out diag.jsonl
+"""
+import sys
+import os
+import glob
+import json
+import time
+from multiprocessing import Pool, cpu_count
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.cache import CompilationCache
+from comun.diagnostics import Diagnostic, DiagnosticEngine, JsonLinesSink
+from analisis_semantico.semantic import LEXER_BACKENDS
+from analisis_semantico.session import CompilerSession
+
+
+SOURCE_EXTENSIONS = ('.js',)
+DEFAULT_MAX_DIAGNOSTICS = 100
+
+# Sesión por proceso trabajador (la crea `_init_worker`)
+_worker_session: Optional[CompilerSession] = None
+# incluir en cada resultado el informe de `instrumentation` (sin caché)
+_worker_stats = False
+# máximo de diagnósticos por archivo (None: sin límite)
+_worker_max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """Expande directorios (recursivamente), globs y archivos sueltos a una lista ordenada y sin duplicados."""
+    found = []
+    seen = set()
+
+    def add(path):
+        path = os.path.abspath(path)
+        if path not in seen:
+            seen.add(path)
+            found.append(path)
+
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                # `os.walk` recorre en el orden del sistema de archivos: se fija
+                # para que la salida sea la misma en cualquier máquina
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(SOURCE_EXTENSIONS):
+                        add(os.path.join(root, name))
+        elif glob.has_magic(pattern):
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                if os.path.isfile(path):
+                    add(path)
+        else:
+            add(pattern)
+    return found
+
+
+def _init_worker(use_cache: bool = False, cache_dir: Optional[str] = None, lexer_backend: str = 'ply',
+                 stats: bool = False, max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS):
+    global _worker_session, _worker_stats, _worker_max_diagnostics
+    cache = CompilationCache(cache_dir) if use_cache and not stats else None
+    _worker_session = CompilerSession(cache=cache, lexer_backend=lexer_backend)
+    _worker_stats = stats
+    _worker_max_diagnostics = max_diagnostics
+
+
+def compile_with_session(session: CompilerSession, path: str, code: Optional[str] = None, stats: bool = False,
+                         max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS):
+    """Analiza `path` (o `code`, si se da, con ese nombre) con `session`.
+
+    Devuelve `(result, tree)`: el resultado serializable de una línea del lote y
+    el AST (None si no se pudo construir).
+    """
+    start = time.perf_counter()
+    result = {"file": path, "ast": "error", "symbols": 0, "syntax_errors": [], "lex_errors": [], "errors": [],
+              "diagnostics": [], "suppressed": 0}
+    engine = DiagnosticEngine(file=path, max_per_file=max_diagnostics)
+    tree = None
+    try:
+        if code is None:
+            with open(path, 'r', encoding='utf8') as fh:
+                code = fh.read()
+        cache = session.cache
+        hits = cache.hits if cache is not None else 0
+        report = None
+        if stats:
+            tree, analyzer, report = session.profile(code, file=path, diagnostics=engine)
+        else:
+            tree, analyzer = session.compile(code, diagnostics=engine)
+        result["cached"] = cache is not None and cache.hits > hits
+        result["lex_errors"] = [d.message for d in analyzer.lex_diagnostics]
+        result["syntax_errors"] = [e.to_dict() for e in analyzer.syntax_errors]
+        # partial: el parser se recuperó de errores y el árbol solo tiene lo que sí parseó
+        result["ast"] = "error" if tree is None else ("partial" if analyzer.syntax_errors else "ok")
+        result["symbols"] = len(analyzer.table.all_symbols())
+        result["errors"] = list(analyzer.errors)
+        if report is not None:
+            result["stats"] = report.to_dict()
+    except Exception as e:
+        result["ast"] = "exception"
+        result["errors"] = [f"{type(e).__name__}: {e}"]
+    result["diagnostics"] = [d.to_dict() for d in engine.diagnostics]
+    result["suppressed"] = engine.suppressed
+    result["ok"] = result["ast"] == "ok" and not result["errors"] and not result["lex_errors"]
+    result["time_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result, tree
+
+
+def compile_file(path: str) -> Dict:
+    """Analiza un archivo con la sesión del proceso actual y devuelve un resultado serializable."""
+    if _worker_session is None:
+        _init_worker()
+    return compile_with_session(_worker_session, path, stats=_worker_stats,
+                                max_diagnostics=_worker_max_diagnostics)[0]
+
+
+def compile_files(paths: List[str], jobs: Optional[int] = None, chunksize: int = 4,
+                  use_cache: bool = False, cache_dir: Optional[str] = None,
+                  lexer_backend: str = 'ply', stats: bool = False,
+                  max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS) -> Iterator[Dict]:
+    """Compila `paths` en paralelo y va produciendo los resultados según terminan.
+
+    Con `jobs=1` no se crea pool: los archivos se procesan en el proceso actual.
+    Con `stats` cada resultado lleva el informe por fases en `"stats"`.
+    """
+    jobs = jobs or cpu_count()
+    if jobs <= 1 or len(paths) <= 1:
+        _init_worker(use_cache, cache_dir, lexer_backend, stats, max_diagnostics)
+        for path in paths:
+            yield compile_file(path)
+        return
+    with Pool(processes=min(jobs, len(paths)), initializer=_init_worker,
+              initargs=(use_cache, cache_dir, lexer_backend, stats, max_diagnostics)) as pool:
+        for result in pool.imap_unordered(compile_file, paths, chunksize=chunksize):
+            yield result
+
+
+def run_batch(patterns: Iterable[str], out=None, jobs: Optional[int] = None, chunksize: int = 4,
+              use_cache: bool = False, cache_dir: Optional[str] = None, lexer_backend: str = 'ply',
+              stats: bool = False, max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS,
+              diagnostics_out=None) -> int:
+    """Escribe una línea JSON por archivo en `out` y devuelve el número de archivos con errores.
+
+    Si se da `diagnostics_out` (un archivo de texto abierto), cada diagnóstico se
+    escribe además en él como una línea JSON.
+    """
+    out = out or sys.stdout
+    sink = JsonLinesSink(diagnostics_out) if diagnostics_out is not None else None
+    paths = expand_paths(patterns)
+    failed = 0
+    for result in compile_files(paths, jobs=jobs, chunksize=chunksize, use_cache=use_cache, cache_dir=cache_dir,
+                                lexer_backend=lexer_backend, stats=stats, max_diagnostics=max_diagnostics):
+        if not result["ok"]:
+            failed += 1
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+        if sink is not None:
+            for data in result["diagnostics"]:
+                sink.emit(Diagnostic.from_dict(data))
+    print(f"{len(paths)} archivos, {failed} con errores", file=sys.stderr)
+    return failed
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Compilación por lotes con salida en líneas JSON')
+    arg_parser.add_argument('paths', nargs='+', help='Directorios, globs o archivos .js')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None, help='Procesos trabajadores (por defecto: todos los núcleos)')
+    arg_parser.add_argument('--chunksize', type=int, default=4, help='Archivos enviados a cada trabajador por tanda')
+    arg_parser.add_argument('--no-cache', action='store_true', help='No leer ni escribir la caché de compilación')
+    arg_parser.add_argument('--cache-dir', default=None, help='Directorio de la caché (por defecto ~/.cache/compilador)')
+    arg_parser.add_argument('--lexer', choices=LEXER_BACKENDS, default='ply', help='Lexer a usar (fast: scanner de una sola regex)')
+    arg_parser.add_argument('--stats', action='store_true', help='Añadir tiempos por fase y contadores a cada resultado (sin caché)')
+    arg_parser.add_argument('--max-diagnostics', type=int, default=DEFAULT_MAX_DIAGNOSTICS,
+                            help='Diagnósticos por archivo como máximo (0: sin límite)')
+    arg_parser.add_argument('--diagnostics-out', default=None, help='Escribir los diagnósticos como líneas JSON en este archivo')
+    args = arg_parser.parse_args()
+
+    diagnostics_out = open(args.diagnostics_out, 'w', encoding='utf8') if args.diagnostics_out else None
+    try:
+        failed = run_batch(args.paths, jobs=args.jobs, chunksize=args.chunksize,
+                           use_cache=not args.no_cache, cache_dir=args.cache_dir, lexer_backend=args.lexer,
+                           stats=args.stats, max_diagnostics=args.max_diagnostics or None,
+                           diagnostics_out=diagnostics_out)
+    finally:
+        if diagnostics_out is not None:
+            diagnostics_out.close()
+    sys.exit(1 if failed else 0)
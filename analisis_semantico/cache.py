@@ -0,0 +1,264 @@
+"""Caché persistente de compilaciones, direccionada por contenido.
+
+Cada entrada guarda el AST serializado, el contenido de la `SymbolTable` y los
+diagnósticos léxicos y semánticos de un fuente (sin archivo: se vuelven a
+informar con el del que consulta). La clave es el SHA-256 del código más
+una marca de versión calculada a partir del lexer, la gramática y el analizador,
+de modo que cualquier cambio en el compilador invalida las entradas anteriores.
+
+Las entradas son archivos JSON en `<dir>/<2 primeros hex>/<clave>.json`. El
+tamaño total está acotado: al superarse `max_bytes` se borran las entradas usadas
+hace más tiempo (LRU por `mtime`, que se actualiza en cada acierto).
+
+Solo se cachean los fuentes que parsean: un fuente con errores de sintaxis se
+está editando y no tiene sentido guardarlo.
+"""
+import sys
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, List, Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import SemanticAnalyzer, Symbol, SymbolTable, get_parser_module
+from comun.diagnostics import Diagnostic
+from analisis_semantico.names import NameTable
+
+CACHE_FORMAT = 4
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Archivos cuyo contenido forma parte de la marca de versión
+VERSIONED_SOURCES = [
+    os.path.join(_REPO_ROOT, 'lexer', 'lexer.py'),
+    os.path.join(_REPO_ROOT, 'lexer', 'fastlexer.py'),
+    os.path.join(_REPO_ROOT, 'parser', 'parser.py'),
+    os.path.join(_REPO_ROOT, 'analisis_semantico', 'semantic.py'),
+    os.path.join(_REPO_ROOT, 'analisis_semantico', 'visitor.py'),
+    os.path.join(_REPO_ROOT, 'analisis_semantico', 'names.py'),
+    os.path.join(_REPO_ROOT, 'comun', 'diagnostics.py'),
+]
+
+_version_stamp: Optional[str] = None
+
+
+def default_cache_dir() -> str:
+    env = os.environ.get('COMPILADOR_CACHE_DIR')
+    if env:
+        return env
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'compilador')
+
+
+def version_stamp() -> str:
+    """Hash del lexer, la gramática y el analizador (se calcula una vez por proceso)."""
+    global _version_stamp
+    if _version_stamp is None:
+        h = hashlib.sha256(f"format={CACHE_FORMAT}".encode())
+        for path in VERSIONED_SOURCES:
+            with open(path, 'rb') as fh:
+                h.update(fh.read())
+        _version_stamp = h.hexdigest()
+    return _version_stamp
+
+
+# -----------------------------
+# Serialización
+# -----------------------------
+def data_value(node):
+    """Valor de `node` para los formatos serializados: las declaraciones van como `"var x"`."""
+    return str(node.value) if node.type == 'declaration' and node.value else node.value
+
+
+def tree_to_data(tree) -> List[list]:
+    """Aplana el árbol en preorden como `[type, value, nº de hijos, start, end, lineno]` (sin recursión)."""
+    out = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        out.append([node.type, data_value(node), len(node.children), node.start, node.end, node.lineno])
+        stack.extend(reversed(node.children))
+    return out
+
+
+def node_value(type_: str, value, names: NameTable, parser_module=None):
+    """Inversa de `data_value`, internando los nombres en `names`."""
+    if type_ == 'declaration' and value:
+        parser_module = parser_module or get_parser_module()
+        kind, name = value.split()[:2]
+        return parser_module.Declared(parser_module.DECLARATION_KINDS.get(kind, kind), names.intern(name))
+    if type_ in ('identifier', 'assignment') and value:
+        return names.intern(value)
+    return value
+
+
+def tree_from_data(data: List[list], node_class, names: Optional[NameTable] = None):
+    """Inversa de `tree_to_data`. Los identificadores se internan en `names`."""
+    if names is None:
+        names = NameTable()
+    parser_module = get_parser_module()
+    root = None
+    # pila de (nodo, hijos que faltan por leer)
+    pending = []
+    for type_, value, n_children, start, end, lineno in data:
+        value = node_value(type_, value, names, parser_module)
+        node = node_class(type_, [] if n_children else None, value, start, end, lineno)
+        if pending:
+            parent = pending[-1]
+            parent[0].children.append(node)
+            parent[1] -= 1
+            if parent[1] == 0:
+                pending.pop()
+        else:
+            root = node
+        if n_children:
+            pending.append([node, n_children])
+    return root
+
+
+def diagnostics_to_data(diagnostics) -> List[list]:
+    """`[code, severity, line, offset, args]` por diagnóstico (el archivo y la columna no se guardan)."""
+    return [[d.code, d.severity, d.line, d.offset, d.args] for d in diagnostics]
+
+
+def diagnostics_from_data(data: List[list]) -> List[Diagnostic]:
+    return [Diagnostic(code, severity, None, line, offset, None, args) for code, severity, line, offset, args in data]
+
+
+def table_to_data(table: SymbolTable) -> Dict:
+    return {
+        "scopes": [[s.to_dict() for s in scope.values()] for scope in table.scopes],
+        "completed_scopes": [[s.to_dict() for s in scope.values()] for scope in table.completed_scopes],
+    }
+
+
+def _scope_from_data(scope: List[Dict], names: NameTable) -> Dict[int, Symbol]:
+    out = {}
+    for s in scope:
+        name = names.intern(s["name"])
+        i = names.id_of(name)
+        out[i] = Symbol(name, s["kind"], s["scope_level"], i)
+    return out
+
+
+def table_from_data(data: Dict, names: Optional[NameTable] = None) -> SymbolTable:
+    table = SymbolTable(names)
+    for scope in data["scopes"]:
+        table.push_scope(_scope_from_data(scope, table.names))
+    for scope in data["completed_scopes"]:
+        table.completed_scopes.append(_scope_from_data(scope, table.names))
+    return table
+
+
+# -----------------------------
+# Caché en disco
+# -----------------------------
+class CompilationCache:
+    # extensión de los archivos de entrada (las subclases guardan otros formatos en un subdirectorio propio)
+    SUFFIX = '.json'
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+
+    def key(self, code: str) -> str:
+        h = hashlib.sha256(version_stamp().encode())
+        h.update(code.encode('utf8'))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.SUFFIX)
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(self.SUFFIX):
+                    yield entry
+
+    def get(self, code: str):
+        """Devuelve `(tree, analyzer)` desde la caché o `None` si no hay entrada válida."""
+        path = self._path(self.key(code))
+        try:
+            with open(path, 'r', encoding='utf8') as fh:
+                data = json.load(fh)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        node_class = get_parser_module().Node
+        analyzer = SemanticAnalyzer()
+        # el árbol y la tabla comparten los ids, como en una compilación normal
+        names = analyzer.table.names
+        analyzer.table = table_from_data(data["table"], names)
+        analyzer.lex_diagnostics = diagnostics_from_data(data["lex"])
+        analyzer.semantic_diagnostics = diagnostics_from_data(data["errors"])
+        self.hits += 1
+        return tree_from_data(data["tree"], node_class, names), analyzer
+
+    def put(self, code: str, tree, analyzer):
+        if tree is None:
+            return
+        data = {
+            "version": version_stamp(),
+            "tree": tree_to_data(tree),
+            "table": table_to_data(analyzer.table),
+            "lex": diagnostics_to_data(analyzer.lex_diagnostics),
+            "errors": diagnostics_to_data(analyzer.semantic_diagnostics),
+        }
+        path = self._path(self.key(code))
+        self._write(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf8'))
+
+    def _write(self, path: str, payload: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # escritura atómica: varios procesos pueden compartir el directorio
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(payload)
+        # si la clave ya existía, su tamaño anterior deja de contar
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(tmp, path)
+        if self._size is None:
+            self._size = sum(e.stat().st_size for e in self._entries())
+        else:
+            self._size += len(payload) - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self, target_bytes: Optional[int] = None):
+        """Borra las entradas menos usadas hasta quedar por debajo de `target_bytes` (por defecto 90% del máximo)."""
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * 0.9)
+        entries = []
+        for e in self._entries():
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+    def clear(self):
+        self.evict(target_bytes=0)
@@ -0,0 +1,175 @@
+"""Cliente ligero del demonio de compilación (`daemon.py`).
+
+Solo importa la biblioteca estándar y `comun/diagnostics.py`: no carga PLY, las tablas
+del parser ni colorama, así que su tiempo de arranque es mínimo y la latencia de
+una llamada es la del trabajo que hace el demonio. Si el demonio no está
+corriendo lo arranca en segundo plano (salvo con `--no-start`) y espera a que
+escuche.
+
+Todas las peticiones de una llamada se envían seguidas por la misma conexión y
+el demonio las atiende a la vez.
+
+Uso:
+    python analisis_semantico/client.py a.js b.js
+    python analisis_semantico/client.py programa.js --run
+    python analisis_semantico/client.py --stats
+    python analisis_semantico/client.py --stop
+"""
+import sys
+import os
+import json
+import socket
+import subprocess
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comun.diagnostics import Diagnostic, TerminalSink
+
+DAEMON_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'daemon.py')
+
+
+def default_socket_path() -> str:
+    env = os.environ.get('COMPILADOR_SOCKET')
+    if env:
+        return env
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base, f'compilador-{os.getuid()}.sock')
+
+
+class DaemonError(Exception):
+    pass
+
+
+class DaemonClient:
+    """Conexión al demonio. Cada respuesta es el diccionario JSON que devuelve el demonio."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.socket_path)
+        except OSError:
+            self.sock.close()
+            raise
+        self._reader = self.sock.makefile('rb')
+        self._next_id = 0
+
+    def _send(self, op: str, fields: Dict) -> int:
+        self._next_id += 1
+        message = dict(fields, id=self._next_id, op=op)
+        self.sock.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode('utf8'))
+        return self._next_id
+
+    def _receive(self) -> Dict:
+        line = self._reader.readline()
+        if not line:
+            raise DaemonError("El demonio cerró la conexión")
+        return json.loads(line)
+
+    def request(self, op: str, **fields) -> Dict:
+        self._send(op, fields)
+        return self._receive()
+
+    def request_many(self, requests: List[Dict]) -> List[Dict]:
+        """Envía todas las peticiones (`{"op": ..., ...}`) antes de leer y devuelve las respuestas en el mismo orden."""
+        ids = [self._send(r["op"], {k: v for k, v in r.items() if k != "op"}) for r in requests]
+        responses = {}
+        for _ in ids:
+            response = self._receive()
+            responses[response.get("id")] = response
+        return [responses[i] for i in ids]
+
+    def close(self):
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def start_daemon(socket_path: Optional[str] = None, timeout: float = 15.0, args: List[str] = ()) -> DaemonClient:
+    """Arranca `daemon.py` en segundo plano y devuelve una conexión cuando ya escucha."""
+    socket_path = socket_path or default_socket_path()
+    subprocess.Popen([sys.executable, DAEMON_SCRIPT, '--socket', socket_path, *args],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return DaemonClient(socket_path)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise DaemonError(f"El demonio no respondió en {socket_path}")
+            time.sleep(0.05)
+
+
+def connect(socket_path: Optional[str] = None, autostart: bool = True) -> DaemonClient:
+    try:
+        return DaemonClient(socket_path)
+    except OSError:
+        if not autostart:
+            raise
+        return start_daemon(socket_path)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Cliente del demonio de compilación')
+    arg_parser.add_argument('files', nargs='*', help='Archivos .js a analizar')
+    arg_parser.add_argument('--socket', default=None, help='Socket del demonio (por defecto $COMPILADOR_SOCKET o uno por usuario)')
+    arg_parser.add_argument('--run', action='store_true', help='Compilar y ejecutar; muestra las variables globales')
+    arg_parser.add_argument('--json', action='store_true', help='Mostrar las respuestas JSON tal cual')
+    arg_parser.add_argument('--no-start', action='store_true', help='No arrancar el demonio si no está corriendo')
+    arg_parser.add_argument('--stats', action='store_true', help='Mostrar las estadísticas del demonio')
+    arg_parser.add_argument('--stop', action='store_true', help='Parar el demonio')
+    args = arg_parser.parse_args()
+
+    if args.stop:
+        try:
+            with DaemonClient(args.socket) as client:
+                client.request('shutdown')
+        except OSError:
+            print("El demonio no está corriendo", file=sys.stderr)
+        sys.exit(0)
+
+    try:
+        client = connect(args.socket, autostart=not args.no_start)
+    except (OSError, DaemonError) as e:
+        print(f"No se pudo conectar con el demonio: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    failed = 0
+    with client:
+        if args.stats:
+            print(json.dumps(client.request('stats')['result'], indent=2, ensure_ascii=False))
+        op = 'compile' if args.run else 'analyze'
+        requests = [{"op": op, "path": os.path.abspath(f), "run": args.run} for f in args.files]
+        sink = TerminalSink(show_location=True)
+        for path, response in zip(args.files, client.request_many(requests)):
+            if args.json:
+                print(json.dumps(response, ensure_ascii=False))
+            if not response["ok"]:
+                failed += 1
+                if not args.json:
+                    print(f"❌ {path}: {response['error']}")
+                continue
+            result = response["result"]
+            analysis = result["analysis"] if op == 'compile' else result
+            if not analysis["ok"]:
+                failed += 1
+            if args.json:
+                continue
+            for data in analysis["diagnostics"]:
+                sink.emit(Diagnostic.from_dict(data))
+            for name, value in result.get("globals", {}).items():
+                print(f"{name} = {value}")
+    sys.exit(1 if failed else 0)
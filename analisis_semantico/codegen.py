@@ -0,0 +1,258 @@
+"""Generación de bytecode a partir del AST analizado.
+
+El programa se traduce a una secuencia compacta de palabras en un `array('i')`:
+cada instrucción es un código de operación seguido, si lo lleva, de un
+argumento (índice en la tabla de constantes, número de slot o destino de
+salto). Las variables no se buscan por nombre: cada declaración recibe un slot
+propio al resolver los ámbitos con `SymbolTable`, con las mismas reglas que
+`SemanticAnalyzer`.
+
+Semántica (la que ejecuta `vm.py`):
+
+- los valores son enteros; `/` divide truncando hacia 0;
+- las relacionales dan 1 o 0 y un valor es verdadero si es distinto de 0;
+- `&&` y `||` cortocircuitan y devuelven uno de los operandos, como en JavaScript;
+- las variables empiezan en 0.
+
+La generación es iterativa (pila de trabajo explícita), así que no depende de
+la profundidad del árbol.
+"""
+import sys
+import os
+from array import array
+from typing import Dict, List, Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import Symbol, SymbolTable
+
+# -----------------------------
+# Códigos de operación
+# -----------------------------
+OPCODES = (
+    'LOAD_CONST',             # arg: índice en consts
+    'LOAD_VAR',               # arg: slot
+    'STORE_VAR',              # arg: slot (saca el valor de la pila)
+    'POP',
+    'ADD', 'SUB', 'MUL', 'DIV',
+    'EQ', 'NE', 'LT', 'LE', 'GT', 'GE',
+    'JUMP',                   # arg: destino
+    'JUMP_IF_FALSE',          # arg: destino (saca la condición)
+    'JUMP_IF_FALSE_OR_POP',   # `&&`: si es falso salta dejándolo en la pila, si no lo saca
+    'JUMP_IF_TRUE_OR_POP',    # `||`
+    'HALT',
+)
+(LOAD_CONST, LOAD_VAR, STORE_VAR, POP, ADD, SUB, MUL, DIV, EQ, NE, LT, LE, GT, GE,
+ JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, HALT) = range(len(OPCODES))
+HAS_ARG = frozenset((LOAD_CONST, LOAD_VAR, STORE_VAR, JUMP, JUMP_IF_FALSE,
+                     JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP))
+
+BINARY_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIV,
+    '==': EQ, '!=': NE, '<': LT, '<=': LE, '>': GT, '>=': GE,
+}
+LOGIC_OPCODES = {'&&': JUMP_IF_FALSE_OR_POP, '||': JUMP_IF_TRUE_OR_POP}
+
+
+class CompileError(Exception):
+    """El árbol no se puede traducir (errores de sintaxis o semánticos)."""
+
+
+class Program:
+    """Bytecode de un programa: código, constantes y nombres de los slots."""
+    __slots__ = ('code', 'consts', 'slot_names', 'globals', '_ops')
+
+    def __init__(self, code: array, consts: List[int], slot_names: List[str], globals: Dict[str, int]):
+        self.code = code
+        self.consts = consts
+        # nombre de la variable de cada slot (solo para depurar y mostrar)
+        self.slot_names = slot_names
+        # variables del ámbito global: nombre -> slot
+        self.globals = globals
+        self._ops = None
+
+    @property
+    def n_slots(self) -> int:
+        return len(self.slot_names)
+
+    def ops(self) -> List[int]:
+        """El código como lista (la VM indexa una lista más rápido que un `array`)."""
+        if self._ops is None:
+            self._ops = self.code.tolist()
+        return self._ops
+
+    def globals_of(self, slots: List[int]) -> Dict[str, int]:
+        """Valores finales de las variables globales a partir de los slots de `vm.run`."""
+        return {name: slots[slot] for name, slot in self.globals.items()}
+
+    def __repr__(self):
+        return f"<Program {len(self.code)} palabras, {len(self.consts)} constantes, {self.n_slots} slots>"
+
+
+class CodeGenerator:
+    def __init__(self):
+        self.table = SymbolTable()
+        self.code = array('i')
+        self.consts: List[int] = []
+        self._const_index: Dict[int, int] = {}
+        self.slots: Dict[Symbol, int] = {}
+        self.slot_names: List[str] = []
+        # posiciones de saltos pendientes de destino (se anidan como la pila de trabajo)
+        self._jumps: List[int] = []
+
+    # -----------------------------
+    # Emisión
+    # -----------------------------
+    def emit(self, op: int, arg: Optional[int] = None):
+        self.code.append(op)
+        if arg is not None:
+            self.code.append(arg)
+
+    def const(self, value: int) -> int:
+        index = self._const_index.get(value)
+        if index is None:
+            index = self._const_index[value] = len(self.consts)
+            self.consts.append(value)
+        return index
+
+    def _jump(self, op: int):
+        """Emite un salto con destino pendiente."""
+        self.code.append(op)
+        self.code.append(-1)
+        self._jumps.append(len(self.code) - 1)
+
+    def _patch(self, _=None):
+        """Fija el destino del último salto pendiente en la posición actual."""
+        self.code[self._jumps.pop()] = len(self.code)
+
+    def _else(self, _=None):
+        # fin de la rama `then`: saltar el `else` y hacer que la condición falsa llegue aquí
+        pending = self._jumps.pop()
+        self._jump(JUMP)
+        self.code[pending] = len(self.code)
+
+    def _resolve(self, node) -> int:
+        sym = self.table.lookup(node.value)
+        if sym is None:
+            raise CompileError(f"Uso de variable no declarada '{node.value}' en la línea {node.lineno}")
+        return self.slots[sym]
+
+    # -----------------------------
+    # Recorrido
+    # -----------------------------
+    def compile(self, tree) -> Program:
+        if tree is None:
+            raise CompileError("No hay árbol que compilar")
+        root_list = tree.children[0] if tree.type == 'program' and tree.children else None
+        self.table.push_scope()
+        # entradas: un nodo o una tupla (acción, argumento)
+        stack = [tree]
+        pop = stack.pop
+        push = stack.append
+        emit = self.emit
+        while stack:
+            item = pop()
+            if item.__class__ is tuple:
+                item[0](item[1])
+                continue
+            kind = item.type
+            if kind == 'number':
+                emit(LOAD_CONST, self.const(item.value))
+            elif kind == 'identifier':
+                emit(LOAD_VAR, self._resolve(item))
+            elif kind == 'binary_op':
+                left, right = item.children
+                if item.value in LOGIC_OPCODES:
+                    push((self._patch, None))
+                    push(right)
+                    push((self._jump, LOGIC_OPCODES[item.value]))
+                else:
+                    push((emit, BINARY_OPCODES[item.value]))
+                    push(right)
+                push(left)
+            elif kind == 'declaration':
+                push((self._store, self._declare(item)))
+                push(item.children[0])
+            elif kind == 'assignment':
+                # como en el análisis, el nombre se resuelve antes de la expresión
+                sym = self.table.lookup(item.value)
+                if sym is None:
+                    raise CompileError(f"Asignación a variable no declarada '{item.value}' en la línea {item.lineno}")
+                push((self._store, self.slots[sym]))
+                push(item.children[0])
+            elif kind == 'expression_statement':
+                push((emit, POP))
+                push(item.children[0])
+            elif kind == 'if':
+                condition, body = item.children
+                push((self._patch, None))
+                push(body)
+                push((self._jump, JUMP_IF_FALSE))
+                push(condition)
+            elif kind == 'if-else':
+                condition, body, orelse = item.children
+                push((self._patch, None))
+                push(orelse)
+                push((self._else, None))
+                push(body)
+                push((self._jump, JUMP_IF_FALSE))
+                push(condition)
+            elif kind == 'statement_list':
+                if item is not root_list:
+                    self.table.push_scope()
+                    push((self._pop_scope, None))
+                stack.extend(reversed(item.children))
+            elif kind == 'program':
+                stack.extend(reversed(item.children))
+            elif kind == 'error':
+                raise CompileError(f"El programa tiene errores de sintaxis (línea {item.lineno})")
+            else:
+                raise CompileError(f"Nodo no soportado '{kind}'")
+        emit(HALT)
+        global_slots = {str(sym.name): self.slots[sym] for sym in self.table.scopes[0].values()}
+        return Program(self.code, self.consts, self.slot_names, global_slots)
+
+    def _declare(self, node) -> int:
+        kind, name = node.value
+        err = self.table.declare(name, kind)
+        if err:
+            raise CompileError(f"{err} (línea {node.lineno})")
+        slot = self.slots[self.table.lookup(name)] = len(self.slot_names)
+        self.slot_names.append(str(name))
+        return slot
+
+    def _store(self, slot: int):
+        self.emit(STORE_VAR, slot)
+
+    def _pop_scope(self, _=None):
+        self.table.pop_scope()
+
+
+def compile_program(tree) -> Program:
+    """Traduce el AST de `parser.py` (sin errores) a un `Program`."""
+    return CodeGenerator().compile(tree)
+
+
+def disassemble(program: Program) -> str:
+    """Listado legible del bytecode, una instrucción por línea."""
+    lines = []
+    code = program.code
+    pc = 0
+    while pc < len(code):
+        op = code[pc]
+        name = OPCODES[op]
+        if op in HAS_ARG:
+            arg = code[pc + 1]
+            if op == LOAD_CONST:
+                note = f"({program.consts[arg]})"
+            elif op in (LOAD_VAR, STORE_VAR):
+                note = f"({program.slot_names[arg]})"
+            else:
+                note = ""
+            lines.append(f"{pc:6d} {name:<22} {arg} {note}".rstrip())
+            pc += 2
+        else:
+            lines.append(f"{pc:6d} {name}")
+            pc += 1
+    return "\n".join(lines)
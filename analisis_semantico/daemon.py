@@ -0,0 +1,267 @@
+"""Demonio de compilación residente con protocolo por socket Unix.
+
+Cada llamada a `semantic.py` paga el arranque de Python, la importación de PLY y
+de las tablas del parser y colorama. El demonio los paga una sola vez: mantiene
+un `SessionPool` caliente (parsers y lexers ya construidos) y dos cachés en
+memoria, una de resultados de análisis por `(ruta, hash del texto)` y otra de
+objetos código de `pybackend.py` por hash. Atiende a muchos clientes a la vez
+con asyncio; el trabajo se hace en un pool de hilos, uno por sesión.
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea con el
+mismo `id`. Por una conexión se pueden enviar varias peticiones seguidas; se
+atienden a la vez y las respuestas llegan según terminan.
+
+    {"id": 1, "op": "analyze", "path": "/abs/a.js"}             -> {"id": 1, "ok": true, "result": {...}}
+    {"id": 2, "op": "analyze", "path": "a.js", "code": "..."}   (texto del editor en lugar del archivo)
+    {"id": 3, "op": "compile", "path": "/abs/a.js", "run": true} -> {"analysis": {...}, "compiled": true, "globals": {...}}
+    {"id": 4, "op": "ping"}, {"op": "stats"}, {"op": "shutdown"}
+
+El resultado de `analyze` es el de una línea de `batch.py`. Un error que impide
+responder (operación desconocida, archivo ilegible, fallo al ejecutar) da
+`{"ok": false, "error": "..."}`.
+
+Uso:
+    python analisis_semantico/daemon.py --workers 4 &
+    python analisis_semantico/client.py programa.js
+"""
+import sys
+import os
+import asyncio
+import hashlib
+import json
+import signal
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import LEXER_BACKENDS
+from analisis_semantico.session import SessionPool
+from analisis_semantico.batch import DEFAULT_MAX_DIAGNOSTICS, compile_with_session
+from analisis_semantico.optimizer import optimize
+from analisis_semantico.codegen import CompileError
+from analisis_semantico.vm import VMError
+from analisis_semantico.pybackend import compile_tree, run_code
+from analisis_semantico.client import DaemonClient, default_socket_path
+
+DEFAULT_CACHE_ENTRIES = 4096
+
+
+class MemoryCache:
+    """LRU acotado por número de entradas, seguro entre hilos."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CompileDaemon:
+    def __init__(self, socket_path: Optional[str] = None, workers: Optional[int] = None,
+                 lexer_backend: str = 'ply', cache_entries: int = DEFAULT_CACHE_ENTRIES,
+                 max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS):
+        self.socket_path = socket_path or default_socket_path()
+        self.workers = workers or os.cpu_count() or 1
+        self.max_diagnostics = max_diagnostics
+        self.pool = SessionPool(self.workers, lexer_backend=lexer_backend)
+        self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='compilador')
+        # (ruta, hash) -> (resultado, árbol)
+        self.results = MemoryCache(cache_entries)
+        # hash -> objeto código
+        self.programs = MemoryCache(cache_entries)
+        self.requests = 0
+        self.started = time.time()
+        # se activa cuando el socket ya acepta conexiones
+        self.ready = threading.Event()
+        self._stopped: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # -----------------------------
+    # Trabajo (en los hilos del executor)
+    # -----------------------------
+    def warm(self):
+        """Crea todas las sesiones del pool y compila un programa mínimo con cada una."""
+        sessions = [self.pool.acquire() for _ in range(self.workers)]
+        for session in sessions:
+            session.compile("var x = 1;\n")
+            self.pool.release(session)
+
+    def analyze(self, path: str, code: Optional[str] = None):
+        """Devuelve `(resultado, árbol, hash)`, desde la caché si el texto no cambió."""
+        if code is None:
+            with open(path, 'r', encoding='utf8') as fh:
+                code = fh.read()
+        digest = hashlib.sha256(code.encode('utf8')).hexdigest()
+        hit = self.results.get((path, digest))
+        if hit is not None:
+            return dict(hit[0], cached=True), hit[1], digest
+        with self.pool.session() as session:
+            result, tree = compile_with_session(session, path, code, max_diagnostics=self.max_diagnostics)
+        self.results.put((path, digest), (result, tree))
+        return result, tree, digest
+
+    def compile(self, path: str, code: Optional[str] = None, run: bool = False) -> Dict:
+        result, tree, digest = self.analyze(path, code)
+        response = {"analysis": result, "compiled": False}
+        if not result["ok"]:
+            return response
+        compiled = self.programs.get(digest)
+        if compiled is None:
+            compiled = compile_tree(optimize(tree)[0], path)
+            self.programs.put(digest, compiled)
+        response["compiled"] = True
+        if run:
+            response["globals"] = run_code(compiled)
+        return response
+
+    def stats(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "workers": self.workers,
+            "results": {"entries": len(self.results), "hits": self.results.hits, "misses": self.results.misses},
+            "programs": {"entries": len(self.programs), "hits": self.programs.hits, "misses": self.programs.misses},
+        }
+
+    # -----------------------------
+    # Protocolo
+    # -----------------------------
+    async def dispatch(self, line: bytes) -> Dict:
+        self.requests += 1
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"id": None, "ok": False, "error": "Petición que no es JSON"}
+        request_id = request.get("id")
+        op = request.get("op")
+        loop = asyncio.get_running_loop()
+        try:
+            if op == 'ping':
+                result = {"pid": os.getpid()}
+            elif op == 'stats':
+                result = self.stats()
+            elif op == 'shutdown':
+                self.stop()
+                result = {}
+            elif op == 'analyze':
+                result = (await loop.run_in_executor(self.executor, self.analyze, request.get("path") or '<programa>',
+                                                     request.get("code")))[0]
+            elif op == 'compile':
+                result = await loop.run_in_executor(self.executor, self.compile, request.get("path") or '<programa>',
+                                                    request.get("code"), bool(request.get("run")))
+            else:
+                return {"id": request_id, "ok": False, "error": f"Operación desconocida '{op}'"}
+        except (OSError, UnicodeDecodeError, CompileError, VMError) as e:
+            return {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {"id": request_id, "ok": True, "result": result}
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock):
+        response = await self.dispatch(line)
+        payload = (json.dumps(response, ensure_ascii=False) + "\n").encode('utf8')
+        async with lock:
+            writer.write(payload)
+            await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    # -----------------------------
+    # Ciclo de vida
+    # -----------------------------
+    def _claim_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            DaemonClient(self.socket_path, timeout=1.0).close()
+        except OSError:
+            # socket de un demonio que ya no existe
+            os.unlink(self.socket_path)
+            return
+        raise RuntimeError(f"Ya hay un demonio escuchando en {self.socket_path}")
+
+    async def serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._claim_socket()
+        await self._loop.run_in_executor(self.executor, self.warm)
+        server = await asyncio.start_unix_server(self.handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                self._loop.add_signal_handler(sig, self.stop)
+        self.ready.set()
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            self.executor.shutdown(wait=False)
+
+    def stop(self):
+        """Para el demonio; se puede llamar desde cualquier hilo."""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Demonio de compilación por socket Unix')
+    arg_parser.add_argument('--socket', default=None, help='Ruta del socket (por defecto $COMPILADOR_SOCKET o uno por usuario)')
+    arg_parser.add_argument('--workers', type=int, default=None, help='Sesiones e hilos de trabajo (por defecto: núcleos)')
+    arg_parser.add_argument('--lexer', choices=LEXER_BACKENDS, default='ply', help='Lexer a usar (fast: scanner de una sola regex)')
+    arg_parser.add_argument('--cache-entries', type=int, default=DEFAULT_CACHE_ENTRIES,
+                            help='Resultados y programas que se guardan en memoria')
+    arg_parser.add_argument('--max-diagnostics', type=int, default=DEFAULT_MAX_DIAGNOSTICS,
+                            help='Diagnósticos por archivo como máximo (0: sin límite)')
+    args = arg_parser.parse_args()
+
+    daemon = CompileDaemon(args.socket, args.workers, args.lexer, args.cache_entries, args.max_diagnostics or None)
+    try:
+        asyncio.run(daemon.serve())
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,319 @@
+"""Análisis de flujo de datos: eliminación de código muerto y variables sin usar.
+
+Pasada sobre el AST que se ejecuta después del plegado de constantes. Primero
+repite el análisis de ámbitos de `SemanticAnalyzer` para enlazar cada
+declaración, asignación y uso con su `Symbol` (las cadenas def-use). Después
+recorre el programa hacia atrás calculando qué variables están vivas (su valor
+puede leerse más adelante) y elimina:
+
+- los almacenamientos muertos: asignaciones a una variable local que nadie lee
+  antes de volver a escribirla o de que termine su bloque;
+- las ramas inalcanzables de `if`/`if-else` cuya condición es un literal (el
+  `if` se sustituye por la rama que se ejecuta);
+- las declaraciones locales que ya no se usan en el código que queda;
+- las sentencias de expresión sin efecto.
+
+Solo se quita lo que no tiene efectos: una expresión con identificadores no
+declarados o con una división cuyo divisor no es un literal distinto de 0 puede
+fallar al ejecutarse y se conserva. Las variables globales son el resultado
+observable del programa (`--run` y `pybackend.py` las devuelven) y nunca se
+eliminan; tampoco se tocan los símbolos redeclarados ni nada que esté dentro de
+un nodo `error`.
+
+Como en el optimizador, el árbol original no se modifica y los subárboles que no
+cambian se comparten. El recorrido es iterativo (generadores en una pila
+explícita), así que no depende del límite de recursión.
+
+Uso:
+    tree, stats = eliminate_dead_code(tree)
+    print(stats.format())
+"""
+import sys
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import SemanticAnalyzer, Symbol, get_parser_module
+
+# motivo -> (contador de `DeadCodeStats`, descripción en los informes)
+REASONS = {
+    'dead_store': ('dead_stores', 'almacenamiento muerto'),
+    'dead_branch': ('dead_branches', 'rama inalcanzable'),
+    'unused_declaration': ('unused_declarations', 'declaración sin usar'),
+    'dead_expression': ('dead_expressions', 'expresión sin efecto'),
+}
+
+# sentencias que contienen otras sentencias
+COMPOUND = frozenset(('program', 'statement_list', 'if', 'if-else'))
+
+
+class DeadCodeStats:
+    """Qué eliminó una pasada de `eliminate_dead_code`."""
+    __slots__ = ('dead_stores', 'dead_branches', 'unused_declarations', 'dead_expressions', 'removed')
+
+    def __init__(self):
+        self.dead_stores = 0
+        self.dead_branches = 0
+        self.unused_declarations = 0
+        self.dead_expressions = 0
+        # (motivo, línea, descripción) en el orden en que se eliminaron
+        self.removed: List[Tuple[str, int, str]] = []
+
+    def record(self, reason: str, node, description: str):
+        counter = REASONS[reason][0]
+        setattr(self, counter, getattr(self, counter) + 1)
+        self.removed.append((reason, node.lineno, description))
+
+    @property
+    def total(self) -> int:
+        return self.dead_stores + self.dead_branches + self.unused_declarations + self.dead_expressions
+
+    def to_dict(self):
+        return {"dead_stores": self.dead_stores, "dead_branches": self.dead_branches,
+                "unused_declarations": self.unused_declarations, "dead_expressions": self.dead_expressions,
+                "removed": [{"reason": r, "line": line, "what": what} for r, line, what in self.removed]}
+
+    def format(self) -> str:
+        lines = [f"Código muerto: {self.total} eliminados ({self.dead_stores} almacenamientos, "
+                 f"{self.dead_branches} ramas, {self.unused_declarations} declaraciones, "
+                 f"{self.dead_expressions} expresiones)"]
+        for reason, line, what in sorted(self.removed, key=lambda r: r[1]):
+            lines.append(f" - línea {line}: {REASONS[reason][1]} ({what})")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return (f"DeadCodeStats(dead_stores={self.dead_stores}, dead_branches={self.dead_branches}, "
+                f"unused_declarations={self.unused_declarations}, dead_expressions={self.dead_expressions})")
+
+
+class DefUseResolver(SemanticAnalyzer):
+    """Resuelve cada declaración, asignación e identificador a su `Symbol`.
+
+    Los nombres no declarados quedan en `symbols` con `None`. Una redeclaración
+    en el mismo ámbito apunta al símbolo ya existente, que se marca en `pinned`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.symbols: Dict = {}
+        self.pinned: Set[Symbol] = set()
+
+    def visit_declaration(self, node):
+        if not node.value:
+            return False
+        kind, name = node.value
+        if self.table.declare(name, kind):
+            self.pinned.add(self.table.lookup(name))
+        self.symbols[node] = self.table.lookup(name)
+
+    def visit_assignment(self, node):
+        self.symbols[node] = self.table.lookup(node.value)
+
+    def visit_identifier(self, node):
+        self.symbols[node] = self.table.lookup(node.value)
+
+
+class DeadCodeEliminator:
+    """Reconstruye el programa de la última sentencia a la primera.
+
+    Cada sentencia recibe el conjunto de locales vivas a su salida y devuelve
+    `(sentencia_nueva o None, vivas a su entrada)`. `refs` cuenta, por símbolo,
+    las lecturas y escrituras que quedan en el código ya procesado: al llegar a
+    una declaración, todos sus usos (que siempre van detrás) ya están contados.
+    """
+
+    def __init__(self):
+        self.stats = DeadCodeStats()
+        self.node_class = get_parser_module().Node
+        self.symbols: Dict = {}
+        self.pinned: Set[Symbol] = set()
+        self.refs: Dict[Symbol, int] = {}
+
+    def eliminate(self, tree):
+        if tree is None:
+            return None
+        resolver = DefUseResolver()
+        resolver.analyze(tree)
+        self.symbols = resolver.symbols
+        self.pinned = resolver.pinned
+        return self._run(tree, set())[0]
+
+    # -----------------------------
+    # Utilidades
+    # -----------------------------
+    def _tracked(self, sym: Optional[Symbol]) -> bool:
+        """Solo se eliminan locales declaradas una única vez."""
+        return sym is not None and sym.scope_level > 0 and sym not in self.pinned
+
+    def _rebuild(self, node, children):
+        if len(children) == len(node.children) and all(a is b for a, b in zip(children, node.children)):
+            return node
+        if node.children.__class__ is tuple:
+            children = tuple(children)
+        return self.node_class(node.type, children, node.value, node.start, node.end, node.lineno)
+
+    def _empty_block(self, like):
+        return self.node_class("statement_list", [], start=like.start, end=like.end, lineno=like.lineno)
+
+    @staticmethod
+    def _is_empty_block(node) -> bool:
+        return node.type == 'statement_list' and not node.children
+
+    def _is_pure(self, expr) -> bool:
+        """True si evaluar `expr` no puede fallar ni tener efectos."""
+        symbols = self.symbols
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            kind = node.type
+            if kind == 'identifier':
+                if symbols.get(node) is None:
+                    return False
+            elif kind == 'binary_op':
+                left, right = node.children
+                if node.value in ('/', '%') and (right.type != 'number' or right.value == 0):
+                    return False
+                stack.append(left)
+                stack.append(right)
+            elif kind != 'number':
+                return False
+        return True
+
+    def _read(self, node, live: Set[Symbol]):
+        """Marca como vivas y usadas todas las locales que aparecen en `node`."""
+        symbols = self.symbols
+        refs = self.refs
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            sym = symbols.get(item)
+            if sym is not None and self._tracked(sym):
+                live.add(sym)
+                refs[sym] = refs.get(sym, 0) + 1
+            if item.children:
+                stack.extend(item.children)
+
+    # -----------------------------
+    # Recorrido
+    # -----------------------------
+    def _run(self, root, live: Set[Symbol]):
+        """Procesa `root` sin recursión: cada sentencia compuesta es un generador
+        que pide sus hijas con `yield (hija, vivas)` y recibe `(nueva, vivas)`."""
+        stack = []
+        value = None
+        node = root
+        while True:
+            if node is not None:
+                if node.type in COMPOUND:
+                    stack.append(self._compound(node, live))
+                    value = None
+                else:
+                    value = self._simple(node, live)
+                node = None
+            if not stack:
+                return value
+            try:
+                node, live = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+                node = None
+
+    def _compound(self, node, live: Set[Symbol]):
+        kind = node.type
+        stats = self.stats
+        if kind == 'program':
+            if not node.children:
+                return node, live
+            new, live = yield node.children[0], live
+            return self._rebuild(node, [new]), live
+
+        if kind == 'statement_list':
+            kept = []
+            for stmt in reversed(node.children):
+                new, live = yield stmt, live
+                if new is not None and not self._is_empty_block(new):
+                    kept.append(new)
+            kept.reverse()
+            return self._rebuild(node, kept), live
+
+        condition = node.children[0]
+        arms = node.children[1:]
+        if condition.type == 'number':
+            # solo se ejecuta una rama (o ninguna)
+            taken = 0 if condition.value != 0 else 1
+            stats.record('dead_branch', node, 'condición siempre ' + ('cierta' if taken == 0 else 'falsa'))
+            if taken >= len(arms):
+                return None, live
+            return (yield arms[taken], live)
+
+        new_arms = []
+        live_in = set()
+        for arm in reversed(arms):
+            new, arm_live = yield arm, set(live)
+            new_arms.append(new if new is not None else self._empty_block(arm))
+            live_in |= arm_live
+        new_arms.reverse()
+        live_in |= live
+
+        if all(self._is_empty_block(arm) for arm in new_arms):
+            if self._is_pure(condition):
+                stats.record('dead_branch', node, 'if sin efecto')
+                return None, live
+            self._read(condition, live)
+            return self.node_class("expression_statement", (condition,), start=node.start, end=node.end,
+                                   lineno=node.lineno), live
+        self._read(condition, live_in)
+        if kind == 'if-else' and self._is_empty_block(new_arms[1]):
+            return self.node_class("if", (condition, new_arms[0]), start=node.start, end=node.end,
+                                   lineno=node.lineno), live_in
+        return self._rebuild(node, [condition] + new_arms), live_in
+
+    def _simple(self, node, live: Set[Symbol]):
+        kind = node.type
+        stats = self.stats
+        if kind == 'declaration' and node in self.symbols:
+            sym = self.symbols[node]
+            init = node.children[0]
+            if self._tracked(sym):
+                was_live = sym in live
+                live.discard(sym)
+                if not self.refs.get(sym) and self._is_pure(init):
+                    stats.record('unused_declaration', node, str(node.value))
+                    return None, live
+                if not was_live and init.type != 'number' and self._is_pure(init):
+                    # la variable se usa, pero este valor nunca se lee
+                    stats.record('dead_store', node, f"{node.value} = ...")
+                    node = self._rebuild(node, [self.node_class("number", value=0, start=init.start,
+                                                                end=init.end, lineno=init.lineno)])
+                self.refs[sym] = self.refs.get(sym, 0) + 1
+            self._read(node.children[0], live)
+            return node, live
+
+        if kind == 'assignment':
+            sym = self.symbols.get(node)
+            rhs = node.children[0]
+            if self._tracked(sym):
+                if sym not in live and self._is_pure(rhs):
+                    stats.record('dead_store', node, f"{node.value} = ...")
+                    return None, live
+                live.discard(sym)
+                self.refs[sym] = self.refs.get(sym, 0) + 1
+            self._read(rhs, live)
+            return node, live
+
+        if kind == 'expression_statement' and self._is_pure(node.children[0]):
+            stats.record('dead_expression', node, 'expresión')
+            return None, live
+
+        # expresiones con efectos, nodos `error` y cualquier otra cosa: se conservan enteros
+        self._read(node, live)
+        return node, live
+
+
+def eliminate_dead_code(tree):
+    """Elimina el código muerto de `tree` y devuelve `(árbol_nuevo, DeadCodeStats)`."""
+    eliminator = DeadCodeEliminator()
+    return eliminator.eliminate(tree), eliminator.stats
@@ -0,0 +1,643 @@
+"""Reparseo incremental para editores / servidores de lenguaje.
+
+`IncrementalDocument` mantiene el texto, el AST y los resultados semánticos de un
+buffer partido en *segmentos*: cada segmento es una sentencia de nivel superior
+(un hijo del `statement_list` raíz) junto con el espacio y los comentarios que la
+preceden. El documento se construye con un solo parseo del texto completo, que
+se reparte en segmentos por las posiciones de las sentencias.
+
+Los segmentos no guardan offsets absolutos: guardan su texto, y `SegmentList`
+los agrupa en bloques con la longitud y las líneas de cada bloque, así que
+localizar una posición no recorre el documento y una edición no desplaza los
+segmentos posteriores (sus nodos se desplazan al pedir el árbol). Al aplicar una
+edición:
+
+1. se relexea solo una ventana que empieza en el segmento anterior al editado y
+   cubre los segmentos que toca la edición; se amplía hasta el primer límite de
+   sentencia que coincida con uno antiguo (resincronización);
+2. se parsea cada sentencia nueva por separado con sus propios tokens; los nodos
+   de los segmentos no tocados se reutilizan tal cual;
+3. se reanaliza semánticamente solo lo nuevo y los segmentos posteriores que usan
+   o declaran algún nombre global cuya declaración cambió, localizados con un
+   índice nombre -> segmentos. Los ámbitos de bloque no son visibles fuera de su
+   segmento, así que solo importan los nombres globales.
+
+Para programas válidos el árbol, la tabla de símbolos y los errores coinciden con
+los de `analyze_code` sobre el texto completo. Con errores de sintaxis el
+documento conserva las sentencias que sí parsean, en lugar de devolver `None`.
+"""
+import sys
+import os
+import re
+import heapq
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import (SemanticAnalyzer, Symbol, SymbolTable,
+                                         get_parser_module, new_parser_and_lexer, parse_code)
+from comun import diagnostics
+from comun.diagnostics import DiagnosticEngine, use_engine
+from analisis_semantico.names import NameTable
+
+TERMINATORS = ('SEMICOLON', 'RBRACE')
+# segmentos por bloque de `SegmentList` (un bloque se parte al doblar este tamaño)
+BLOCK_SIZE = 256
+# separación entre las etiquetas de orden de dos segmentos consecutivos al reetiquetar
+ORDER_GAP = 1 << 32
+# comentarios; un `/*` suelto es un comentario que no se cierra en ese texto
+_COMMENTS = re.compile(r'/\*[\s\S]*?\*/|//[^\n]*|/\*')
+
+
+def has_open_comment(text: str, pos: int = 0) -> bool:
+    """¿Queda un `/* ...` sin cerrar en `text` desde `pos`?"""
+    return '/*' in text and any(m.group() == '/*' for m in _COMMENTS.finditer(text, pos))
+
+
+class TextEdit(NamedTuple):
+    """Reemplaza `text[start:end]` (offsets del texto anterior) por `text`."""
+    start: int
+    end: int
+    text: str
+
+
+class Segment:
+    __slots__ = ('text', 'length', 'newlines', 'open_comment', 'order', 'nodes', 'syntax_error',
+                 'node_start', 'node_line', 'declared', 'closed', 'refs', 'errors')
+
+    def __init__(self, text: str, start: int, lineno: int):
+        self.text = text
+        self.length = len(text)
+        self.newlines = text.count('\n')
+        # un `/*` sin cerrar: el lexer lo ve como `/` y `*` hasta que aparezca un `*/` detrás
+        self.open_comment = has_open_comment(text)
+        # etiqueta creciente en el orden del documento (la asigna `SegmentList`)
+        self.order = 0
+        self.nodes: List = []
+        self.syntax_error = False
+        # offset y línea de inicio del segmento en los que están expresadas las posiciones de `nodes`
+        self.node_start = start
+        self.node_line = lineno
+        # resultados semánticos del segmento
+        self.declared: List[Symbol] = []
+        self.closed: List[Dict[int, Symbol]] = []
+        self.refs: Set[str] = set()
+        self.errors: List[str] = []
+
+    def move_to(self, start: int, lineno: int):
+        """Desplaza los nodos a la posición actual del segmento."""
+        shift = start - self.node_start
+        line_shift = lineno - self.node_line
+        if not (shift or line_shift):
+            return
+        stack = list(self.nodes)
+        while stack:
+            node = stack.pop()
+            node.move(shift, line_shift)
+            stack.extend(node.children)
+        self.node_start = start
+        self.node_line = lineno
+
+    def names(self) -> Set[str]:
+        """Nombres globales que este segmento declara para los segmentos siguientes."""
+        return {s.name for s in self.declared}
+
+
+class SegmentList:
+    """Secuencia de segmentos en bloques de `BLOCK_SIZE` a `2 * BLOCK_SIZE`.
+
+    Cada bloque guarda la suma de las longitudes y de los saltos de línea de sus
+    segmentos: para localizar un offset se recorren esas sumas y un solo bloque,
+    y reemplazar segmentos solo rehace los bloques afectados. Además cada
+    segmento recibe una etiqueta `order` creciente para compararlos por posición
+    sin calcular su índice; los nuevos toman valores entre sus vecinos y solo se
+    reetiqueta todo si no caben.
+    """
+
+    def __init__(self, segments: List[Segment] = ()):
+        self.blocks: List[List[Segment]] = []
+        self.lengths: List[int] = []
+        self.newlines: List[int] = []
+        self._count = 0
+        self.replace(0, 0, list(segments))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Segment]:
+        for block in self.blocks:
+            yield from block
+
+    def __getitem__(self, i: int) -> Segment:
+        b, k = self._block_of(i)
+        return self.blocks[b][k]
+
+    def _block_of(self, i: int) -> Tuple[int, int]:
+        """`(bloque, posición dentro del bloque)` del índice `i`; `i == len` da el final del último bloque."""
+        for b, block in enumerate(self.blocks):
+            if i < len(block):
+                return b, i
+            i -= len(block)
+        if not self.blocks:
+            return 0, 0
+        return len(self.blocks) - 1, len(self.blocks[-1]) + i
+
+    def index(self, seg: Segment) -> int:
+        index = 0
+        for block in self.blocks:
+            if block[-1].order >= seg.order:
+                return index + block.index(seg)
+            index += len(block)
+        raise ValueError(seg)
+
+    def iter_from(self, i: int) -> Iterator[Segment]:
+        b, k = self._block_of(i)
+        for block in self.blocks[b:]:
+            yield from block[k:]
+            k = 0
+
+    def locate(self, pos: int) -> int:
+        """Índice del primer segmento que termina en `pos` o después (`len` si ninguno)."""
+        offset = 0
+        index = 0
+        for b, length in enumerate(self.lengths):
+            if offset + length >= pos:
+                for seg in self.blocks[b]:
+                    offset += seg.length
+                    if offset >= pos:
+                        return index
+                    index += 1
+            offset += length
+            index += len(self.blocks[b])
+        return index
+
+    def position(self, i: int) -> Tuple[int, int]:
+        """Offset y línea (desde 1) donde empieza el segmento `i`."""
+        b, k = self._block_of(i)
+        offset = sum(self.lengths[:b])
+        lineno = 1 + sum(self.newlines[:b])
+        for seg in self.blocks[b][:k] if self.blocks else ():
+            offset += seg.length
+            lineno += seg.newlines
+        return offset, lineno
+
+    def slice(self, i: int, j: int) -> List[Segment]:
+        out = []
+        for seg in self.iter_from(i):
+            if len(out) == j - i:
+                break
+            out.append(seg)
+        return out
+
+    def replace(self, i: int, j: int, new: List[Segment]):
+        """Sustituye los segmentos `[i, j)` por `new`."""
+        bi, ki = self._block_of(i)
+        bj, kj = self._block_of(j)
+        if self.blocks:
+            merged = self.blocks[bi][:ki] + new + self.blocks[bj][kj:]
+            # un bloque que se queda pequeño se une al siguiente
+            if len(merged) < BLOCK_SIZE // 2 and bj + 1 < len(self.blocks):
+                bj += 1
+                merged += self.blocks[bj]
+        else:
+            merged, bj = list(new), -1
+        if len(merged) > 2 * BLOCK_SIZE:
+            chunks = [merged[k:k + BLOCK_SIZE] for k in range(0, len(merged), BLOCK_SIZE)]
+        else:
+            chunks = [merged] if merged else []
+        self.blocks[bi:bj + 1] = chunks
+        self.lengths[bi:bj + 1] = [sum(seg.length for seg in chunk) for chunk in chunks]
+        self.newlines[bi:bj + 1] = [sum(seg.newlines for seg in chunk) for chunk in chunks]
+        self._count += len(new) - (j - i)
+        if new:
+            self._label(i, new)
+
+    def _label(self, i: int, new: List[Segment]):
+        low = self[i - 1].order if i > 0 else 0
+        after = i + len(new)
+        high = self[after].order if after < self._count else low + (len(new) + 1) * ORDER_GAP
+        if high - low <= len(new):
+            self.relabel()
+            return
+        for k, seg in enumerate(new, 1):
+            seg.order = low + (high - low) * k // (len(new) + 1)
+
+    def relabel(self):
+        for k, seg in enumerate(self, 1):
+            seg.order = k * ORDER_GAP
+
+
+class _Window:
+    """Texto que empieza en el segmento `first`, con la edición ya aplicada.
+
+    Cubre de entrada los segmentos que toca la edición; `grow` añade los
+    siguientes (cada vez tantos como ya tiene) y, tras el último, el texto final
+    sin sentencias. `ends` da, para cada segmento antiguo posterior a la edición,
+    dónde termina ahora (relativo a la ventana) -> índice del segmento siguiente:
+    es donde el escaneo nuevo puede resincronizar.
+    """
+
+    def __init__(self, doc: "IncrementalDocument", first: int, edit: Optional[TextEdit]):
+        self.doc = doc
+        self.start, self.lineno = doc.segments.position(first)
+        self.index = first
+        self.segments = doc.segments.iter_from(first)
+        self.final = False
+        self.ends: Dict[int, int] = {}
+        self.taken = 0
+        self.delta = 0
+        self.edit_end = 0
+        self.text = ''
+        if edit is None:
+            # sin edición: todo el documento
+            self.grow(len(doc.segments))
+            return
+        old_end = edit.end - self.start
+        self.delta = len(edit.text) - (edit.end - edit.start)
+        self.edit_end = old_end + self.delta
+        texts = []
+        length = 0
+        for seg in self.segments:
+            texts.append(seg.text)
+            length += seg.length
+            self.index += 1
+            self.taken += 1
+            if length >= old_end:
+                self.ends[length + self.delta] = self.index
+                break
+        else:
+            # la edición llega al texto final
+            texts.append(doc.tail)
+            self.final = True
+        old = ''.join(texts)
+        rel = edit.start - self.start
+        self.text = old[:rel] + edit.text + old[old_end:]
+
+    def closes_comment(self, edit: TextEdit) -> bool:
+        """¿Forma la edición un `*/`, contando un carácter a cada lado?"""
+        rel = edit.start - self.start
+        return '*/' in self.text[max(0, rel - 1):rel + len(edit.text) + 1]
+
+    def grow(self, count: Optional[int] = None):
+        texts = [self.text]
+        length = len(self.text)
+        want = count if count is not None else max(1, self.taken)
+        for seg in self.segments:
+            texts.append(seg.text)
+            length += seg.length
+            self.index += 1
+            self.taken += 1
+            self.ends[length] = self.index
+            want -= 1
+            if want <= 0:
+                break
+        else:
+            texts.append(self.doc.tail)
+            self.final = True
+        self.text = ''.join(texts)
+
+
+
+class _SegmentTable(SymbolTable):
+    """Tabla de un segmento que anota qué nombres resolvió o declaró en el ámbito global.
+
+    El ámbito global propio solo tiene lo que declara el segmento; lo declarado
+    por segmentos anteriores se consulta en el documento (`global_before`) cuando
+    el nombre no está en los ámbitos del segmento. Todas las tablas del documento
+    usan la misma `NameTable`, así que los ids coinciden.
+    """
+
+    def __init__(self, doc: "IncrementalDocument", seg: Segment):
+        super().__init__(doc.names)
+        # un segmento usa pocos nombres: índice id -> pila en un diccionario, no en una
+        # lista que crecería hasta el mayor id del documento en cada segmento
+        self._bindings = {}
+        self.push_scope()
+        self.doc = doc
+        self.order = seg.order
+        self.refs: Set[str] = set()
+        self.declared: List[Symbol] = []
+
+    def declare(self, name: str, kind: str) -> Optional[str]:
+        if len(self.scopes) == 1:
+            self.refs.add(name)
+            if self.doc.global_before(self.names.id_of(name), self.order) is not None:
+                return f"Redeclaración de '{name}' en el mismo ámbito"
+            err = super().declare(name, kind)
+            if err is None:
+                self.declared.append(self.scopes[0][self.names.id_of(name)])
+            return err
+        return super().declare(name, kind)
+
+    def _stack_for(self, i: int) -> List[Symbol]:
+        stack = self._bindings.get(i)
+        if stack is None:
+            stack = self._bindings[i] = []
+        return stack
+
+    def lookup_id(self, i: int) -> Optional[Symbol]:
+        stack = self._bindings.get(i)
+        return stack[-1] if stack else None
+
+    def lookup(self, name: str) -> Optional[Symbol]:
+        i = self.names.find(name)
+        sym = None if i is None else self.lookup_id(i)
+        if sym is None or sym.scope_level == 0:
+            self.refs.add(name)
+            if sym is None:
+                return None if i is None else self.doc.global_before(i, self.order)
+        return sym
+
+
+class IncrementalDocument:
+    def __init__(self, code: str):
+        self.parser, self.lexer = new_parser_and_lexer()
+        if self.parser is None or self.lexer is None:
+            raise RuntimeError("No se pudo importar parser o lexer")
+        self.node_class = get_parser_module().Node
+        # nombres del documento: el lexer los interna y todas las tablas comparten los ids
+        self.names = NameTable()
+        self.lexer.names = self.names
+        # texto después de la última sentencia (espacio y comentarios)
+        self.tail = ''
+        self._text: Optional[str] = code
+        # id -> símbolo global vigente y segmento que lo declara (el primero que lo hace)
+        self.globals: Dict[int, Symbol] = {}
+        self._declarers: Dict[int, Segment] = {}
+        # nombre -> segmentos que lo usan o declaran en el ámbito global
+        self._users: Dict[str, Set[Segment]] = {}
+        # segmentos con un `/*` sin cerrar
+        self._open_comments: Set[Segment] = set()
+        self.segments = SegmentList(self._split_parsed(code) or [])
+        if not self.segments and code:
+            # con errores de sintaxis la recuperación de cada sentencia es la de su segmento
+            self.tail = code
+            new, _, tail = self._rescan(_Window(self, 0, None))
+            self.segments.replace(0, 0, new)
+            self.tail = tail
+        for seg in self.segments:
+            if seg.open_comment:
+                self._open_comments.add(seg)
+            self._analyze_segment(seg)
+
+    # -----------------------------
+    # Resultados
+    # -----------------------------
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = ''.join(seg.text for seg in self.segments) + self.tail
+        return self._text
+
+    @property
+    def tree(self):
+        """AST del documento. Los nodos reutilizados se desplazan aquí, no en cada edición."""
+        nodes = []
+        offset, lineno = 0, 1
+        for seg in self.segments:
+            seg.move_to(offset, lineno)
+            offset += seg.length
+            lineno += seg.newlines
+            nodes.extend(seg.nodes)
+        if not nodes:
+            return None
+        first, last = nodes[0], nodes[-1]
+        span = dict(start=first.start, end=last.end, lineno=first.lineno)
+        return self.node_class("program", [self.node_class("statement_list", nodes, **span)], **span)
+
+    @property
+    def errors(self) -> List[str]:
+        return [e for seg in self.segments for e in seg.errors]
+
+    @property
+    def syntax_errors(self) -> int:
+        return sum(1 for seg in self.segments if seg.syntax_error)
+
+    @property
+    def table(self) -> SymbolTable:
+        table = SymbolTable(self.names)
+        # en el orden de las declaraciones, como en un análisis del texto completo
+        table.push_scope({sym.id: sym for seg in self.segments for sym in seg.declared})
+        for seg in self.segments:
+            table.completed_scopes.extend(seg.closed)
+        return table
+
+    def global_before(self, i: int, order: int) -> Optional[Symbol]:
+        """Símbolo global `i` si lo declara un segmento anterior a la posición `order`."""
+        seg = self._declarers.get(i)
+        if seg is not None and seg.order < order:
+            return self.globals[i]
+        return None
+
+    # -----------------------------
+    # Edición
+    # -----------------------------
+    def apply_edit(self, start: int, end: int, text: str) -> Dict[str, int]:
+        """Aplica una edición y devuelve cuánto trabajo se rehízo."""
+        edit = TextEdit(start, end, text)
+        segments = self.segments
+        self._text = None
+
+        # primer segmento afectado; se retrocede uno por si la edición añade un `else`
+        first = max(0, segments.locate(edit.start) - 1)
+        window = _Window(self, first, edit)
+        if self._open_comments and window.closes_comment(edit):
+            # un `*/` nuevo cierra el primer `/*` suelto anterior: se relexea desde allí
+            opener = segments.index(min(self._open_comments, key=lambda seg: seg.order))
+            if opener < first:
+                first = opener
+                window = _Window(self, first, edit)
+        new_segments, resync, tail = self._rescan(window)
+
+        removed = segments.slice(first, resync)
+        segments.replace(first, resync, new_segments)
+        self.tail = tail
+
+        removed_names: Set[str] = set()
+        for seg in removed:
+            self._forget(seg)
+            self._open_comments.discard(seg)
+            removed_names |= seg.names()
+        self._open_comments.update(seg for seg in new_segments if seg.open_comment)
+        after = segments[first - 1].order if first > 0 else 0
+        reanalyzed = self._reanalyze(new_segments, removed_names, after)
+        return {
+            "relexed_chars": sum(seg.length for seg in new_segments),
+            "reparsed": len(new_segments),
+            "reused": len(segments) - len(new_segments),
+            "reanalyzed": reanalyzed,
+        }
+
+    # -----------------------------
+    # Léxico y sintáctico por segmentos
+    # -----------------------------
+    def _split_parsed(self, code: str) -> Optional[List[Segment]]:
+        """Segmentos de un parseo del texto completo, o `None` si tiene errores de sintaxis."""
+        collector = DiagnosticEngine(dedupe=False)
+        with use_engine(collector):
+            tree, errors = parse_code(self.parser, code, self.lexer, names=self.names)
+        if errors:
+            return None
+        self._forward(collector, 0, len(code))
+        segments = []
+        pos, lineno = 0, 1
+        for node in tree.children[0].children:
+            seg = Segment(code[pos:node.end], pos, lineno)
+            seg.nodes = [node]
+            segments.append(seg)
+            pos = node.end
+            lineno += seg.newlines
+        self.tail = code[pos:]
+        return segments
+
+    def _rescan(self, window: _Window) -> Tuple[List[Segment], int, str]:
+        """Lexea `window` en sentencias de nivel superior y las parsea.
+
+        Una sentencia de nivel superior termina en `;` o `}` fuera de llaves, salvo
+        que el siguiente token sea `else`. Los paréntesis no cuentan: la gramática no
+        admite `;` dentro de ellos y así un `(` sin cerrar no arrastra el resto del archivo.
+        Devuelve los segmentos nuevos, el índice del primer segmento antiguo que se
+        conserva y el texto final.
+        """
+        lexer = self.lexer
+        found = []
+        pos, lineno = 0, window.lineno
+        resync = None
+        # los caracteres ilegales se informan una vez, con offsets del documento
+        collector = DiagnosticEngine()
+        with use_engine(collector):
+            while True:
+                if not window.final and has_open_comment(window.text, pos):
+                    window.grow()
+                    continue
+                lexer.input(window.text)
+                lexer.lexpos = pos
+                lexer.lineno = lineno
+                depth = 0
+                tokens = []
+                pending_end = None
+                while True:
+                    tok = lexer.token()
+                    if pending_end is not None and (tok.type != 'ELSE' if tok else window.final):
+                        found.append((pos, pending_end, lineno, tokens))
+                        lineno += window.text.count('\n', pos, pending_end)
+                        tokens = []
+                        pos = pending_end
+                        pending_end = None
+                        resync = window.ends.get(pos) if pos >= window.edit_end else None
+                        if resync is not None:
+                            break
+                    if tok is None:
+                        break
+                    tokens.append(tok)
+                    if tok.type == 'LBRACE':
+                        depth += 1
+                    elif tok.type == 'RBRACE':
+                        depth = max(0, depth - 1)
+                    if depth == 0 and tok.type in TERMINATORS:
+                        pending_end = tok.lexpos + len(tok.value)
+                    else:
+                        pending_end = None
+                if resync is not None or window.final:
+                    break
+                # la ventana se acabó sin resincronizar: se amplía y se relexea la sentencia pendiente
+                window.grow()
+        tail = self.tail
+        if resync is None:
+            resync = len(self.segments)
+            if tokens:
+                found.append((pos, len(window.text), lineno, tokens))
+                tail = ''
+            else:
+                tail = window.text[pos:]
+        self._forward(collector, window.start, found[-1][1] if found else len(window.text))
+        return [self._parse_segment(window, *f) for f in found], resync, tail
+
+    def _forward(self, collector: DiagnosticEngine, base: int, limit: int):
+        """Reenvía al motor activo los diagnósticos léxicos anteriores a `limit`, desplazados a `base`."""
+        for d in collector.diagnostics:
+            if d.code.startswith('L') and (d.offset is None or d.offset < limit):
+                diagnostics.report(d.code, d.severity, d.line, None if d.offset is None else d.offset + base,
+                                   **d.args)
+
+    def _parse_segment(self, window: _Window, start: int, end: int, lineno: int, tokens: List) -> Segment:
+        base = window.start
+        seg = Segment(window.text[start:end], base + start, lineno)
+        if base:
+            # los tokens tienen offsets de la ventana: los nodos se crean ya con los del documento
+            for tok in tokens:
+                tok.lexpos += base
+                if tok.type == 'NUMBER':
+                    tok.end += base
+        it = iter(tokens)
+        tree, errors = parse_code(self.parser, lexer_obj=self.lexer, tokenfunc=lambda: next(it, None))
+        seg.syntax_error = bool(errors)
+        seg.nodes = list(tree.children[0].children)
+        return seg
+
+    # -----------------------------
+    # Semántico por segmentos
+    # -----------------------------
+    def _reanalyze(self, fresh: List[Segment], removed_names: Set[str], after: int) -> int:
+        """Analiza `fresh` y, en orden, los segmentos posteriores a `after` afectados por los cambios.
+
+        Para lo que viene detrás solo cambian los nombres que declaraban los
+        segmentos quitados o declaran los nuevos, pero no ambos.
+        """
+        fresh_names: Set[str] = set()
+        for seg in fresh:
+            self._analyze_segment(seg)
+            fresh_names |= seg.names()
+        changed_names = removed_names ^ fresh_names
+        queued = set(fresh)
+        pending: List[Tuple[int, int, Segment]] = []
+
+        def enqueue(names: Set[str], order: int):
+            for name in names:
+                for seg in self._users.get(name, ()):
+                    if seg.order > order and seg not in queued:
+                        queued.add(seg)
+                        heapq.heappush(pending, (seg.order, id(seg), seg))
+
+        enqueue(changed_names, fresh[-1].order if fresh else after)
+        count = len(fresh)
+        while pending:
+            _, _, seg = heapq.heappop(pending)
+            old_names = seg.names()
+            self._analyze_segment(seg)
+            enqueue(old_names ^ seg.names(), seg.order)
+            count += 1
+        return count
+
+    def _forget(self, seg: Segment):
+        """Retira del documento las declaraciones y usos globales de `seg`."""
+        for name in seg.refs:
+            users = self._users.get(name)
+            if users is not None:
+                users.discard(seg)
+                if not users:
+                    del self._users[name]
+        for sym in seg.declared:
+            if self._declarers.get(sym.id) is seg:
+                del self._declarers[sym.id]
+                del self.globals[sym.id]
+
+    def _analyze_segment(self, seg: Segment):
+        self._forget(seg)
+        analyzer = SemanticAnalyzer(names=self.names)
+        table = _SegmentTable(self, seg)
+        analyzer.table = table
+        for node in seg.nodes:
+            analyzer._analyze_node(node)
+        seg.errors = analyzer.errors
+        seg.refs = table.refs
+        seg.declared = table.declared
+        seg.closed = table.completed_scopes
+        for sym in seg.declared:
+            current = self._declarers.get(sym.id)
+            if current is None or seg.order < current.order:
+                self._declarers[sym.id] = seg
+                self.globals[sym.id] = sym
+        for name in seg.refs:
+            self._users.setdefault(name, set()).add(seg)
@@ -0,0 +1,257 @@
+"""Instrumentación por fases del pipeline léxico -> sintáctico -> semántico.
+
+`profile_code` compila un fuente midiendo por separado cada fase (tiempo de
+reloj y de CPU) y devuelve, además de `(tree, analyzer)`, un `CompileReport`:
+
+- fases `lex`, `parse` y `analyze` (más las que se midan con `Profiler.phase`);
+- tokens, nodos por tipo, ámbitos abiertos, declaraciones y búsquedas en la
+  tabla de símbolos;
+- errores léxicos, de sintaxis y semánticos;
+- opcionalmente, el pico de memoria medido con `tracemalloc`.
+
+Para separar el léxico del parseo el fuente se tokeniza entero antes de
+parsear (PLY normalmente los intercala), así que una compilación instrumentada
+guarda la lista de tokens en memoria. El camino normal (`analyze_code`) no se
+modifica y no paga nada por la instrumentación.
+
+Los observadores (`Observer`) reciben el inicio y el fin de cada fase y el
+informe final, por ejemplo para enviarlos a un sistema de métricas.
+
+Uso:
+    tree, analyzer, report = profile_code(code, memory=True)
+    print(report.format())
+"""
+import sys
+import os
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import (SemanticAnalyzer, SymbolTable, new_parser_and_lexer, parse_code,
+                                         reporting_to)
+
+
+class PhaseTiming:
+    __slots__ = ('wall', 'cpu')
+
+    def __init__(self, wall: float = 0.0, cpu: float = 0.0):
+        self.wall = wall
+        self.cpu = cpu
+
+    def to_dict(self):
+        return {"wall_ms": round(self.wall * 1000, 3), "cpu_ms": round(self.cpu * 1000, 3)}
+
+    def __repr__(self):
+        return f"PhaseTiming(wall={self.wall:.6f}, cpu={self.cpu:.6f})"
+
+
+class CompileReport:
+    """Tiempos y contadores de una compilación instrumentada."""
+
+    def __init__(self, file: Optional[str] = None):
+        self.file = file
+        self.phases: Dict[str, PhaseTiming] = {}
+        self.tokens = 0
+        self.nodes: Dict[str, int] = {}
+        self.scopes = 0
+        self.declarations = 0
+        self.lookups = 0
+        self.lex_errors = 0
+        self.syntax_errors = 0
+        self.semantic_errors = 0
+        # bytes; None si no se midió la memoria
+        self.peak_memory: Optional[int] = None
+
+    @property
+    def total_nodes(self) -> int:
+        return sum(self.nodes.values())
+
+    @property
+    def wall(self) -> float:
+        return sum(t.wall for t in self.phases.values())
+
+    @property
+    def cpu(self) -> float:
+        return sum(t.cpu for t in self.phases.values())
+
+    def to_dict(self):
+        return {
+            "file": self.file,
+            "phases": {name: t.to_dict() for name, t in self.phases.items()},
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "tokens": self.tokens,
+            "nodes": self.total_nodes,
+            "nodes_by_type": dict(self.nodes),
+            "scopes": self.scopes,
+            "declarations": self.declarations,
+            "lookups": self.lookups,
+            "lex_errors": self.lex_errors,
+            "syntax_errors": self.syntax_errors,
+            "semantic_errors": self.semantic_errors,
+            "peak_memory": self.peak_memory,
+        }
+
+    def format(self) -> str:
+        """Informe legible para la terminal."""
+        lines = ["Estadísticas:"]
+        for name, t in self.phases.items():
+            lines.append(f"  {name:<10} {t.wall * 1000:10.3f} ms  (cpu {t.cpu * 1000:.3f} ms)")
+        lines.append(f"  {'total':<10} {self.wall * 1000:10.3f} ms  (cpu {self.cpu * 1000:.3f} ms)")
+        lines.append(f"  tokens: {self.tokens}  nodos: {self.total_nodes}  ámbitos: {self.scopes}  "
+                     f"declaraciones: {self.declarations}  búsquedas: {self.lookups}")
+        if self.nodes:
+            by_type = ", ".join(f"{k}={v}" for k, v in sorted(self.nodes.items(), key=lambda kv: -kv[1]))
+            lines.append(f"  nodos por tipo: {by_type}")
+        lines.append(f"  errores: léxicos={self.lex_errors} sintaxis={self.syntax_errors} "
+                     f"semánticos={self.semantic_errors}")
+        if self.peak_memory is not None:
+            lines.append(f"  memoria pico: {self.peak_memory / 1024:.1f} KiB")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"<CompileReport {self.file or ''} {self.wall * 1000:.3f} ms, {self.tokens} tokens>"
+
+
+class Observer:
+    """Interfaz de los observadores de `Profiler`; todos los métodos son opcionales."""
+
+    def phase_started(self, name: str):
+        pass
+
+    def phase_finished(self, name: str, timing: PhaseTiming):
+        pass
+
+    def report_finished(self, report: CompileReport):
+        pass
+
+
+class Profiler:
+    """Mide fases con `phase(name)` y avisa a los observadores."""
+
+    def __init__(self, report: Optional[CompileReport] = None, observers: Iterable[Observer] = (),
+                 memory: bool = False):
+        self.report = report or CompileReport()
+        self.observers: List[Observer] = list(observers)
+        self.memory = memory
+
+    def add_observer(self, observer: Observer):
+        self.observers.append(observer)
+
+    @contextmanager
+    def phase(self, name: str):
+        for obs in self.observers:
+            obs.phase_started(name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            timing = self.report.phases.setdefault(name, PhaseTiming())
+            # una fase medida varias veces se acumula
+            timing.wall += time.perf_counter() - wall
+            timing.cpu += time.process_time() - cpu
+            for obs in self.observers:
+                obs.phase_finished(name, timing)
+
+    @contextmanager
+    def run(self):
+        """Envuelve la compilación entera: memoria pico y aviso final a los observadores."""
+        started = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started = True
+            tracemalloc.reset_peak()
+        try:
+            yield self.report
+        finally:
+            if self.memory:
+                self.report.peak_memory = tracemalloc.get_traced_memory()[1]
+                if started:
+                    tracemalloc.stop()
+        for obs in self.observers:
+            obs.report_finished(self.report)
+
+
+class CountingSymbolTable(SymbolTable):
+    """`SymbolTable` que cuenta ámbitos, declaraciones y búsquedas."""
+
+    def __init__(self, names=None):
+        super().__init__(names)
+        self.pushes = 0
+        self.declarations = 0
+        self.lookups = 0
+
+    def push_scope(self, symbols=None):
+        self.pushes += 1
+        super().push_scope(symbols)
+
+    def declare(self, name: str, kind: str):
+        self.declarations += 1
+        return super().declare(name, kind)
+
+    def lookup(self, name: str):
+        self.lookups += 1
+        return super().lookup(name)
+
+
+def count_node_types(tree) -> Dict[str, int]:
+    counts: Counter = Counter()
+    stack = [tree] if tree is not None else []
+    while stack:
+        node = stack.pop()
+        counts[node.type] += 1
+        if node.children:
+            stack.extend(node.children)
+    return dict(counts)
+
+
+def profile_code(code: str, lexer_backend: str = 'ply', memory: bool = False,
+                 observers: Iterable[Observer] = (), file: Optional[str] = None,
+                 parser_obj=None, lexer_obj=None, analyzer_class=SemanticAnalyzer, diagnostics=None):
+    """Compila `code` con instrumentación y devuelve `(tree, analyzer, CompileReport)`.
+
+    Usa el parser y el lexer dados (por ejemplo, los de una `CompilerSession`)
+    o unos nuevos de `lexer_backend`. No usa la caché: se mide la compilación real.
+    Los errores se informan a `diagnostics` como en `analyze_code`.
+    """
+    if parser_obj is None or lexer_obj is None:
+        parser_obj, lexer_obj = new_parser_and_lexer(lexer_backend)
+        if parser_obj is None or lexer_obj is None:
+            raise RuntimeError("No se pudo importar parser o lexer")
+    profiler = Profiler(CompileReport(file), observers, memory)
+    report = profiler.report
+    analyzer = analyzer_class(diagnostics)
+    engine = analyzer.diagnostics
+
+    with profiler.run(), reporting_to(engine, code):
+        start = len(engine.diagnostics)
+        with profiler.phase('lex'):
+            lexer_obj.lineno = 1
+            lexer_obj.names = analyzer.table.names
+            lexer_obj.input(code)
+            tokens = list(iter(lexer_obj.token, None))
+        report.tokens = len(tokens)
+        analyzer.lex_diagnostics = engine.by_prefix('L', start)
+        report.lex_errors = len(analyzer.lex_diagnostics)
+
+        with profiler.phase('parse'):
+            remaining = iter(tokens)
+            tree, syntax_errors = parse_code(parser_obj, None, lexer_obj, lambda: next(remaining, None))
+        report.syntax_errors = len(syntax_errors)
+
+        table = analyzer.table = CountingSymbolTable(analyzer.table.names)
+        analyzer.syntax_errors = syntax_errors
+        with profiler.phase('analyze'):
+            analyzer.analyze(tree)
+        report.scopes = table.pushes
+        report.declarations = table.declarations
+        report.lookups = table.lookups
+        report.semantic_errors = len(analyzer.errors)
+        report.nodes = count_node_types(tree)
+    return tree, analyzer, report
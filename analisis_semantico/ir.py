@@ -0,0 +1,784 @@
+"""Representación intermedia de tres direcciones y optimizaciones sobre ella.
+
+`lower` traduce el AST analizado a una función de bloques básicos. Cada bloque es
+una lista de instrucciones de la forma `dest = a op b` o `dest = a` (copia),
+donde los operandos son enteros o variables, y termina en un salto
+(`goto B2`), un salto condicional (`if %3 goto B1 else B2`) o `return`:
+
+- las variables del programa reciben un nombre por declaración (`x`, y `x.1`,
+  `x.2`... si otro ámbito vuelve a declarar `x`) y los temporales son `%1`, `%2`...;
+- `if`/`if-else` son saltos condicionales a sus ramas y un bloque de unión;
+- `&&` y `||` cortocircuitan: el operando derecho se evalúa en su propio bloque.
+
+El lenguaje no tiene bucles, así que el grafo de bloques es acíclico y cada
+análisis de flujo de datos recorre los bloques una sola vez en orden (postorden
+inverso): el estado a la entrada de un bloque es lo que coincide en todos sus
+predecesores.
+
+Pasadas (`PASSES`):
+
+- `constant_propagation`: sustituye las variables de valor conocido, evalúa las
+  operaciones entre constantes (`/` trunca hacia 0 y no se evalúa con divisor 0,
+  como en la VM) y convierte los saltos con condición constante en `goto`,
+  quitando los bloques que quedan inalcanzables y uniendo los que quedan en fila;
+- `copy_propagation`: tras `a = b`, los usos de `a` pasan a ser de `b` mientras
+  ninguna de las dos se reasigne;
+- `local_cse` / `global_cse`: una operación ya calculada (en el mismo bloque o
+  en todos los caminos que llegan a él) se sustituye por la variable que guarda
+  su valor. Si ambas son temporales, la instrucción desaparece.
+
+Después de cada pasada se borran los temporales que nadie usa (salvo divisiones
+que pueden fallar), de modo que `IRStats` atribuye a cada pasada las
+instrucciones que ahorra. `execute` interpreta la función con la semántica de
+`vm.py`, para comprobar que las optimizaciones no cambian el resultado.
+
+Uso:
+    function = lower(tree)
+    stats = optimize_ir(function)
+    print(dump(function))
+    print(stats.format())
+
+    python analisis_semantico/ir.py programa.js -O --stats
+"""
+import sys
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import Symbol, SymbolTable
+from analisis_semantico.codegen import CompileError
+from analisis_semantico.vm import VMError
+
+# código de operación de una copia (`dest = a`)
+COPY = '='
+BINARY_OPS = ('+', '-', '*', '/', '==', '!=', '<', '<=', '>', '>=')
+COMMUTATIVE = frozenset(('+', '*', '==', '!='))
+LOGIC_OPS = ('&&', '||')
+
+_MISSING = object()
+
+
+def is_temp(operand) -> bool:
+    return operand.__class__ is str and operand[0] == '%'
+
+
+def _div(a: int, b: int) -> int:
+    """División entera truncando hacia 0, como `DIV` en la VM."""
+    if b == 0:
+        raise VMError("División por cero")
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+EVALUATE: Dict[str, Callable[[int, int], int]] = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': _div,
+    '==': lambda a, b: 1 if a == b else 0,
+    '!=': lambda a, b: 1 if a != b else 0,
+    '<': lambda a, b: 1 if a < b else 0,
+    '<=': lambda a, b: 1 if a <= b else 0,
+    '>': lambda a, b: 1 if a > b else 0,
+    '>=': lambda a, b: 1 if a >= b else 0,
+}
+
+
+def fold(op: str, a: int, b: int) -> Optional[int]:
+    """Valor de `a op b` entre constantes, o None si fallaría al ejecutarse."""
+    if op == '/' and b == 0:
+        return None
+    return EVALUATE[op](a, b)
+
+
+def can_fail(ins: "Instr") -> bool:
+    """Solo una división cuyo divisor no es una constante distinta de 0 puede fallar."""
+    return ins.op == '/' and (ins.b.__class__ is not int or ins.b == 0)
+
+
+# -----------------------------
+# Estructura
+# -----------------------------
+class Instr:
+    """`dest = a op b`, o `dest = a` si `op` es `COPY`."""
+    __slots__ = ('op', 'dest', 'a', 'b')
+
+    def __init__(self, op: str, dest: str, a, b=None):
+        self.op = op
+        self.dest = dest
+        self.a = a
+        self.b = b
+
+    def __str__(self):
+        if self.op == COPY:
+            return f"{self.dest} = {self.a}"
+        return f"{self.dest} = {self.a} {self.op} {self.b}"
+
+    def __repr__(self):
+        return f"<Instr {self}>"
+
+
+class BasicBlock:
+    """Instrucciones sin saltos intermedios y el salto final.
+
+    `targets` vacío es `return`; con un destino, `goto`; con dos, salta al
+    primero si `cond` es distinto de 0 y al segundo si no.
+    """
+    __slots__ = ('label', 'instrs', 'cond', 'targets')
+
+    def __init__(self, label: int):
+        self.label = label
+        self.instrs: List[Instr] = []
+        self.cond = None
+        self.targets: Tuple[int, ...] = ()
+
+    def terminator(self) -> str:
+        if not self.targets:
+            return "return"
+        if len(self.targets) == 1:
+            return f"goto B{self.targets[0]}"
+        return f"if {self.cond} goto B{self.targets[0]} else B{self.targets[1]}"
+
+    def __repr__(self):
+        return f"<BasicBlock B{self.label} {len(self.instrs)} instrucciones>"
+
+
+class IRFunction:
+    """Bloques del programa en orden (el primero es la entrada) y sus variables."""
+    __slots__ = ('blocks', 'variables', 'globals')
+
+    def __init__(self):
+        self.blocks: Dict[int, BasicBlock] = {}
+        # variables del programa (empiezan en 0, como los slots de la VM)
+        self.variables: List[str] = []
+        # variables del ámbito global: nombre en el fuente -> variable de la IR
+        self.globals: Dict[str, str] = {}
+
+    @property
+    def entry(self) -> BasicBlock:
+        return next(iter(self.blocks.values()))
+
+    def instruction_count(self) -> int:
+        """Instrucciones más un salto (o `return`) por bloque."""
+        return sum(len(block.instrs) + 1 for block in self.blocks.values())
+
+    def reorder(self):
+        """Deja los bloques en postorden inverso y quita los inalcanzables."""
+        blocks = self.blocks
+        entry = next(iter(blocks))
+        order = []
+        seen = {entry}
+        # los sucesores se visitan del último al primero para que la rama `then` quede delante
+        stack = [(entry, reversed(blocks[entry].targets))]
+        while stack:
+            label, successors = stack[-1]
+            for nxt in successors:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append((nxt, reversed(blocks[nxt].targets)))
+                    break
+            else:
+                stack.pop()
+                order.append(label)
+        order.reverse()
+        self.blocks = {label: blocks[label] for label in order}
+
+    def simplify(self):
+        """Salta los bloques vacíos que solo hacen `goto` y une cada bloque con su
+        único sucesor cuando este no tiene otro predecesor."""
+        blocks = self.blocks
+        entry = next(iter(blocks))
+        forward = {label: block.targets[0] for label, block in blocks.items()
+                   if label != entry and not block.instrs and len(block.targets) == 1}
+
+        def final(label):
+            while label in forward:
+                label = forward[label]
+            return label
+
+        for block in blocks.values():
+            targets = tuple(final(t) for t in block.targets)
+            if len(targets) == 2 and targets[0] == targets[1]:
+                targets = targets[:1]
+                block.cond = None
+            block.targets = targets
+        self.reorder()
+        blocks = self.blocks
+        predecessors: Dict[int, int] = {}
+        for block in blocks.values():
+            for target in block.targets:
+                predecessors[target] = predecessors.get(target, 0) + 1
+        for label in list(blocks):
+            block = blocks.get(label)
+            if block is None:
+                continue
+            while len(block.targets) == 1 and predecessors[block.targets[0]] == 1:
+                succ = blocks.pop(block.targets[0])
+                block.instrs.extend(succ.instrs)
+                block.targets, block.cond = succ.targets, succ.cond
+
+    def __repr__(self):
+        return f"<IRFunction {len(self.blocks)} bloques, {self.instruction_count()} instrucciones>"
+
+
+def dump(function: IRFunction) -> str:
+    """Listado legible de la función, un bloque tras otro."""
+    lines = []
+    for block in function.blocks.values():
+        lines.append(f"B{block.label}:")
+        for ins in block.instrs:
+            lines.append(f"    {ins}")
+        lines.append(f"    {block.terminator()}")
+    return "\n".join(lines)
+
+
+# -----------------------------
+# Traducción desde el AST
+# -----------------------------
+class IRBuilder:
+    """Traduce el AST sin recursión, con una pila de trabajo como `CodeGenerator`.
+
+    Las expresiones dejan su operando en `_values`; los `if` y `&&`/`||` abiertos
+    guardan en `_pending` los bloques a los que hay que saltar al terminar.
+    """
+
+    def __init__(self):
+        self.table = SymbolTable()
+        self.function = IRFunction()
+        self.vars: Dict[Symbol, str] = {}
+        # id del nombre -> declaraciones vistas (`x`, `x.1`, `x.2`...)
+        self._declared: Dict[int, int] = {}
+        self._temps = 0
+        self._values: List = []
+        self._pending: List = []
+        self.block = self._new_block()
+
+    def _new_block(self) -> BasicBlock:
+        block = BasicBlock(len(self.function.blocks))
+        self.function.blocks[block.label] = block
+        return block
+
+    def _temp(self) -> str:
+        self._temps += 1
+        return f"%{self._temps}"
+
+    def _end(self, targets: Tuple[int, ...], cond=None, then: Optional[BasicBlock] = None):
+        """Cierra el bloque actual con su salto y continúa en `then`."""
+        self.block.targets = targets
+        self.block.cond = cond
+        if then is not None:
+            self.block = then
+
+    def _assign(self, dest: str, value):
+        """`dest = value`; si `value` es el temporal que acaba de calcularse, se escribe directamente en `dest`."""
+        instrs = self.block.instrs
+        if is_temp(value) and instrs and instrs[-1].dest == value:
+            instrs[-1].dest = dest
+        else:
+            instrs.append(Instr(COPY, dest, value))
+
+    def _resolve(self, name: str, lineno: int, what: str) -> str:
+        sym = self.table.lookup(name)
+        if sym is None:
+            raise CompileError(f"{what} variable no declarada '{name}' en la línea {lineno}")
+        return self.vars[sym]
+
+    def _declare(self, node) -> str:
+        kind, name = node.value
+        err = self.table.declare(name, kind)
+        if err:
+            raise CompileError(f"{err} (línea {node.lineno})")
+        sym = self.table.lookup(name)
+        count = self._declared.get(sym.id, 0)
+        self._declared[sym.id] = count + 1
+        # `str()`: los operandos de las instrucciones son `str` exactos (no `Name`)
+        var = str(name) if count == 0 else f"{name}.{count}"
+        self.vars[sym] = var
+        self.function.variables.append(var)
+        return var
+
+    # -----------------------------
+    # Recorrido
+    # -----------------------------
+    def lower(self, tree) -> IRFunction:
+        if tree is None:
+            raise CompileError("No hay árbol que traducir")
+        root_list = tree.children[0] if tree.type == 'program' and tree.children else None
+        self.table.push_scope()
+        values = self._values
+        # entradas: un nodo o una tupla (acción, argumento)
+        stack = [tree]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            item = pop()
+            if item.__class__ is tuple:
+                item[0](item[1])
+                continue
+            kind = item.type
+            if kind == 'number':
+                values.append(item.value)
+            elif kind == 'identifier':
+                values.append(self._resolve(item.value, item.lineno, "Uso de"))
+            elif kind == 'binary_op':
+                left, right = item.children
+                if item.value in LOGIC_OPS:
+                    push((self._logic_end, None))
+                    push(right)
+                    push((self._logic_start, item.value))
+                else:
+                    push((self._binary, item.value))
+                    push(right)
+                push(left)
+            elif kind == 'declaration':
+                push((self._store, self._declare(item)))
+                push(item.children[0])
+            elif kind == 'assignment':
+                # como en el análisis, el nombre se resuelve antes de la expresión
+                push((self._store, self._resolve(item.value, item.lineno, "Asignación a")))
+                push(item.children[0])
+            elif kind == 'expression_statement':
+                push((self._discard, None))
+                push(item.children[0])
+            elif kind == 'if':
+                condition, body = item.children
+                push((self._if_end, None))
+                push(body)
+                push((self._if_start, False))
+                push(condition)
+            elif kind == 'if-else':
+                condition, body, orelse = item.children
+                push((self._if_end, None))
+                push(orelse)
+                push((self._else, None))
+                push(body)
+                push((self._if_start, True))
+                push(condition)
+            elif kind == 'statement_list':
+                if item is not root_list:
+                    self.table.push_scope()
+                    push((self._pop_scope, None))
+                stack.extend(reversed(item.children))
+            elif kind == 'program':
+                stack.extend(reversed(item.children))
+            elif kind == 'error':
+                raise CompileError(f"El programa tiene errores de sintaxis (línea {item.lineno})")
+            else:
+                raise CompileError(f"Nodo no soportado '{kind}'")
+        self._end(())
+        function = self.function
+        function.globals = {sym.name: self.vars[sym] for sym in self.table.scopes[0].values()}
+        function.simplify()
+        return function
+
+    def _binary(self, op: str):
+        b = self._values.pop()
+        a = self._values.pop()
+        dest = self._temp()
+        self.block.instrs.append(Instr(op, dest, a, b))
+        self._values.append(dest)
+
+    def _store(self, var: str):
+        self._assign(var, self._values.pop())
+
+    def _discard(self, _=None):
+        self._values.pop()
+
+    def _logic_start(self, op: str):
+        # el resultado es el operando izquierdo si decide (falso en `&&`, cierto en `||`) o el derecho
+        result = self._temp()
+        self._assign(result, self._values.pop())
+        rhs, end = self._new_block(), self._new_block()
+        targets = (rhs.label, end.label) if op == '&&' else (end.label, rhs.label)
+        self._end(targets, result, rhs)
+        self._pending.append((result, end))
+
+    def _logic_end(self, _=None):
+        result, end = self._pending.pop()
+        self._assign(result, self._values.pop())
+        self._end((end.label,), then=end)
+        self._values.append(result)
+
+    def _if_start(self, has_else: bool):
+        then, other = self._new_block(), self._new_block()
+        if has_else:
+            self._pending.append(self._new_block())
+        self._pending.append(other)
+        self._end((then.label, other.label), self._values.pop(), then)
+
+    def _else(self, _=None):
+        orelse = self._pending.pop()
+        self._end((self._pending[-1].label,), then=orelse)
+
+    def _if_end(self, _=None):
+        join = self._pending.pop()
+        self._end((join.label,), then=join)
+
+    def _pop_scope(self, _=None):
+        self.table.pop_scope()
+
+
+def lower(tree) -> IRFunction:
+    """Traduce el AST de `parser.py` (sin errores) a una `IRFunction`."""
+    return IRBuilder().lower(tree)
+
+
+# -----------------------------
+# Flujo de datos
+# -----------------------------
+def _meet(states: List[Dict]) -> Dict:
+    """Entradas iguales en todos los estados."""
+    states = sorted(states, key=len)
+    first, rest = states[0], states[1:]
+    return {k: v for k, v in first.items() if all(s.get(k, _MISSING) == v for s in rest)}
+
+
+def _forward(function: IRFunction, transfer: Callable[[BasicBlock, Dict], None]):
+    """Aplica `transfer` a cada bloque alcanzable con el estado de sus predecesores.
+
+    `transfer` modifica el estado (y puede cambiar el salto del bloque); el
+    mismo diccionario pasa a los sucesores, copiado si hay más de uno.
+    """
+    blocks = function.blocks
+    entry = next(iter(blocks))
+    incoming: Dict[int, List[Tuple[Dict, bool]]] = {label: [] for label in blocks}
+    for label, block in blocks.items():
+        states = incoming.pop(label)
+        if not states:
+            if label != entry:
+                # inalcanzable tras plegar un salto
+                continue
+            state = {}
+        elif len(states) == 1:
+            state, shared = states[0]
+            if shared:
+                state = dict(state)
+        else:
+            state = _meet([s for s, _ in states])
+        transfer(block, state)
+        shared = len(block.targets) > 1
+        for target in block.targets:
+            incoming[target].append((state, shared))
+
+
+def _remove_dead_temporaries(function: IRFunction) -> int:
+    """Borra las definiciones de temporales sin usos (las que no pueden fallar)."""
+    uses: Dict[str, int] = {}
+    for block in function.blocks.values():
+        for ins in block.instrs:
+            for operand in (ins.a, ins.b):
+                if operand.__class__ is str:
+                    uses[operand] = uses.get(operand, 0) + 1
+        if block.cond.__class__ is str:
+            uses[block.cond] = uses.get(block.cond, 0) + 1
+    removed = 0
+    changed = True
+    while changed:
+        changed = False
+        for block in reversed(list(function.blocks.values())):
+            kept = []
+            for ins in reversed(block.instrs):
+                if is_temp(ins.dest) and not uses.get(ins.dest) and not can_fail(ins):
+                    for operand in (ins.a, ins.b):
+                        if operand.__class__ is str:
+                            uses[operand] -= 1
+                    removed += 1
+                    changed = True
+                else:
+                    kept.append(ins)
+            kept.reverse()
+            block.instrs = kept
+    return removed
+
+
+# -----------------------------
+# Pasadas
+# -----------------------------
+def propagate_constants(function: IRFunction) -> int:
+    rewritten = 0
+
+    def transfer(block: BasicBlock, consts: Dict[str, int]):
+        nonlocal rewritten
+        for ins in block.instrs:
+            a, b = ins.a, ins.b
+            if a.__class__ is str and a in consts:
+                a = ins.a = consts[a]
+                rewritten += 1
+            if b.__class__ is str and b in consts:
+                b = ins.b = consts[b]
+                rewritten += 1
+            value = None
+            if ins.op == COPY:
+                if a.__class__ is int:
+                    value = a
+            elif a.__class__ is int and b.__class__ is int:
+                value = fold(ins.op, a, b)
+                if value is not None:
+                    ins.op, ins.a, ins.b = COPY, value, None
+                    rewritten += 1
+            if value is None:
+                consts.pop(ins.dest, None)
+            else:
+                consts[ins.dest] = value
+        cond = block.cond
+        if cond.__class__ is str and cond in consts:
+            cond = consts[cond]
+        if len(block.targets) == 2 and cond.__class__ is int:
+            block.targets = (block.targets[0] if cond else block.targets[1],)
+            block.cond = None
+            rewritten += 1
+
+    _forward(function, transfer)
+    function.simplify()
+    return rewritten
+
+
+def propagate_copies(function: IRFunction) -> int:
+    rewritten = 0
+
+    def transfer(block: BasicBlock, copies: Dict[str, str]):
+        nonlocal rewritten
+        # variable copiada -> copias que la usan como origen
+        by_source: Dict[str, set] = {}
+        for dest, src in copies.items():
+            by_source.setdefault(src, set()).add(dest)
+        for ins in block.instrs:
+            if ins.a.__class__ is str and ins.a in copies:
+                ins.a = copies[ins.a]
+                rewritten += 1
+            if ins.b.__class__ is str and ins.b in copies:
+                ins.b = copies[ins.b]
+                rewritten += 1
+            dest = ins.dest
+            src = copies.pop(dest, None)
+            if src is not None:
+                by_source[src].discard(dest)
+            for stale in by_source.pop(dest, ()):
+                del copies[stale]
+            if ins.op == COPY and ins.a.__class__ is str and ins.a != dest:
+                copies[dest] = ins.a
+                by_source.setdefault(ins.a, set()).add(dest)
+        if block.cond.__class__ is str and block.cond in copies:
+            block.cond = copies[block.cond]
+            rewritten += 1
+
+    _forward(function, transfer)
+    return rewritten
+
+
+def _expression_key(ins: Instr) -> tuple:
+    a, b = ins.a, ins.b
+    if ins.op in COMMUTATIVE and (b.__class__ is str, str(b)) < (a.__class__ is str, str(a)):
+        a, b = b, a
+    return ins.op, a, b
+
+
+def _eliminate_common_subexpressions(function: IRFunction, across_blocks: bool) -> int:
+    rewritten = 0
+    # temporales que se definen una sola vez: si su valor ya lo guarda otro, se renombran
+    definitions: Dict[str, int] = {}
+    for block in function.blocks.values():
+        for ins in block.instrs:
+            definitions[ins.dest] = definitions.get(ins.dest, 0) + 1
+    single = {name for name, count in definitions.items() if count == 1 and is_temp(name)}
+    renames: Dict[str, str] = {}
+
+    def transfer(block: BasicBlock, available: Dict[tuple, str]):
+        nonlocal rewritten
+        # variable -> expresiones disponibles que dejan de valer si se reasigna
+        by_var: Dict[str, set] = {}
+        for key, holder in available.items():
+            for var in (key[1], key[2], holder):
+                if var.__class__ is str:
+                    by_var.setdefault(var, set()).add(key)
+        kept = []
+        for ins in block.instrs:
+            if ins.a in renames:
+                ins.a = renames[ins.a]
+            if ins.b in renames:
+                ins.b = renames[ins.b]
+            dest = ins.dest
+            key = None
+            if ins.op != COPY:
+                key = _expression_key(ins)
+                holder = available.get(key)
+                if holder is not None:
+                    rewritten += 1
+                    if holder == dest:
+                        # ya tiene ese valor
+                        continue
+                    if dest in single and holder in single:
+                        renames[dest] = holder
+                        continue
+                    ins.op, ins.a, ins.b = COPY, holder, None
+                    key = None
+            kept.append(ins)
+            for stale in by_var.pop(dest, ()):
+                available.pop(stale, None)
+            if key is not None and dest != key[1] and dest != key[2]:
+                available[key] = dest
+                for var in (key[1], key[2], dest):
+                    if var.__class__ is str:
+                        by_var.setdefault(var, set()).add(key)
+        block.instrs = kept
+        if block.cond in renames:
+            block.cond = renames[block.cond]
+
+    if across_blocks:
+        _forward(function, transfer)
+    else:
+        for block in function.blocks.values():
+            transfer(block, {})
+    return rewritten
+
+
+def local_cse(function: IRFunction) -> int:
+    return _eliminate_common_subexpressions(function, False)
+
+
+def global_cse(function: IRFunction) -> int:
+    return _eliminate_common_subexpressions(function, True)
+
+
+# nombre -> pasada (modifica la función y devuelve cuántas reescrituras hizo)
+PASSES: Dict[str, Callable[[IRFunction], int]] = {
+    'constant_propagation': propagate_constants,
+    'copy_propagation': propagate_copies,
+    'local_cse': local_cse,
+    'global_cse': global_cse,
+}
+# sin entradas, la propagación de constantes acaba resolviendo casi todo: va la última para
+# que las demás muestren lo que ahorran por sí solas
+DEFAULT_PASSES = ('local_cse', 'global_cse', 'copy_propagation', 'constant_propagation')
+
+
+class PassStats:
+    __slots__ = ('name', 'before', 'after', 'rewritten')
+
+    def __init__(self, name: str, before: int, after: int, rewritten: int):
+        self.name = name
+        self.before = before
+        self.after = after
+        self.rewritten = rewritten
+
+    @property
+    def saved(self) -> int:
+        return self.before - self.after
+
+    def to_dict(self):
+        return {"pass": self.name, "before": self.before, "after": self.after,
+                "saved": self.saved, "rewritten": self.rewritten}
+
+    def __repr__(self):
+        return f"PassStats({self.name}, {self.before} -> {self.after}, rewritten={self.rewritten})"
+
+
+class IRStats:
+    """Instrucciones antes y después de cada pasada de `optimize_ir`."""
+    __slots__ = ('initial', 'passes')
+
+    def __init__(self, initial: int):
+        self.initial = initial
+        self.passes: List[PassStats] = []
+
+    @property
+    def final(self) -> int:
+        return self.passes[-1].after if self.passes else self.initial
+
+    def to_dict(self):
+        return {"initial": self.initial, "final": self.final, "passes": [p.to_dict() for p in self.passes]}
+
+    def format(self) -> str:
+        lines = [f"IR: {self.initial} -> {self.final} instrucciones ({self.initial - self.final} ahorradas)"]
+        for p in self.passes:
+            lines.append(f" - {p.name:<22} {p.before:>7} -> {p.after:<7} (-{p.saved}, {p.rewritten} reescrituras)")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"IRStats({self.initial} -> {self.final})"
+
+
+def optimize_ir(function: IRFunction, passes=DEFAULT_PASSES) -> IRStats:
+    """Aplica `passes` en orden (modificando `function`) y mide cada una."""
+    stats = IRStats(function.instruction_count())
+    for name in passes:
+        if name not in PASSES:
+            raise ValueError(f"Pasada desconocida '{name}' (opciones: {', '.join(PASSES)})")
+        before = function.instruction_count()
+        rewritten = PASSES[name](function)
+        _remove_dead_temporaries(function)
+        stats.passes.append(PassStats(name, before, function.instruction_count(), rewritten))
+    return stats
+
+
+# -----------------------------
+# Intérprete
+# -----------------------------
+def execute(function: IRFunction) -> Dict[str, int]:
+    """Ejecuta la función y devuelve las variables globales (como `Program.globals_of`)."""
+    env: Dict[str, int] = {}
+    get = env.get
+    evaluate = EVALUATE
+    blocks = function.blocks
+    block = function.entry
+    while True:
+        for ins in block.instrs:
+            a = ins.a
+            if a.__class__ is str:
+                a = get(a, 0)
+            if ins.op == COPY:
+                env[ins.dest] = a
+                continue
+            b = ins.b
+            if b.__class__ is str:
+                b = get(b, 0)
+            env[ins.dest] = evaluate[ins.op](a, b)
+        targets = block.targets
+        if not targets:
+            break
+        if len(targets) == 1:
+            block = blocks[targets[0]]
+        else:
+            cond = block.cond
+            if cond.__class__ is str:
+                cond = get(cond, 0)
+            block = blocks[targets[0] if cond else targets[1]]
+    return {name: get(var, 0) for name, var in function.globals.items()}
+
+
+if __name__ == '__main__':
+    import argparse
+    from analisis_semantico.semantic import analyze_code
+
+    arg_parser = argparse.ArgumentParser(description='Mostrar la representación intermedia de un programa')
+    arg_parser.add_argument('file', help='Archivo JS a traducir')
+    arg_parser.add_argument('-O', '--optimize', action='store_true', help='Aplicar las pasadas por defecto')
+    arg_parser.add_argument('--passes', default=None,
+                            help=f"Pasadas separadas por comas (opciones: {', '.join(PASSES)})")
+    arg_parser.add_argument('--stats', action='store_true', help='Instrucciones antes y después de cada pasada')
+    arg_parser.add_argument('--run', action='store_true', help='Interpretar la IR y mostrar las variables globales')
+    args = arg_parser.parse_args()
+
+    source = open(args.file, 'r', encoding='utf8').read()
+    tree, analyzer = analyze_code(source)
+    try:
+        if analyzer.syntax_errors or analyzer.errors:
+            raise CompileError("el programa tiene errores")
+        function = lower(tree)
+        stats = None
+        if args.optimize or args.passes:
+            passes = args.passes.split(',') if args.passes else DEFAULT_PASSES
+            stats = optimize_ir(function, passes)
+        print(dump(function))
+        if args.stats:
+            print()
+            print((stats or IRStats(function.instruction_count())).format())
+        if args.run:
+            print()
+            for name, value in execute(function).items():
+                print(f"{name} = {value}")
+    except (CompileError, VMError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,89 @@
+"""Tabla de nombres de una compilación (internado de identificadores).
+
+El lexer crea un `str` nuevo por cada aparición de un identificador. Con una
+`NameTable` instalada en el lexer (`lexer.names`), cada nombre distinto se guarda
+una sola vez: todos los nodos del AST que lo usan comparten el mismo objeto
+(menos memoria, y su hash se calcula una vez) y recibe un id entero pequeño,
+consecutivo desde 0. `SymbolTable` indexa sus ámbitos por esos ids.
+
+El objeto internado es un `Name`: se usa como el `str`, pero lleva su id y la
+tabla que lo asignó, así que `id_of`/`find` lo resuelven una sola vez (al
+lexear) y después no vuelven a calcular el hash de la cadena.
+
+Una tabla dura lo que una compilación: `parse_and_analyze` instala en el lexer la
+del analizador, así que el lexer, el árbol y la tabla de símbolos comparten los
+mismos ids. En una sesión o en el demonio cada compilación empieza una tabla
+nueva y no crece sin límite.
+
+Uso:
+    names = NameTable()
+    x = names.intern(texto)      # el objeto canónico para ese nombre
+    i = names.id_of('x')         # su id (se asigna si es nuevo)
+    names.name_of(i)             # -> 'x'
+    x.id == i                    # el id viaja con el nombre
+"""
+from typing import Dict, List, Optional
+
+
+class Name(str):
+    """Nombre internado: un `str` con su `id` y la `NameTable` que se lo dio (`table`).
+
+    `str` no admite `__slots__` con campos en sus subclases; el `__dict__` se paga
+    una vez por nombre distinto de la compilación, no por aparición.
+    """
+
+    def __new__(cls, text: str, id: int, table: "NameTable"):
+        self = str.__new__(cls, text)
+        self.id = id
+        self.table = table
+        return self
+
+    def __reduce__(self):
+        # el id solo vale en su tabla: fuera del proceso (o al copiarlo) viaja como `str`
+        return str, (str(self),)
+
+
+class NameTable:
+    __slots__ = ('ids', 'names')
+
+    def __init__(self):
+        # nombre -> id; las claves son los objetos canónicos
+        self.ids: Dict[str, int] = {}
+        # id -> nombre
+        self.names: List[str] = []
+
+    def intern(self, name: str) -> Name:
+        """Devuelve el `Name` canónico de `name` (registrándolo si es nuevo)."""
+        if name.__class__ is Name and name.table is self:
+            return name
+        i = self.ids.get(name)
+        if i is None:
+            name = Name(name, len(self.names), self)
+            self.ids[name] = name.id
+            self.names.append(name)
+            return name
+        return self.names[i]
+
+    def id_of(self, name: str) -> int:
+        """Id de `name` (se asigna si es nuevo); sin hash si ya es un `Name` de esta tabla."""
+        if name.__class__ is Name and name.table is self:
+            return name.id
+        return self.intern(name).id
+
+    def find(self, name: str) -> Optional[int]:
+        """Id de `name` o `None` si nunca se registró (no lo añade)."""
+        if name.__class__ is Name and name.table is self:
+            return name.id
+        return self.ids.get(name)
+
+    def name_of(self, i: int) -> str:
+        return self.names[i]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __repr__(self):
+        return f"NameTable({len(self.names)} nombres)"
@@ -0,0 +1,285 @@
+"""Optimización del AST: plegado de constantes y simplificación algebraica.
+
+Pasada entre el parseo y la salida. Devuelve un árbol nuevo (el original no se
+modifica, así que puede venir de la caché) en el que:
+
+- las operaciones entre literales se evalúan: `+ - *` siempre, `/` solo si la
+  división es exacta y el divisor no es 0, las relacionales dan 1 o 0 y
+  `&&`/`||` con el operando izquierdo literal devuelven el operando que
+  correspondería en JavaScript (`0 && x` -> 0, `3 && x` -> x, `0 || x` -> x);
+- se aplican las identidades `x + 0`, `0 + x`, `x - 0`, `x * 1`, `1 * x` y
+  `x / 1` -> `x`, y `x * 0`, `0 * x` -> 0 cuando `x` es segura (todos sus
+  identificadores están declarados y no contiene divisiones);
+- los usos de un `const` cuyo valor ya se conoce se sustituyen por el número,
+  salvo que el nombre se reasigne en algún punto del programa (la VM acepta
+  `c = 6` sobre un `const` y el valor plegado dejaría de coincidir).
+
+Después, salvo con `dead_code=False`, `dataflow.py` elimina el código muerto
+que suele quedar al plegar (ramas `if` con condición literal, locales sin usar,
+almacenamientos que nadie lee).
+
+Para saber qué `const` es visible en cada punto el optimizador repite el
+análisis de ámbitos de `SemanticAnalyzer` con su propia `SymbolTable`. Los
+subárboles que no cambian se comparten con el árbol original.
+
+Uso:
+    tree, stats = optimize(tree)
+    print(stats.eliminated, "nodos eliminados")
+    print(stats.dead_code.format())
+"""
+import sys
+import os
+from typing import Dict, List, Optional, Set
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import SemanticAnalyzer, Symbol, get_parser_module
+from analisis_semantico.dataflow import DeadCodeStats, eliminate_dead_code
+
+RELATIONAL = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+class OptimizationStats:
+    """Contadores de una pasada de `optimize`."""
+    __slots__ = ('nodes_before', 'nodes_after', 'folded', 'simplified', 'propagated', 'dead_code')
+
+    def __init__(self):
+        self.nodes_before = 0
+        self.nodes_after = 0
+        # operaciones entre literales evaluadas
+        self.folded = 0
+        # identidades algebraicas y `&&`/`||` con operando izquierdo literal
+        self.simplified = 0
+        # usos de `const` sustituidos por su valor
+        self.propagated = 0
+        # lo que quitó la eliminación de código muerto (None si no se ejecutó)
+        self.dead_code: Optional[DeadCodeStats] = None
+
+    @property
+    def eliminated(self) -> int:
+        return self.nodes_before - self.nodes_after
+
+    def to_dict(self):
+        return {"nodes_before": self.nodes_before, "nodes_after": self.nodes_after,
+                "eliminated": self.eliminated, "folded": self.folded,
+                "simplified": self.simplified, "propagated": self.propagated,
+                "dead_code": self.dead_code.to_dict() if self.dead_code is not None else None}
+
+    def __repr__(self):
+        return (f"OptimizationStats(eliminated={self.eliminated}, folded={self.folded}, "
+                f"simplified={self.simplified}, propagated={self.propagated})")
+
+
+def count_nodes(tree) -> int:
+    if tree is None:
+        return 0
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children)
+    return count
+
+
+def fold_binary(op: str, left: int, right: int) -> Optional[int]:
+    """Valor de `left op right` entre literales, o None si no se puede plegar."""
+    if op == '+':
+        return left + right
+    if op == '-':
+        return left - right
+    if op == '*':
+        return left * right
+    if op == '/':
+        if right != 0 and left % right == 0:
+            return left // right
+        return None
+    if op in RELATIONAL:
+        return 1 if RELATIONAL[op](left, right) else 0
+    return None
+
+
+def assigned_names(tree) -> Set:
+    """Nombres que reciben alguna `assignment` en `tree`, en cualquier ámbito."""
+    names = set()
+    if tree is None:
+        return names
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node.type == 'assignment':
+            names.add(node.value)
+        if node.children:
+            stack.extend(node.children)
+    return names
+
+
+class ConstantFolder(SemanticAnalyzer):
+    """Reconstruye el árbol en postorden plegando expresiones.
+
+    Cada `leave_*` recoge de `self._results` los hijos ya optimizados y apila
+    el nodo resultante; los tipos sin `leave_*` propio usan `_rebuild`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stats = OptimizationStats()
+        self.node_class = get_parser_module().Node
+        # valor conocido de cada `const` declarado con un literal
+        self.constants: Dict[Symbol, int] = {}
+        # nombres que aparecen como destino de alguna `assignment`: sus `const` no se propagan
+        self._assigned: Set = set()
+        self._results: List = []
+        # símbolo declarado por cada `declaration` abierta (None si era redeclaración)
+        self._declared: List[Optional[Symbol]] = []
+
+    def _handlers(self, node_type: str):
+        visit, leave = super()._handlers(node_type)
+        return visit, leave or self._rebuild
+
+    def optimize(self, tree):
+        self.stats.nodes_before = count_nodes(tree)
+        self._assigned = assigned_names(tree)
+        self.analyze(tree)
+        result = self._results.pop() if self._results else None
+        self.stats.nodes_after = count_nodes(result)
+        return result
+
+    # -----------------------------
+    # Reconstrucción
+    # -----------------------------
+    def _collect(self, node):
+        """Devuelve `node` con sus hijos optimizados (el mismo objeto si no cambió ninguno)."""
+        children = node.children
+        n = len(children)
+        if not n:
+            return node
+        results = self._results
+        new_children = results[-n:]
+        del results[-n:]
+        if all(a is b for a, b in zip(new_children, children)):
+            return node
+        if children.__class__ is tuple:
+            new_children = tuple(new_children)
+        return self.node_class(node.type, new_children, node.value, node.start, node.end, node.lineno)
+
+    def _rebuild(self, node):
+        self._results.append(self._collect(node))
+
+    def _number(self, value: int, like):
+        return self.node_class("number", value=value, start=like.start, end=like.end, lineno=like.lineno)
+
+    def _is_safe(self, expr) -> bool:
+        """True si evaluar `expr` no puede fallar: identificadores declarados y sin `/`."""
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            if node.type == 'identifier':
+                if self.table.lookup(node.value) is None:
+                    return False
+            elif node.type == 'binary_op':
+                if node.value == '/':
+                    return False
+                stack.extend(node.children)
+            elif node.type != 'number':
+                return False
+        return True
+
+    # -----------------------------
+    # Declaraciones y usos
+    # -----------------------------
+    def visit_declaration(self, node):
+        sym = None
+        if node.value:
+            kind, name = node.value
+            if self.table.declare(name, kind):
+                # redeclaración: el valor del símbolo ya visible deja de ser fiable
+                self.constants.pop(self.table.lookup(name), None)
+            else:
+                sym = self.table.lookup(name)
+        self._declared.append(sym)
+
+    def leave_declaration(self, node):
+        sym = self._declared.pop()
+        new = self._collect(node)
+        if (sym is not None and sym.kind == 'const' and sym.name not in self._assigned
+                and new.children and new.children[0].type == 'number'):
+            self.constants[sym] = new.children[0].value
+        self._results.append(new)
+
+    def visit_identifier(self, node):
+        pass
+
+    def leave_identifier(self, node):
+        sym = self.table.lookup(node.value)
+        if sym is not None and sym in self.constants:
+            self.stats.propagated += 1
+            self._results.append(self._number(self.constants[sym], node))
+        else:
+            self._results.append(node)
+
+    def visit_number(self, node):
+        pass
+
+    def leave_statement_list(self, node):
+        super().leave_statement_list(node)
+        self._rebuild(node)
+
+    # -----------------------------
+    # Expresiones
+    # -----------------------------
+    def leave_binary_op(self, node):
+        self._results.append(self._simplify(self._collect(node)))
+
+    def _simplify(self, node):
+        op = node.value
+        left, right = node.children
+        left_const = left.type == 'number'
+        right_const = right.type == 'number'
+        stats = self.stats
+        if left_const and right_const:
+            value = fold_binary(op, left.value, right.value)
+            if value is not None:
+                stats.folded += 1
+                return self._number(value, node)
+        if left_const and op in ('&&', '||'):
+            stats.simplified += 1
+            truthy = left.value != 0
+            if (op == '&&') == truthy:
+                return right
+            return left
+        if right_const:
+            if right.value == 0 and op in ('+', '-') or right.value == 1 and op in ('*', '/'):
+                stats.simplified += 1
+                return left
+            if right.value == 0 and op == '*' and self._is_safe(left):
+                stats.simplified += 1
+                return self._number(0, node)
+        if left_const:
+            if left.value == 0 and op == '+' or left.value == 1 and op == '*':
+                stats.simplified += 1
+                return right
+            if left.value == 0 and op == '*' and self._is_safe(right):
+                stats.simplified += 1
+                return self._number(0, node)
+        return node
+
+
+def optimize(tree, dead_code: bool = True):
+    """Optimiza `tree` y devuelve `(árbol_nuevo, OptimizationStats)`."""
+    folder = ConstantFolder()
+    result = folder.optimize(tree)
+    stats = folder.stats
+    if dead_code:
+        result, stats.dead_code = eliminate_dead_code(result)
+        stats.nodes_after = count_nodes(result)
+    return result, stats
@@ -0,0 +1,204 @@
+"""Parseo en paralelo de un único archivo grande.
+
+El programa es un `statement_list` de sentencias independientes, así que un
+archivo enorme se puede partir en trozos de sentencias de nivel superior y
+parsear cada trozo en un proceso distinto:
+
+1. un preescaneo con una sola expresión regular (sin lexear) sigue la
+   profundidad de llaves y salta los comentarios; una sentencia de nivel
+   superior termina en `;` o `}` fuera de llaves, salvo que el siguiente token
+   sea `else` (la misma regla que `incremental.py`);
+2. cada trozo se lexea y parsea en un pool de procesos empezando en su línea, y
+   sus sentencias vuelven aplanadas (`tree_to_data`) con los offsets ya
+   desplazados a posiciones del archivo completo;
+3. las sentencias se juntan en orden en un solo `statement_list`, los caracteres
+   ilegales se informan en el orden del archivo y `SemanticAnalyzer` analiza el
+   árbol unido.
+
+El resultado (árbol, tabla de símbolos y diagnósticos) es idéntico al del
+parseo en serie. Si algún trozo tiene errores de sintaxis, la recuperación de
+errores podría no coincidir con la del archivo entero, así que el archivo se
+vuelve a parsear en serie.
+
+Uso:
+    tree, analyzer = analyze_parallel(code, jobs=8)
+
+    python analisis_semantico/semantic.py bundle.js -j 8
+"""
+import sys
+import os
+import re
+from multiprocessing import Pool, cpu_count
+from typing import List, NamedTuple, Optional, Tuple
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import (SemanticAnalyzer, analyze_code, get_parser_module, new_parser_and_lexer,
+                                         parse_and_analyze, parse_code, replay_diagnostics, reporting_to)
+from analisis_semantico.cache import tree_from_data, tree_to_data
+from comun.diagnostics import DiagnosticEngine, use_engine
+
+# por debajo de este tamaño no compensa repartir (arrancar el pool y copiar los datos)
+MIN_CHUNK_SIZE = 256 * 1024
+
+# comentarios (para no ver llaves ni `;` dentro) y los tokens que cierran sentencias;
+# el orden de las alternativas es el del lexer: `/* */` antes que `//`
+_PRESCAN = re.compile(r'/\*[\s\S]*?\*/|//[^\n]*|[{};]')
+# espacio ignorado y comentarios antes del siguiente token
+_GAP = re.compile(r'(?:[ \t\r\n]+|/\*[\s\S]*?\*/|//[^\n]*)*')
+_ELSE = re.compile(r'else(?![A-Za-z0-9_])')
+
+
+class Chunk(NamedTuple):
+    """Trozo `code[start:end]`, que empieza en la línea `lineno`."""
+    start: int
+    end: int
+    lineno: int
+
+
+# -----------------------------
+# Preescaneo
+# -----------------------------
+def split_points(code: str, chunk_size: int) -> List[int]:
+    """Offsets donde empieza cada trozo (el primero es 0).
+
+    Solo se corta tras un `;` o `}` de nivel superior, al menos `chunk_size`
+    caracteres después del corte anterior, si detrás queda algún token y no es `else`.
+    """
+    points = [0]
+    depth = 0
+    last = 0
+    gap = _GAP.match
+    for m in _PRESCAN.finditer(code):
+        c = m.group()
+        if c == '{':
+            depth += 1
+            continue
+        if c == '}':
+            depth = max(0, depth - 1)
+        elif c != ';':
+            continue
+        end = m.end()
+        if depth or end - last < chunk_size:
+            continue
+        following = gap(code, end).end()
+        if following == len(code) or _ELSE.match(code, following):
+            continue
+        points.append(end)
+        last = end
+    return points
+
+
+def split_source(code: str, chunk_size: int) -> List[Chunk]:
+    """Parte `code` en trozos de sentencias de nivel superior con su línea inicial."""
+    points = split_points(code, chunk_size)
+    points.append(len(code))
+    chunks = []
+    lineno = 1
+    for start, end in zip(points, points[1:]):
+        chunks.append(Chunk(start, end, lineno))
+        lineno += code.count('\n', start, end)
+    return chunks
+
+
+# -----------------------------
+# Parseo de trozos (en procesos trabajadores)
+# -----------------------------
+_worker_parser = None
+_worker_lexer = None
+
+
+def _init_worker(lexer_backend: str = 'ply'):
+    global _worker_parser, _worker_lexer
+    _worker_parser, _worker_lexer = new_parser_and_lexer(lexer_backend)
+
+
+def parse_chunk(job: Tuple[str, int, int]):
+    """Parsea un trozo. `job` es `(texto, offset, línea inicial)`.
+
+    Devuelve `(filas, nº de sentencias, fin, diagnósticos léxicos)` con offsets
+    del archivo completo, o `None` si el trozo tiene errores de sintaxis.
+    """
+    text, offset, lineno = job
+    if _worker_parser is None:
+        _init_worker()
+    engine = DiagnosticEngine(dedupe=False)
+    _worker_lexer.lineno = lineno
+    with use_engine(engine):
+        tree, errors = parse_code(_worker_parser, text, _worker_lexer)
+    if errors:
+        return None
+    statements = tree.children[0]
+    # sin las filas de `program` y `statement_list`: el padre las vuelve a crear
+    rows = tree_to_data(statements)[1:]
+    if offset:
+        for row in rows:
+            row[3] += offset
+            row[4] += offset
+    lex = [[d.code, d.severity, d.line, None if d.offset is None else d.offset + offset, d.args]
+           for d in engine.diagnostics]
+    return rows, len(statements.children), statements.end + offset, lex
+
+
+# -----------------------------
+# Análisis
+# -----------------------------
+def _parse_chunks(code: str, chunks: List[Chunk], processes: int, lexer_backend: str):
+    """Resultados de `parse_chunk` en orden, o `None` en cuanto un trozo tenga errores de sintaxis."""
+    jobs = [(code[c.start:c.end], c.start, c.lineno) for c in chunks]
+    results = []
+    with Pool(processes=min(processes, len(jobs)), initializer=_init_worker,
+              initargs=(lexer_backend,)) as pool:
+        for result in pool.imap(parse_chunk, jobs):
+            if result is None:
+                return None
+            results.append(result)
+    return results
+
+
+def analyze_parallel(code: str, jobs: Optional[int] = None, cache=None, lexer_backend: str = 'ply',
+                     diagnostics: Optional[DiagnosticEngine] = None, chunk_size: Optional[int] = None):
+    """Como `analyze_code`, pero parseando los trozos de `code` en `jobs` procesos.
+
+    Cada proceso recibe unos cuantos trozos (`chunk_size` caracteres como mínimo
+    cada uno). Con un solo proceso o un solo trozo equivale a `analyze_code`.
+    """
+    processes = jobs or cpu_count()
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SIZE, len(code) // (processes * 4) + 1)
+    chunks = split_source(code, chunk_size) if processes > 1 else []
+    if len(chunks) <= 1:
+        return analyze_code(code, cache=cache, lexer_backend=lexer_backend, diagnostics=diagnostics)
+    if cache is not None:
+        hit = cache.get(code)
+        if hit is not None:
+            replay_diagnostics(hit[1], diagnostics, code)
+            return hit
+
+    results = _parse_chunks(code, chunks, processes, lexer_backend)
+    analyzer = SemanticAnalyzer(diagnostics)
+    if results is None:
+        # con errores de sintaxis manda la recuperación sobre el archivo completo
+        parser_obj, lexer_obj = new_parser_and_lexer(lexer_backend)
+        tree = parse_and_analyze(parser_obj, analyzer, code, lexer_obj)
+    else:
+        engine = analyzer.diagnostics
+        with reporting_to(engine, code):
+            start = len(engine.diagnostics)
+            for _, _, _, lex in results:
+                for d_code, severity, line, offset, args in lex:
+                    engine.report(d_code, severity, line, offset, **args)
+            analyzer.lex_diagnostics = engine.by_prefix('L', start)
+            # como en `p_program`/`p_statement_list`: de la primera sentencia a la última
+            first = results[0][0][0]
+            span = [first[3], results[-1][2], first[5]]
+            n = sum(count for _, count, _, _ in results)
+            rows = [['program', None, 1] + span, ['statement_list', None, n] + span]
+            for chunk_rows, _, _, _ in results:
+                rows.extend(chunk_rows)
+            tree = tree_from_data(rows, get_parser_module().Node, analyzer.table.names)
+            analyzer.analyze(tree)
+    if cache is not None and not analyzer.syntax_errors:
+        cache.put(code, tree, analyzer)
+    return tree, analyzer
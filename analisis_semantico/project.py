@@ -0,0 +1,378 @@
+"""Análisis de proyecto: muchos archivos que comparten un único ámbito global.
+
+Cada archivo se analiza por separado (`FileAnalyzer`) y se resume en:
+
+- sus declaraciones de nivel superior: nombre, tipo y posición;
+- sus referencias libres: usos y asignaciones que su propio archivo no resuelve;
+- sus diagnósticos locales (léxicos, de sintaxis y redeclaraciones dentro del archivo).
+
+Los resúmenes se juntan en un índice global `nombre -> definiciones` y el enlace
+resuelve las referencias libres contra lo que declaran los demás archivos. Si un
+nombre se declara en varios archivos, su definición es la del primero por ruta
+y las demás son redeclaraciones globales (`S004`). Una referencia libre sin
+definición en otro archivo es `S002`/`S003`, igual que en un archivo suelto.
+
+El estado (resúmenes y resultados del enlace) se guarda en un JSON. En la
+siguiente ejecución solo se reanalizan los archivos cuyo hash cambió (antes se
+compara `mtime` y tamaño para no leer los que no se tocaron), y solo se vuelven
+a enlazar los que declaran o usan algún nombre cuyas definiciones cambiaron.
+
+Uso:
+    python analisis_semantico/project.py src/ --state proyecto.json -j 8
+    python analisis_semantico/project.py src/ --lookup contador
+"""
+import sys
+import os
+import bisect
+import hashlib
+import json
+import tempfile
+import time
+from multiprocessing import Pool, cpu_count
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import LEXER_BACKENDS, SemanticAnalyzer
+from analisis_semantico.session import CompilerSession
+from analisis_semantico.cache import version_stamp
+from analisis_semantico.batch import expand_paths
+from comun.diagnostics import Diagnostic, DiagnosticEngine, JsonLinesSink, TerminalSink
+
+STATE_FORMAT = "project-index"
+STATE_VERSION = 1
+DEFAULT_STATE = '.compilador-proyecto.json'
+
+
+class Definition(NamedTuple):
+    file: str
+    kind: str
+    line: int
+    column: Optional[int]
+    offset: int
+
+
+class FileAnalyzer(SemanticAnalyzer):
+    """`SemanticAnalyzer` que guarda los nombres no declarados como referencias
+    libres (para resolverlos contra el resto del proyecto) en lugar de informar
+    de ellos."""
+
+    def __init__(self, diagnostics=None):
+        super().__init__(diagnostics)
+        # (nombre, tipo, línea, columna, offset) de las declaraciones del ámbito global
+        self.exports: List[tuple] = []
+        # (código, nombre, línea, columna, offset) de los usos y asignaciones sin declaración visible
+        self.free: List[tuple] = []
+
+    def report(self, code: str, node, **args):
+        if code in ('S002', 'S003'):
+            self.free.append((code, args['name'], node.lineno, self.diagnostics.column(node.start), node.start))
+            return None
+        return super().report(code, node, **args)
+
+    def visit_declaration(self, node):
+        errors = len(self.semantic_diagnostics)
+        result = super().visit_declaration(node)
+        if result is not False and len(self.table.scopes) == 1 and len(self.semantic_diagnostics) == errors:
+            kind, name = node.value
+            self.exports.append((name, kind, node.lineno, self.diagnostics.column(node.start), node.start))
+        return result
+
+
+class FileSummary:
+    """Lo que el proyecto necesita de un archivo, sin su AST."""
+    __slots__ = ('path', 'mtime_ns', 'size', 'hash', 'exports', 'free', 'diagnostics', 'link')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime_ns = 0
+        self.size = 0
+        self.hash: Optional[str] = None
+        self.exports: List[tuple] = []
+        self.free: List[tuple] = []
+        # diagnósticos del análisis del archivo solo
+        self.diagnostics: List[Diagnostic] = []
+        # diagnósticos del último enlace con el resto del proyecto
+        self.link: List[Diagnostic] = []
+
+    def names(self) -> Set[str]:
+        return {e[0] for e in self.exports}
+
+    def refs(self) -> Set[str]:
+        return {f[1] for f in self.free}
+
+    def to_dict(self):
+        return {"path": self.path, "mtime_ns": self.mtime_ns, "size": self.size, "hash": self.hash,
+                "exports": self.exports, "free": self.free,
+                "diagnostics": [d.to_dict() for d in self.diagnostics],
+                "link": [d.to_dict() for d in self.link]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FileSummary":
+        summary = cls(data["path"])
+        summary.mtime_ns = data["mtime_ns"]
+        summary.size = data["size"]
+        summary.hash = data["hash"]
+        summary.exports = [tuple(e) for e in data["exports"]]
+        summary.free = [tuple(f) for f in data["free"]]
+        summary.diagnostics = [Diagnostic.from_dict(d) for d in data["diagnostics"]]
+        summary.link = [Diagnostic.from_dict(d) for d in data["link"]]
+        return summary
+
+
+def state_stamp() -> str:
+    """Versión del compilador y de este módulo: si cambia, el estado guardado no vale."""
+    h = hashlib.sha256(version_stamp().encode())
+    with open(__file__, 'rb') as fh:
+        h.update(fh.read())
+    return h.hexdigest()
+
+
+# -----------------------------
+# Resumen de archivos (en procesos trabajadores)
+# -----------------------------
+_worker_session: Optional[CompilerSession] = None
+
+
+def _init_worker(lexer_backend: str = 'ply'):
+    global _worker_session
+    _worker_session = CompilerSession(analyzer_class=FileAnalyzer, lexer_backend=lexer_backend)
+
+
+def summarize_file(job: Tuple[str, Optional[str]]) -> Tuple[FileSummary, bool]:
+    """Resume un archivo. `job` es `(ruta, hash anterior)`.
+
+    Devuelve `(summary, changed)`; si el contenido tiene el hash anterior no se
+    analiza y `summary` solo trae el `mtime` y el tamaño nuevos.
+    """
+    path, old_hash = job
+    if _worker_session is None:
+        _init_worker()
+    summary = FileSummary(path)
+    engine = DiagnosticEngine(file=path)
+    try:
+        st = os.stat(path)
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        summary.mtime_ns, summary.size = st.st_mtime_ns, st.st_size
+        summary.hash = hashlib.sha256(data).hexdigest()
+        if summary.hash == old_hash:
+            return summary, False
+        _, analyzer = _worker_session.compile(data.decode('utf8'), diagnostics=engine)
+        summary.exports = analyzer.exports
+        summary.free = analyzer.free
+    except (OSError, UnicodeDecodeError) as e:
+        engine.report('F001', error=str(e))
+    summary.diagnostics = engine.diagnostics
+    return summary, True
+
+
+# -----------------------------
+# Proyecto
+# -----------------------------
+class Project:
+    """Índice global de símbolos de un conjunto de archivos, actualizable de forma incremental."""
+
+    def __init__(self, state_path: Optional[str] = None, jobs: Optional[int] = None, lexer_backend: str = 'ply',
+                 chunksize: int = 16):
+        self.state_path = state_path
+        self.jobs = jobs
+        self.lexer_backend = lexer_backend
+        self.chunksize = chunksize
+        self.files: Dict[str, FileSummary] = {}
+        # nombre -> definiciones ordenadas por archivo (la primera es la que vale)
+        self.index: Dict[str, List[Definition]] = {}
+        # nombre -> archivos con referencias libres a ese nombre
+        self.users: Dict[str, Set[str]] = {}
+        if state_path:
+            self.load()
+
+    # -----------------------------
+    # Estado
+    # -----------------------------
+    def load(self) -> bool:
+        """Lee el estado guardado; si falta o es de otra versión se empieza de cero."""
+        try:
+            with open(self.state_path, 'r', encoding='utf8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return False
+        if (data.get("format"), data.get("version"), data.get("stamp")) != (STATE_FORMAT, STATE_VERSION,
+                                                                          state_stamp()):
+            return False
+        for entry in data["files"]:
+            summary = FileSummary.from_dict(entry)
+            self.files[summary.path] = summary
+            self._add(summary)
+        return True
+
+    def save(self):
+        data = {"format": STATE_FORMAT, "version": STATE_VERSION, "stamp": state_stamp(),
+                "files": [s.to_dict() for s in self.files.values()]}
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf8') as fh:
+            json.dump(data, fh, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, self.state_path)
+
+    # -----------------------------
+    # Índice
+    # -----------------------------
+    def _add(self, summary: FileSummary):
+        for name, kind, line, column, offset in summary.exports:
+            bisect.insort(self.index.setdefault(name, []), Definition(summary.path, kind, line, column, offset))
+        for name in summary.refs():
+            self.users.setdefault(name, set()).add(summary.path)
+
+    def _remove(self, summary: FileSummary):
+        for name in summary.names():
+            defs = [d for d in self.index[name] if d.file != summary.path]
+            if defs:
+                self.index[name] = defs
+            else:
+                del self.index[name]
+        for name in summary.refs():
+            users = self.users[name]
+            users.discard(summary.path)
+            if not users:
+                del self.users[name]
+
+    def lookup(self, name: str) -> Optional[Definition]:
+        """Definición global de `name` (la del primer archivo por ruta que lo declara)."""
+        defs = self.index.get(name)
+        return defs[0] if defs else None
+
+    def definitions(self, name: str) -> List[Definition]:
+        return list(self.index.get(name, ()))
+
+    # -----------------------------
+    # Actualización
+    # -----------------------------
+    def _summarize(self, jobs: List[Tuple[str, Optional[str]]]) -> Iterator[Tuple[FileSummary, bool]]:
+        processes = self.jobs or cpu_count()
+        if processes <= 1 or len(jobs) <= 1:
+            _init_worker(self.lexer_backend)
+            for job in jobs:
+                yield summarize_file(job)
+            return
+        with Pool(processes=min(processes, len(jobs)), initializer=_init_worker,
+                  initargs=(self.lexer_backend,)) as pool:
+            yield from pool.imap_unordered(summarize_file, jobs, chunksize=self.chunksize)
+
+    def update(self, paths: Iterable[str]) -> Dict:
+        """Deja el proyecto con exactamente `paths` y devuelve qué hubo que recalcular."""
+        start = time.perf_counter()
+        paths = [os.path.abspath(p) for p in paths]
+        wanted = set(paths)
+        changed_names: Set[str] = set()
+        relink: Set[str] = set()
+
+        removed = [path for path in self.files if path not in wanted]
+        for path in removed:
+            summary = self.files.pop(path)
+            self._remove(summary)
+            changed_names |= summary.names()
+
+        jobs = []
+        for path in paths:
+            old = self.files.get(path)
+            if old is not None:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    st = None
+                if st is not None and (st.st_mtime_ns, st.st_size) == (old.mtime_ns, old.size):
+                    continue
+            jobs.append((path, old.hash if old is not None else None))
+
+        analyzed = 0
+        for summary, changed in self._summarize(jobs):
+            old = self.files.get(summary.path)
+            if not changed:
+                # mismo contenido con otro mtime: basta con recordar el nuevo
+                old.mtime_ns, old.size = summary.mtime_ns, summary.size
+                continue
+            analyzed += 1
+            if old is not None:
+                self._remove(old)
+                changed_names |= old.names()
+            self.files[summary.path] = summary
+            self._add(summary)
+            changed_names |= summary.names()
+            relink.add(summary.path)
+
+        # las redeclaraciones dependen de quién más declara el nombre; las referencias, de si existe
+        for name in changed_names:
+            relink.update(d.file for d in self.index.get(name, ()))
+            relink |= self.users.get(name, set())
+        for path in relink:
+            self._link(self.files[path])
+
+        return {"files": len(self.files), "analyzed": analyzed, "relinked": len(relink), "removed": len(removed),
+                "symbols": len(self.index), "seconds": round(time.perf_counter() - start, 3)}
+
+    def _link(self, summary: FileSummary):
+        link = []
+        path = summary.path
+        for name, kind, line, column, offset in summary.exports:
+            first = self.index[name][0]
+            if first.file != path:
+                link.append(Diagnostic('S004', 'error', path, line, offset, column,
+                                       {'name': name, 'other': first.file, 'other_line': first.line}))
+        for code, name, line, column, offset in summary.free:
+            definition = self.lookup(name)
+            # declarada más adelante en el mismo archivo: es un uso antes de la declaración
+            if definition is None or definition.file == path:
+                link.append(Diagnostic(code, 'error', path, line, offset, column, {'name': name}))
+        summary.link = link
+
+    # -----------------------------
+    # Resultados
+    # -----------------------------
+    def diagnostics(self, path: str) -> List[Diagnostic]:
+        summary = self.files[os.path.abspath(path)]
+        return sorted(summary.diagnostics + summary.link, key=lambda d: (d.line or 0, d.offset or 0))
+
+    def report(self, engine: DiagnosticEngine) -> int:
+        """Entrega a `engine` los diagnósticos de todos los archivos (por ruta) y devuelve cuántos hay."""
+        total = 0
+        for path in sorted(self.files):
+            for d in self.diagnostics(path):
+                engine.add(d)
+                total += 1
+        return total
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Análisis de un proyecto con un ámbito global compartido')
+    arg_parser.add_argument('paths', nargs='+', help='Directorios, globs o archivos .js')
+    arg_parser.add_argument('--state', default=DEFAULT_STATE, help=f'Estado entre ejecuciones (por defecto {DEFAULT_STATE})')
+    arg_parser.add_argument('--no-state', action='store_true', help='No leer ni guardar el estado: analizar todo')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None, help='Procesos trabajadores (por defecto: todos los núcleos)')
+    arg_parser.add_argument('--lexer', choices=LEXER_BACKENDS, default='ply', help='Lexer a usar (fast: scanner de una sola regex)')
+    arg_parser.add_argument('--diagnostics', choices=('text', 'json'), default='text',
+                            help='text: archivo:línea:columna legible; json: una línea JSON por diagnóstico')
+    arg_parser.add_argument('--max-diagnostics', type=int, default=100, help='Diagnósticos por archivo como máximo (0: sin límite)')
+    arg_parser.add_argument('--lookup', action='append', default=[], help='Mostrar dónde se define este nombre global')
+    args = arg_parser.parse_args()
+
+    project = Project(None if args.no_state else args.state, jobs=args.jobs, lexer_backend=args.lexer)
+    stats = project.update(expand_paths(args.paths))
+    if not args.no_state:
+        project.save()
+
+    sink = JsonLinesSink() if args.diagnostics == 'json' else TerminalSink(show_location=True)
+    errors = project.report(DiagnosticEngine([sink], max_per_file=args.max_diagnostics or None))
+    for name in args.lookup:
+        defs = project.definitions(name)
+        if not defs:
+            print(f"{name}: no declarada")
+        for d in defs:
+            print(f"{name}: {d.kind} en {d.file}:{d.line}:{d.column}")
+    print(f"{stats['files']} archivos ({stats['analyzed']} analizados, {stats['relinked']} reenlazados, "
+          f"{stats['removed']} eliminados), {stats['symbols']} símbolos globales, {errors} diagnósticos "
+          f"en {stats['seconds']}s", file=sys.stderr)
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,360 @@
+"""Backend a Python: traduce el AST a un árbol del módulo `ast` y lo compila con `compile()`.
+
+El programa se convierte en una función `__programa__` cuyas variables son
+locales de Python (una por declaración, `<nombre>_<slot>`, resueltas con
+`SymbolTable` igual que en `codegen.py`), así que CPython ejecuta directamente
+las expresiones enteras y los `if`. Devuelve un diccionario con las variables
+globales. La semántica es la misma que la de la VM:
+
+- `/` divide truncando hacia 0 (`_div`) y la división por cero es `VMError`;
+- las relacionales dan 1 o 0 (en la condición de un `if` se usa la comparación
+  directamente) y `&&`/`||` son `and`/`or`;
+- las variables empiezan en 0.
+
+El compilador de CPython es recursivo, así que las subexpresiones de más de
+`SPILL_DEPTH` niveles se calculan antes en temporales. Si eso no se puede hacer
+sin cambiar el resultado (una división dentro del operando derecho de
+`&&`/`||`) o el árbol sigue siendo demasiado profundo, se lanza `CompileError`
+y hay que usar la VM.
+
+Los objetos código se guardan con `marshal` en `CodeCache`, indexados por el
+hash del fuente: una ejecución repetida no lexea, parsea, analiza ni optimiza.
+La caché vive en el subdirectorio `python/` del de `CompilationCache`, con su
+propio `max_bytes`, así que ninguna de las dos desaloja las entradas de la otra.
+
+Uso:
+    python analisis_semantico/pybackend.py programa.js
+    python analisis_semantico/pybackend.py programa.js --emit    # muestra el Python generado
+"""
+import sys
+import os
+import ast
+import hashlib
+import importlib.util
+import marshal
+from typing import Dict, List, Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import Symbol, SymbolTable, analyze_code
+from analisis_semantico.cache import DEFAULT_MAX_BYTES, CompilationCache, default_cache_dir, version_stamp
+from analisis_semantico.codegen import CompileError
+from analisis_semantico.optimizer import optimize
+from analisis_semantico.dataflow import eliminate_dead_code
+from analisis_semantico.vm import VMError
+
+BACKEND_VERSION = 1
+FUNCTION_NAME = '__programa__'
+# profundidad máxima de una expresión antes de partirla en temporales
+SPILL_DEPTH = 100
+
+_ARITHMETIC = {'+': ast.Add, '-': ast.Sub, '*': ast.Mult}
+_COMPARE = {'==': ast.Eq, '!=': ast.NotEq, '<': ast.Lt, '<=': ast.LtE, '>': ast.Gt, '>=': ast.GtE}
+_LOGIC = {'&&': ast.And, '||': ast.Or}
+
+_code_stamp: Optional[str] = None
+
+
+def _div(a: int, b: int) -> int:
+    """División entera truncando hacia 0, como `DIV` en la VM."""
+    if b == 0:
+        raise VMError("División por cero")
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+class PythonGenerator:
+    """Construye el `ast.Module` de un programa sin recursión.
+
+    Todos los nodos llevan su posición (la línea del fuente), porque
+    `ast.fix_missing_locations` es recursivo.
+    """
+
+    def __init__(self):
+        self.table = SymbolTable()
+        self.names: Dict[Symbol, str] = {}
+        self.locals: List[str] = []
+        self.temps = 0
+
+    def _at(self, node, lineno: int):
+        node.lineno = node.end_lineno = max(lineno, 1)
+        node.col_offset = node.end_col_offset = 0
+        return node
+
+    def _name(self, ident: str, lineno: int, ctx=ast.Load):
+        return self._at(ast.Name(id=ident, ctx=ctx()), lineno)
+
+    def _resolve(self, node, what: str) -> str:
+        sym = self.table.lookup(node.value)
+        if sym is None:
+            raise CompileError(f"{what} variable no declarada '{node.value}' en la línea {node.lineno}")
+        return self.names[sym]
+
+    # -----------------------------
+    # Expresiones
+    # -----------------------------
+    def expression(self, root, body: list, test: bool = False):
+        """Traduce la expresión `root`; los temporales que necesite se añaden a `body`.
+
+        `test`: el valor solo se usa como condición, así que las relacionales
+        pueden quedar como `bool`.
+        """
+        # entradas: (nodo, solo_condición, evaluación_condicional, hijos_hechos)
+        stack = [(root, test, False, False)]
+        # resultados: (expresión, profundidad, contiene_división)
+        results: List[tuple] = []
+        while stack:
+            node, in_test, conditional, done = stack.pop()
+            lineno = node.lineno
+            if node.type == 'number':
+                results.append((self._at(ast.Constant(node.value), lineno), 1, False))
+                continue
+            if node.type == 'identifier':
+                results.append((self._name(self._resolve(node, "Uso de"), lineno), 1, False))
+                continue
+            if node.type != 'binary_op':
+                raise CompileError(f"Nodo no soportado '{node.type}' en una expresión")
+            op = node.value
+            left, right = node.children
+            if not done:
+                logic = op in _LOGIC
+                stack.append((node, in_test, conditional, True))
+                stack.append((right, in_test and logic, conditional or logic, False))
+                stack.append((left, in_test and logic, conditional, False))
+                continue
+            r, r_depth, r_div = results.pop()
+            l, l_depth, l_div = results.pop()
+            # un temporal se evalúa siempre: solo vale si el operando se evaluaba
+            # siempre o no puede fallar (no tiene divisiones)
+            if l_depth >= SPILL_DEPTH:
+                if conditional and l_div:
+                    raise CompileError(f"Expresión demasiado profunda en la línea {lineno}")
+                l, l_depth = self._spill(l, body, lineno), 1
+            if r_depth >= SPILL_DEPTH:
+                if (conditional or op in _LOGIC) and r_div:
+                    raise CompileError(f"Expresión demasiado profunda en la línea {lineno}")
+                r, r_depth = self._spill(r, body, lineno), 1
+            has_div = l_div or r_div or op == '/'
+            depth = max(l_depth, r_depth) + 1
+            if op in _ARITHMETIC:
+                expr = ast.BinOp(left=l, op=_ARITHMETIC[op](), right=r)
+            elif op == '/':
+                expr = ast.Call(func=self._name('_div', lineno), args=[l, r], keywords=[])
+            elif op in _LOGIC:
+                expr = ast.BoolOp(op=_LOGIC[op](), values=[l, r])
+            else:
+                expr = ast.Compare(left=l, ops=[_COMPARE[op]()], comparators=[r])
+                if not in_test:
+                    expr = ast.IfExp(test=self._at(expr, lineno), body=self._at(ast.Constant(1), lineno),
+                                     orelse=self._at(ast.Constant(0), lineno))
+                    depth += 1
+            results.append((self._at(expr, lineno), depth, has_div))
+        return results[0][0]
+
+    def _spill(self, expr, body: list, lineno: int):
+        temp = f"_t{self.temps}"
+        self.temps += 1
+        body.append(self._at(ast.Assign(targets=[self._name(temp, lineno, ast.Store)], value=expr), lineno))
+        return self._name(temp, lineno)
+
+    # -----------------------------
+    # Sentencias
+    # -----------------------------
+    def module(self, tree) -> ast.Module:
+        if tree is None:
+            raise CompileError("No hay árbol que compilar")
+        root_list = tree.children[0] if tree.type == 'program' and tree.children else None
+        self.table.push_scope()
+        program_body: list = []
+        blocks: List[list] = []
+        # entradas: (nodo, lista de sentencias destino) o (acción, None)
+        stack = [(tree, program_body)]
+        while stack:
+            item, body = stack.pop()
+            if body is None:
+                item()
+                continue
+            kind = item.type
+            lineno = item.lineno
+            if kind == 'declaration':
+                decl_kind, name = item.value
+                err = self.table.declare(name, decl_kind)
+                if err:
+                    raise CompileError(f"{err} (línea {lineno})")
+                sym = self.table.lookup(name)
+                target = self.names[sym] = f"{name}_{len(self.locals)}"
+                self.locals.append(target)
+                value = self.expression(item.children[0], body)
+                body.append(self._at(ast.Assign(targets=[self._name(target, lineno, ast.Store)], value=value), lineno))
+            elif kind == 'assignment':
+                target = self._resolve(item, "Asignación a")
+                value = self.expression(item.children[0], body)
+                body.append(self._at(ast.Assign(targets=[self._name(target, lineno, ast.Store)], value=value), lineno))
+            elif kind == 'expression_statement':
+                value = self.expression(item.children[0], body)
+                body.append(self._at(ast.Expr(value=value), lineno))
+            elif kind in ('if', 'if-else'):
+                test = self.expression(item.children[0], body, test=True)
+                stmt = self._at(ast.If(test=test, body=[], orelse=[]), lineno)
+                body.append(stmt)
+                blocks.append(stmt.body)
+                if kind == 'if-else':
+                    blocks.append(stmt.orelse)
+                    stack.append((item.children[2], stmt.orelse))
+                stack.append((item.children[1], stmt.body))
+            elif kind == 'statement_list':
+                if item is not root_list:
+                    self.table.push_scope()
+                    stack.append((self.table.pop_scope, None))
+                stack.extend((child, body) for child in reversed(item.children))
+            elif kind == 'program':
+                stack.extend((child, body) for child in reversed(item.children))
+            elif kind == 'error':
+                raise CompileError(f"El programa tiene errores de sintaxis (línea {lineno})")
+            else:
+                raise CompileError(f"Nodo no soportado '{kind}'")
+        for block in blocks:
+            if not block:
+                block.append(self._at(ast.Pass(), 1))
+
+        function = ast.parse(f"def {FUNCTION_NAME}():\n    pass").body[0]
+        function.body = []
+        if self.locals:
+            targets = [self._name(name, 1, ast.Store) for name in self.locals]
+            function.body.append(self._at(ast.Assign(targets=targets, value=self._at(ast.Constant(0), 1)), 1))
+        function.body.extend(program_body)
+        # `str()`: las constantes del objeto código tienen que ser `str` exactos para `marshal`
+        global_names = [(str(sym.name), self.names[sym]) for sym in self.table.scopes[0].values()]
+        result = ast.Dict(keys=[self._at(ast.Constant(name), 1) for name, _ in global_names],
+                          values=[self._name(local, 1) for _, local in global_names])
+        function.body.append(self._at(ast.Return(value=self._at(result, 1)), 1))
+        return ast.Module(body=[function], type_ignores=[])
+
+
+def to_python_ast(tree) -> ast.Module:
+    """Módulo de Python equivalente al AST de `parser.py` (sin errores)."""
+    return PythonGenerator().module(tree)
+
+
+def to_python_source(tree) -> str:
+    """El programa como código fuente de Python (para inspeccionar la traducción)."""
+    return ast.unparse(to_python_ast(tree))
+
+
+def compile_tree(tree, filename: str = '<programa>'):
+    """Compila el AST a un objeto código de Python."""
+    module = to_python_ast(tree)
+    try:
+        return compile(module, filename, 'exec')
+    except (RecursionError, MemoryError):
+        raise CompileError("Programa demasiado anidado para el backend de Python") from None
+
+
+def run_code(code) -> Dict[str, int]:
+    """Ejecuta un objeto código de `compile_tree` y devuelve las variables globales."""
+    namespace = {'_div': _div}
+    exec(code, namespace)
+    return namespace[FUNCTION_NAME]()
+
+
+# -----------------------------
+# Caché de objetos código
+# -----------------------------
+def code_stamp() -> str:
+    """Marca de versión de los objetos código (se calcula una vez por proceso).
+
+    Incluye la de `CompilationCache`, la versión de CPython (el formato de
+    `marshal` y el bytecode cambian entre versiones) y la de este backend, del
+    optimizador y de la eliminación de código muerto.
+    """
+    global _code_stamp
+    if _code_stamp is None:
+        h = hashlib.sha256(version_stamp().encode())
+        h.update(importlib.util.MAGIC_NUMBER)
+        for module_file in (__file__, sys.modules[optimize.__module__].__file__,
+                            sys.modules[eliminate_dead_code.__module__].__file__):
+            with open(module_file, 'rb') as fh:
+                h.update(fh.read())
+        h.update(f"backend={BACKEND_VERSION}".encode())
+        _code_stamp = h.hexdigest()
+    return _code_stamp
+
+
+class CodeCache(CompilationCache):
+    """Objetos código en `marshal`, en `<directorio de CompilationCache>/python`."""
+    SUFFIX = '.marshal'
+    SUBDIRECTORY = 'python'
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        # subdirectorio propio: el tamaño y el desalojo no se mezclan con las entradas JSON
+        super().__init__(os.path.join(directory or default_cache_dir(), self.SUBDIRECTORY), max_bytes)
+
+    def key(self, code: str) -> str:
+        h = hashlib.sha256(code_stamp().encode())
+        h.update(code.encode('utf8'))
+        return h.hexdigest()
+
+    def get(self, code: str):
+        """Devuelve el objeto código guardado para `code` o `None`."""
+        path = self._path(self.key(code))
+        try:
+            with open(path, 'rb') as fh:
+                compiled = marshal.load(fh)
+            os.utime(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return compiled
+
+    def put(self, code: str, compiled):
+        self._write(self._path(self.key(code)), marshal.dumps(compiled))
+
+
+def compile_source(source: str, cache: Optional[CodeCache] = None, filename: str = '<programa>',
+                   lexer_backend: str = 'ply'):
+    """Objeto código de `source`, desde la caché o pasando por todas las fases."""
+    if cache is not None:
+        compiled = cache.get(source)
+        if compiled is not None:
+            return compiled
+    tree, analyzer = analyze_code(source, lexer_backend=lexer_backend)
+    if analyzer.syntax_errors:
+        raise CompileError(analyzer.syntax_errors[0].message)
+    if analyzer.errors:
+        raise CompileError(analyzer.errors[0])
+    tree, _ = optimize(tree)
+    compiled = compile_tree(tree, filename)
+    if cache is not None:
+        cache.put(source, compiled)
+    return compiled
+
+
+def run_source(source: str, cache: Optional[CodeCache] = None, filename: str = '<programa>',
+               lexer_backend: str = 'ply') -> Dict[str, int]:
+    return run_code(compile_source(source, cache, filename, lexer_backend))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Ejecutar un programa compilándolo a Python')
+    arg_parser.add_argument('file', help='Archivo JS a ejecutar')
+    arg_parser.add_argument('--no-cache', action='store_true', help='No leer ni escribir la caché de objetos código')
+    arg_parser.add_argument('--cache-dir', default=None, help='Directorio de la caché (por defecto ~/.cache/compilador)')
+    arg_parser.add_argument('--emit', action='store_true', help='Mostrar el código Python generado en lugar de ejecutarlo')
+    args = arg_parser.parse_args()
+
+    source = open(args.file, 'r', encoding='utf8').read()
+    try:
+        if args.emit:
+            tree, _ = analyze_code(source)
+            print(to_python_source(optimize(tree)[0]))
+        else:
+            cache = None if args.no_cache else CodeCache(args.cache_dir)
+            for name, value in run_source(source, cache, os.path.abspath(args.file)).items():
+                print(f"{name} = {value}")
+    except (CompileError, VMError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,294 @@
+"""Salida del AST en una sola pasada hacia un escritor (archivo, stdout, socket...).
+
+Formatos:
+
+- tree:   el árbol con líneas jerárquicas de `Node.pretty`; con colores solo si
+          se piden o, por defecto, si la salida es una terminal.
+- json:   `{"format": "ast-preorder", "version": 1, "nodes": [...]}` con un nodo
+          por elemento, en preorden, como `[type, value, nº de hijos, start, end,
+          lineno]` (el mismo aplanado que la caché). Al no anidar, se carga sin
+          recursión aunque el árbol sea muy profundo.
+- sexpr:  `(program (statement_list (declaration "var x" (number 10))))`; los
+          valores de texto van entre comillas con escapes JSON. No lleva posiciones
+          y omite los valores vacíos.
+- binary: cabecera `ASTB`, tabla de cadenas y un registro de tamaño fijo por nodo
+          en preorden (ver `BINARY_RECORD`), para cargar con `struct.iter_unpack`.
+
+Todos los escritores son iterativos y escriben por bloques, así que el coste es
+lineal en el tamaño de la salida. `load_json`, `load_sexpr` y `load_binary`
+reconstruyen el árbol.
+"""
+import sys
+import os
+import io
+import json
+import re
+import struct
+from typing import Dict, List, Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.cache import data_value, node_value, tree_from_data
+from analisis_semantico.names import NameTable
+from analisis_semantico.semantic import get_parser_module
+
+FORMATS = ('tree', 'json', 'sexpr', 'binary')
+JSON_FORMAT = "ast-preorder"
+JSON_VERSION = 1
+BINARY_MAGIC = b'ASTB'
+BINARY_VERSION = 1
+# tipo (índice en la tabla de cadenas), clase de valor, nº de hijos, valor, start, end, lineno
+BINARY_RECORD = struct.Struct('<IBIqqqi')
+# clases de valor en el formato binario
+VALUE_NONE, VALUE_INT, VALUE_STR, VALUE_BIGINT = range(4)
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+# líneas o registros que se acumulan antes de cada `write`
+BATCH = 4096
+
+
+def _preorder(tree):
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        children = node.children
+        if children:
+            stack.extend(reversed(children))
+
+
+def _use_color(out, color: Optional[bool]) -> bool:
+    if color is not None:
+        return color
+    isatty = getattr(out, 'isatty', None)
+    try:
+        return bool(isatty and isatty())
+    except ValueError:
+        return False
+
+
+# -----------------------------
+# Escritores
+# -----------------------------
+def render_tree(tree, out=None, color: Optional[bool] = None):
+    """Escribe el árbol como `Node.pretty`, sin construir la cadena completa."""
+    out = out or sys.stdout
+    if tree is None:
+        return
+    lines = get_parser_module().tree_lines(tree, _use_color(out, color))
+    batch: List[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= BATCH:
+            out.write(''.join(batch))
+            batch.clear()
+    out.write(''.join(batch))
+
+
+def render_json(tree, out=None):
+    out = out or sys.stdout
+    out.write('{"format":"%s","version":%d,"nodes":[' % (JSON_FORMAT, JSON_VERSION))
+    dumps = json.dumps
+    rows: List[list] = []
+    sep = ''
+    for node in (_preorder(tree) if tree is not None else ()):
+        rows.append([node.type, data_value(node), len(node.children), node.start, node.end, node.lineno])
+        if len(rows) >= BATCH:
+            # un `dumps` por bloque: se quitan los corchetes de la lista
+            out.write(sep + dumps(rows, ensure_ascii=False, separators=(',', ':'))[1:-1])
+            rows.clear()
+            sep = ','
+    if rows:
+        out.write(sep + dumps(rows, ensure_ascii=False, separators=(',', ':'))[1:-1])
+    out.write(']}\n')
+
+
+def render_sexpr(tree, out=None):
+    out = out or sys.stdout
+    if tree is None:
+        out.write('nil\n')
+        return
+    dumps = json.dumps
+    batch: List[str] = []
+    # entradas: un nodo o la cadena de cierre `)`
+    stack = [tree]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            batch.append(item)
+            continue
+        value = data_value(item)
+        if value is None or value == '':
+            batch.append('(' + item.type)
+        elif isinstance(value, int):
+            batch.append('(%s %d' % (item.type, value))
+        else:
+            batch.append('(%s %s' % (item.type, dumps(value, ensure_ascii=False)))
+        stack.append(')')
+        children = item.children
+        if children:
+            for child in reversed(children):
+                stack.append(child)
+                stack.append(' ')
+        if len(batch) >= BATCH:
+            out.write(''.join(batch))
+            batch.clear()
+    batch.append('\n')
+    out.write(''.join(batch))
+
+
+def render_binary(tree, out=None):
+    """Escribe el formato binario en un flujo de bytes (o en el `buffer` de uno de texto)."""
+    out = out or sys.stdout
+    if hasattr(out, 'buffer'):
+        # lo ya escrito en la capa de texto debe ir antes que los bytes
+        out.flush()
+        out = out.buffer
+    strings: Dict[str, int] = {}
+    records = bytearray()
+    pack = BINARY_RECORD.pack
+    count = 0
+    for node in (_preorder(tree) if tree is not None else ()):
+        type_index = strings.setdefault(node.type, len(strings))
+        value = data_value(node)
+        if value is None:
+            kind, payload = VALUE_NONE, 0
+        elif isinstance(value, int) and _INT64_MIN <= value <= _INT64_MAX:
+            kind, payload = VALUE_INT, value
+        elif isinstance(value, int):
+            kind, payload = VALUE_BIGINT, strings.setdefault(str(value), len(strings))
+        else:
+            kind, payload = VALUE_STR, strings.setdefault(value, len(strings))
+        records += pack(type_index, kind, len(node.children), payload, node.start, node.end, node.lineno)
+        count += 1
+    header = bytearray(BINARY_MAGIC)
+    header += struct.pack('<BI', BINARY_VERSION, len(strings))
+    for text in strings:
+        data = text.encode('utf8')
+        header += struct.pack('<I', len(data))
+        header += data
+    header += struct.pack('<I', count)
+    out.write(bytes(header))
+    out.write(bytes(records))
+
+
+RENDERERS = {
+    'tree': render_tree,
+    'json': render_json,
+    'sexpr': render_sexpr,
+    'binary': render_binary,
+}
+
+
+def render(tree, out=None, fmt: str = 'tree', **kwargs):
+    """Escribe `tree` en `out` con el formato `fmt` (uno de `FORMATS`)."""
+    if fmt not in RENDERERS:
+        raise ValueError(f"Formato desconocido '{fmt}' (opciones: {', '.join(FORMATS)})")
+    RENDERERS[fmt](tree, out, **kwargs)
+
+
+def render_to_string(tree, fmt: str = 'tree', **kwargs):
+    """Como `render`, pero devuelve `str` (o `bytes` para el formato binario)."""
+    out = io.BytesIO() if fmt == 'binary' else io.StringIO()
+    render(tree, out, fmt, **kwargs)
+    return out.getvalue()
+
+
+# -----------------------------
+# Cargadores
+# -----------------------------
+def load_json(fp):
+    """Lee el formato json desde un archivo o una cadena."""
+    data = json.loads(fp) if isinstance(fp, (str, bytes)) else json.load(fp)
+    if data.get("format") != JSON_FORMAT:
+        raise ValueError("No es un AST en formato json")
+    if not data["nodes"]:
+        return None
+    return tree_from_data(data["nodes"], get_parser_module().Node)
+
+
+_SEXPR_TOKEN = re.compile(r'\s*(?:(\()|(\))|("(?:[^"\\]|\\.)*")|(-?\d+)|([^\s()"]+))')
+
+
+def load_sexpr(text: str):
+    """Lee el formato sexpr. Los nodos vuelven sin posiciones (start/end = -1)."""
+    parser_module = get_parser_module()
+    node_class = parser_module.Node
+    names = NameTable()
+    root = None
+    stack: List = []
+    pos = 0
+    end = len(text.rstrip())
+    if text.strip() == 'nil':
+        return None
+    expect_type = False
+    while pos < end:
+        m = _SEXPR_TOKEN.match(text, pos)
+        if m is None:
+            raise ValueError(f"S-expresión inválida en la posición {pos}")
+        pos = m.end()
+        opening, closing, string, number, symbol = m.groups()
+        if opening:
+            expect_type = True
+        elif expect_type:
+            if symbol is None:
+                raise ValueError(f"Se esperaba un tipo de nodo en la posición {m.start()}")
+            node = node_class(symbol, [])
+            if stack:
+                stack[-1].children.append(node)
+            else:
+                root = node
+            stack.append(node)
+            expect_type = False
+        elif closing:
+            node = stack.pop()
+            if not node.children:
+                node.children = ()
+            node.value = node_value(node.type, node.value, names, parser_module)
+        elif string is not None:
+            stack[-1].value = json.loads(string)
+        elif number is not None:
+            stack[-1].value = int(number)
+        else:
+            raise ValueError(f"Símbolo inesperado '{symbol}' en la posición {m.start()}")
+    if stack:
+        raise ValueError("S-expresión sin cerrar")
+    return root
+
+
+def load_binary(data: bytes):
+    """Lee el formato binario (desde `bytes`, `bytearray`, `memoryview` o `mmap`)."""
+    view = memoryview(data)
+    if bytes(view[:4]) != BINARY_MAGIC:
+        raise ValueError("No es un AST en formato binario")
+    version, n_strings = struct.unpack_from('<BI', view, 4)
+    if version != BINARY_VERSION:
+        raise ValueError(f"Versión de formato binario no soportada: {version}")
+    offset = 9
+    strings = []
+    for _ in range(n_strings):
+        (length,) = struct.unpack_from('<I', view, offset)
+        offset += 4
+        strings.append(str(view[offset:offset + length], 'utf8'))
+        offset += length
+    (count,) = struct.unpack_from('<I', view, offset)
+    offset += 4
+    size = BINARY_RECORD.size
+    records = view[offset:offset + count * size]
+    if len(records) != count * size:
+        raise ValueError("Formato binario truncado")
+    nodes = []
+    append = nodes.append
+    for type_index, kind, n_children, payload, start, end, lineno in BINARY_RECORD.iter_unpack(records):
+        if kind == VALUE_INT:
+            value = payload
+        elif kind == VALUE_STR:
+            value = strings[payload]
+        elif kind == VALUE_BIGINT:
+            value = int(strings[payload])
+        else:
+            value = None
+        append((strings[type_index], value, n_children, start, end, lineno))
+    if not nodes:
+        return None
+    return tree_from_data(nodes, get_parser_module().Node)
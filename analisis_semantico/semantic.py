@@ -1,10 +1,16 @@
 ﻿import sys
 import os
+import copy
+from contextlib import contextmanager
 from typing import List, Dict, Optional
 
 # Asegurar que el proyecto raíz esté en sys.path para importar el parser y el lexer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from analisis_semantico.visitor import NodeVisitor
+from comun.diagnostics import Diagnostic, DiagnosticEngine, JsonLinesSink, use_engine
+from analisis_semantico.names import Name, NameTable
+
 try:
     # importamos el módulo parser (archivo parser/parser.py) como se hace en las pruebas del lexer
     from parser import parser as parser_module
@@ -14,12 +20,33 @@ except Exception:
     parser_module = None
     lexer_module = None
 
+try:
+    # lexer por bloques (lexer/streaming.py) para archivos que no caben cómodamente en memoria
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lexer'))
+    from streaming import DEFAULT_CHUNK_SIZE, StreamingLexer, open_source
+except Exception:
+    DEFAULT_CHUNK_SIZE = 1 << 20
+    StreamingLexer = None
+    open_source = None
+
+try:
+    # scanner alternativo de una sola expresión regular (lexer/fastlexer.py)
+    from fastlexer import FastLexer
+except Exception:
+    FastLexer = None
+
+LEXER_BACKENDS = ('ply', 'fast')
+
 
 class Symbol:
-    def __init__(self, name: str, kind: str, scope_level: int):
+    __slots__ = ('name', 'kind', 'scope_level', 'id')
+
+    def __init__(self, name: str, kind: str, scope_level: int, id: int = -1):
         self.name = name
         self.kind = kind
         self.scope_level = scope_level
+        # id del nombre en la `NameTable` de la tabla que lo declaró
+        self.id = id
 
     def to_dict(self):
         return {"name": self.name, "kind": self.kind, "scope_level": self.scope_level}
@@ -31,20 +58,58 @@ class Symbol:
 class SymbolTable:
     """Tabla de símbolos con soporte para ámbitos (stack de diccionarios).
 
-    Además guarda ámbitos completados para poder reportar todas las declaraciones
-    incluso si el scope fue cerrado durante el análisis.
-    """
+    Para resolver nombres en O(1) mantiene además un índice nombre -> pila de
+    símbolos visibles ("shadowing stack"): `declare` apila el símbolo y
+    `pop_scope` desapila los del ámbito que se cierra, así que la cima siempre es
+    la declaración más interna visible.
+
+    Los ámbitos cerrados se guardan en `completed_scopes` solo para poder reportar
+    todas las declaraciones (`all_symbols`); `lookup` ya no los consulta.
 
-    def __init__(self):
-        self.scopes: List[Dict[str, Symbol]] = []
-        self.completed_scopes: List[Dict[str, Symbol]] = []
+    Los nombres se convierten en ids enteros con la `NameTable` de la compilación
+    (`names`): los ámbitos son diccionarios id -> símbolo y el índice de
+    visibilidad es una lista indexada por id. Los identificadores del AST ya son
+    `Name` de esa tabla, con el id que les dio el lexer, así que `declare` y
+    `lookup` pasan directamente a `lookup_id` sin volver a hashear la cadena.
 
-    def push_scope(self):
-        self.scopes.append({})
+    Una tabla creada sin `names` adopta la del primer `Name` que declara: los
+    recorridos posteriores (optimizador, eliminación de código muerto, `codegen`,
+    backend de Python, IR) resuelven así con los ids del lexer sin que haya que
+    pasarles la `NameTable`.
+    """
+
+    def __init__(self, names: Optional[NameTable] = None):
+        self.names = names if names is not None else NameTable()
+        self.scopes: List[Dict[int, Symbol]] = []
+        self.completed_scopes: List[Dict[int, Symbol]] = []
+        # id -> pila de símbolos visibles (None si no hay ninguno)
+        self._bindings: List[Optional[List[Symbol]]] = []
+
+    def _stack_for(self, i: int) -> List[Symbol]:
+        bindings = self._bindings
+        if i >= len(bindings):
+            bindings.extend([None] * (i + 1 - len(bindings)))
+        stack = bindings[i]
+        if stack is None:
+            stack = bindings[i] = []
+        return stack
+
+    def push_scope(self, symbols: Optional[Dict[int, Symbol]] = None):
+        """Abre un ámbito nuevo, opcionalmente ya poblado con `symbols` (id -> símbolo)."""
+        scope = symbols if symbols is not None else {}
+        self.scopes.append(scope)
+        for i, sym in scope.items():
+            self._stack_for(i).append(sym)
 
     def pop_scope(self):
         if self.scopes:
             popped = self.scopes.pop()
+            bindings = self._bindings
+            for i in popped:
+                stack = bindings[i]
+                stack.pop()
+                if not stack:
+                    bindings[i] = None
             # conservar el scope cerrado para reportes posteriores
             self.completed_scopes.append(popped)
             return popped
@@ -55,22 +120,28 @@ class SymbolTable:
         if not self.scopes:
             self.push_scope()
         current = self.scopes[-1]
-        if name in current:
+        if name.__class__ is Name and not self.names:
+            # tabla propia aún vacía: se adoptan los ids del árbol
+            self.names = name.table
+        i = self.names.id_of(name)
+        if i in current:
             return f"Redeclaración de '{name}' en el mismo ámbito"
-        sym = Symbol(name, kind, len(self.scopes) - 1)
-        current[name] = sym
+        sym = Symbol(name, kind, len(self.scopes) - 1, i)
+        current[i] = sym
+        self._stack_for(i).append(sym)
         return None
 
     def lookup(self, name: str) -> Optional[Symbol]:
-        """Busca el símbolo en los ámbitos desde el más interno al externo."""
-        for scope in reversed(self.scopes):
-            if name in scope:
-                return scope[name]
-        # buscar también en ámbitos ya cerrados (opcional)
-        for scope in reversed(self.completed_scopes):
-            if name in scope:
-                return scope[name]
-        return None
+        """Devuelve la declaración visible más interna de `name` (O(1))."""
+        i = self.names.find(name)
+        return None if i is None else self.lookup_id(i)
+
+    def lookup_id(self, i: int) -> Optional[Symbol]:
+        """Como `lookup`, con el id del nombre en `names`."""
+        if i >= len(self._bindings):
+            return None
+        stack = self._bindings[i]
+        return stack[-1] if stack else None
 
     def current_scope_symbols(self) -> List[Symbol]:
         if not self.scopes:
@@ -88,18 +159,40 @@ class SymbolTable:
         return out
 
 
-class SemanticAnalyzer:
+class SemanticAnalyzer(NodeVisitor):
     """Analizador semántico simple que construye una tabla de símbolos y detecta errores básicos.
 
     - declara variables (var/let/const)
     - detecta redeclaraciones en el mismo ámbito
     - detecta asignaciones o usos de variables no declaradas
     - maneja ámbitos por bloques (cada `statement_list` dentro de un bloque crea un nuevo scope)
+
+    El recorrido es iterativo (`NodeVisitor`), así que no hay límite de profundidad.
+    Los errores se informan al `DiagnosticEngine` dado (o a uno propio que solo
+    los recoge) y quedan además en `semantic_diagnostics`.
     """
 
-    def __init__(self):
-        self.table = SymbolTable()
-        self.errors: List[str] = []
+    def __init__(self, diagnostics: Optional[DiagnosticEngine] = None, names: Optional[NameTable] = None):
+        self.table = SymbolTable(names)
+        self.diagnostics = diagnostics if diagnostics is not None else DiagnosticEngine()
+        # todos los errores semánticos, aunque el motor descarte repetidos o pase del máximo
+        self.semantic_diagnostics: List[Diagnostic] = []
+        # caracteres ilegales (L001) que el motor aceptó mientras se lexeaba este fuente
+        self.lex_diagnostics: List[Diagnostic] = []
+        # errores de sintaxis (SyntaxErrorInfo) del parseo que produjo el árbol analizado
+        self.syntax_errors: List = []
+        # statement_list raíz del programa: usa el scope global en lugar de abrir uno
+        self._root_list = None
+
+    @property
+    def errors(self) -> List[str]:
+        """Mensajes de los errores semánticos (se formatean al pedirlos)."""
+        return [d.message for d in self.semantic_diagnostics]
+
+    def report(self, code: str, node, **args) -> Diagnostic:
+        diagnostic = self.diagnostics.report(code, line=node.lineno, offset=node.start, **args)
+        self.semantic_diagnostics.append(diagnostic)
+        return diagnostic
 
     def analyze(self, node):
         """Punto de entrada: recibe el AST (Node) construido por `parser`."""
@@ -109,99 +202,46 @@ class SemanticAnalyzer:
         return self.table
 
     def _analyze_node(self, node, in_program_root=False):
-        if node is None:
-            return
-        t = getattr(node, 'type', None)
-        if t == 'program':
-            # program -> statement_list
-            self._analyze_node(node.children[0], in_program_root=True)
-
-        elif t == 'statement_list':
-            # Si es root del programa ya tenemos el scope global; si es bloque (no root) creamos nuevo scope
-            if in_program_root:
-                for child in node.children:
-                    self._analyze_node(child)
-            else:
-                # nuevo scope para este statement_list
-                self.table.push_scope()
-                for child in node.children:
-                    self._analyze_node(child)
-                self.table.pop_scope()
-
-        elif t == 'declaration':
-            # value: "var x" o "let y" etc.
-            if not node.value:
-                return
-            parts = node.value.split()
-            if len(parts) >= 2:
-                kind = parts[0]
-                name = parts[1]
-            else:
-                # defensa simple
-                return
-            err = self.table.declare(name, kind)
-            if err:
-                self.errors.append(err)
-            # analizar la expresión de inicialización
-            for child in node.children:
-                self._analyze_node(child)
-
-        elif t == 'assignment':
-            # value: nombre de variable asignada
-            name = node.value
-            if not self.table.lookup(name):
-                self.errors.append(f"Asignación a variable no declarada '{name}'")
-            for child in node.children:
-                self._analyze_node(child)
-
-        elif t == 'expression_statement':
-            for child in node.children:
-                self._analyze_node(child)
-
-        elif t == 'if':
-            # children: [condition, consequent]
-            cond = node.children[0]
-            cons = node.children[1]
-            self._analyze_node(cond)
-            # si el consequent es un statement_list, creamos scope; lo manejamos pasando flag
-            if getattr(cons, 'type', None) == 'statement_list':
-                self._analyze_node(cons, in_program_root=False)
-            else:
-                self._analyze_node(cons)
-
-        elif t == 'if-else':
-            # children: [condition, consequent, alternate]
-            cond = node.children[0]
-            cons = node.children[1]
-            alt = node.children[2]
-            self._analyze_node(cond)
-            if getattr(cons, 'type', None) == 'statement_list':
-                self._analyze_node(cons, in_program_root=False)
-            else:
-                self._analyze_node(cons)
-            if getattr(alt, 'type', None) == 'statement_list':
-                self._analyze_node(alt, in_program_root=False)
-            else:
-                self._analyze_node(alt)
-
-        elif t == 'binary_op':
-            # children: left, right
-            left, right = node.children
-            self._analyze_node(left)
-            self._analyze_node(right)
-
-        elif t == 'identifier':
-            name = node.value
-            if not self.table.lookup(name):
-                self.errors.append(f"Uso de variable no declarada '{name}'")
-
-        elif t == 'number':
-            return
-
-        else:
-            # Para cualquier otro tipo, intentar analizar hijos
-            for child in getattr(node, 'children', []) or []:
-                self._analyze_node(child)
+        if in_program_root and getattr(node, 'type', None) == 'statement_list':
+            self._root_list = node
+        self.walk(node)
+
+    def visit_program(self, node):
+        # program -> statement_list
+        if node.children:
+            self._root_list = node.children[0]
+
+    def visit_statement_list(self, node):
+        # Si es root del programa ya tenemos el scope global; si es bloque (no root) creamos nuevo scope
+        if node is not self._root_list:
+            self.table.push_scope()
+
+    def leave_statement_list(self, node):
+        if node is not self._root_list:
+            self.table.pop_scope()
+
+    def visit_declaration(self, node):
+        # value: Declared(kind, name), p. ej. ('var', 'x')
+        if not node.value:
+            return False
+        kind, name = node.value
+        if self.table.declare(name, kind):
+            self.report('S001', node, name=name)
+        # después se analiza la expresión de inicialización (hijos)
+
+    def visit_assignment(self, node):
+        # value: nombre de variable asignada
+        name = node.value
+        if not self.table.lookup(name):
+            self.report('S002', node, name=name)
+
+    def visit_identifier(self, node):
+        name = node.value
+        if not self.table.lookup(name):
+            self.report('S003', node, name=name)
+
+    def visit_number(self, node):
+        return False
 
 
 def pretty_print_table(table: SymbolTable):
@@ -234,41 +274,260 @@ def get_parser_and_lexer():
     return parser_obj, lexer_obj
 
 
-def analyze_code(code: str):
+def get_parser_module():
+    """Devuelve el módulo `parser/parser.py` (donde viven `Node` y la gramática).
+
+    `parser_module` puede ser el propio módulo o el objeto parser si el llamador ya
+    registró `parser.py` en `sys.modules`; en ese caso se llega al módulo a través
+    de `p_error`.
+    """
+    if parser_module is None:
+        return None
+    if hasattr(parser_module, 'Node'):
+        return parser_module
+    errorfunc = getattr(parser_module, 'errorfunc', None)
+    return sys.modules.get(errorfunc.__module__) if errorfunc else None
+
+
+def new_parser_and_lexer(lexer_backend: str = 'ply'):
+    """Devuelve un (parser, lexer) privado para una compilación o sesión.
+
+    El lexer es un `clone()` con `lineno` reiniciado y el parser una copia superficial:
+    comparte las tablas LALR (de solo lectura) pero no las pilas de estado que
+    `parse` guarda en la instancia, así que varios hilos pueden compilar a la vez.
+
+    `lexer_backend` elige el lexer: `'ply'` (lexer/lexer.py) o `'fast'`
+    (`FastLexer`, mismos tokens con un solo `finditer`).
+    """
+    if lexer_backend not in LEXER_BACKENDS:
+        raise ValueError(f"Lexer desconocido '{lexer_backend}' (opciones: {', '.join(LEXER_BACKENDS)})")
     parser_obj, lexer_obj = get_parser_and_lexer()
     if parser_obj is None or lexer_obj is None:
+        return None, None
+    if lexer_backend == 'fast':
+        if FastLexer is None:
+            return None, None
+        lexer_obj = FastLexer()
+    lexer_obj = lexer_obj.clone()
+    lexer_obj.lineno = 1
+    return copy.copy(parser_obj), lexer_obj
+
+
+def parse_code(parser_obj, code: Optional[str] = None, lexer_obj=None, tokenfunc=None,
+               names: Optional[NameTable] = None):
+    """Parsea con recuperación de errores: devuelve `(tree, syntax_errors)` sin imprimir nada.
+
+    Si el lexer produce los tokens, los identificadores se internan en `names`
+    (o en una `NameTable` nueva: cada compilación tiene la suya).
+    """
+    if lexer_obj is not None and tokenfunc is None:
+        lexer_obj.names = names if names is not None else NameTable()
+    return get_parser_module().parse_with_errors(parser_obj, code, lexer_obj, tokenfunc)
+
+
+@contextmanager
+def reporting_to(engine: DiagnosticEngine, code: Optional[str] = None):
+    """Instala `engine` en este hilo (el lexer y el parser informan a él) y, si se
+    da el texto `code`, lo usa para calcular columnas mientras dura el bloque."""
+    previous = engine.source
+    if code is not None:
+        engine.source = code
+    try:
+        with use_engine(engine):
+            yield engine
+    finally:
+        engine.source = previous
+
+
+def parse_and_analyze(parser_obj, analyzer: SemanticAnalyzer, code: Optional[str] = None, lexer_obj=None):
+    """Parsea y analiza informando al motor `analyzer.diagnostics`; devuelve el árbol.
+
+    El lexer interna los identificadores en la `NameTable` de la tabla de
+    símbolos del analizador, así que ambos comparten los ids.
+    """
+    engine = analyzer.diagnostics
+    with reporting_to(engine, code):
+        start = len(engine.diagnostics)
+        tree, analyzer.syntax_errors = parse_code(parser_obj, code, lexer_obj, names=analyzer.table.names)
+        analyzer.lex_diagnostics = engine.by_prefix('L', start)
+        analyzer.analyze(tree)
+    return tree
+
+
+def replay_diagnostics(analyzer: SemanticAnalyzer, engine: Optional[DiagnosticEngine], code: Optional[str] = None):
+    """Vuelve a informar a `engine` de los diagnósticos de un resultado cacheado."""
+    if engine is None:
+        return
+    with reporting_to(engine, code):
+        for d in analyzer.lex_diagnostics + analyzer.semantic_diagnostics:
+            engine.report(d.code, d.severity, d.line, d.offset, **d.args)
+    analyzer.diagnostics = engine
+
+
+def analyze_code(code: str, cache=None, lexer_backend: str = 'ply', diagnostics: Optional[DiagnosticEngine] = None):
+    """Analiza `code` y devuelve `(tree, analyzer)`.
+
+    Si se pasa una `CompilationCache` y el fuente ya está en ella, se devuelve el
+    resultado guardado sin lexear, parsear ni analizar (sus diagnósticos se
+    repiten en `diagnostics`). Sin `diagnostics` no se imprime nada: los errores
+    quedan en el analizador.
+    """
+    if cache is not None:
+        hit = cache.get(code)
+        if hit is not None:
+            replay_diagnostics(hit[1], diagnostics, code)
+            return hit
+    parser_obj, lexer_obj = new_parser_and_lexer(lexer_backend)
+    if parser_obj is None or lexer_obj is None:
+        raise SystemExit(1)
+    analyzer = SemanticAnalyzer(diagnostics)
+    tree = parse_and_analyze(parser_obj, analyzer, code, lexer_obj)
+    # los fuentes con errores de sintaxis se están editando: no se cachean
+    if cache is not None and not analyzer.syntax_errors:
+        cache.put(code, tree, analyzer)
+    return tree, analyzer
+
+
+def analyze_stream(source, chunk_size: Optional[int] = None, lexer_backend: str = 'ply',
+                   diagnostics: Optional[DiagnosticEngine] = None):
+    """Como `analyze_code`, pero tokenizando `source` (archivo o mmap) por bloques.
+
+    El fuente nunca se carga entero en memoria; no usa la caché porque esta se
+    indexa por el hash del texto completo (ni calcula columnas por lo mismo).
+    """
+    parser_obj, lexer_obj = new_parser_and_lexer(lexer_backend)
+    if parser_obj is None or StreamingLexer is None:
         raise SystemExit(1)
-    tree = parser_obj.parse(code, lexer=lexer_obj)
-    analyzer = SemanticAnalyzer()
-    analyzer.analyze(tree)
+    stream = StreamingLexer(source, chunk_size or DEFAULT_CHUNK_SIZE, base_lexer=lexer_obj)
+    analyzer = SemanticAnalyzer(diagnostics)
+    tree = parse_and_analyze(parser_obj, analyzer, lexer_obj=stream)
     return tree, analyzer
 
 
-def run_file(path: str):
+def run_file(path: str, cache=None, stream=False, lexer_backend: str = 'ply', fmt: str = 'tree',
+             output: Optional[str] = None, optimize: bool = False, execute: bool = False,
+             stats: bool = False, diagnostics_format: str = 'text', jobs: Optional[int] = None):
     path = os.path.abspath(path)
     if not os.path.exists(path):
         print(f"Archivo no encontrado: {path}")
         return
-    code = open(path, 'r', encoding='utf8').read()
+    report = None
+    # json: una línea por diagnóstico en stderr a medida que se producen; text: se listan al final
+    json_diagnostics = diagnostics_format == 'json'
+    engine = DiagnosticEngine([JsonLinesSink(sys.stderr)] if json_diagnostics else [], file=path)
     try:
-        tree, analyzer = analyze_code(code)
+        if stats:
+            # instrumentado: se lee el archivo entero y no se usa la caché
+            from analisis_semantico.instrumentation import profile_code
+            code = open(path, 'r', encoding='utf8').read()
+            tree, analyzer, report = profile_code(code, lexer_backend=lexer_backend, file=path, diagnostics=engine)
+        elif stream:
+            with open_source(path, use_mmap=True) as source:
+                tree, analyzer = analyze_stream(source, lexer_backend=lexer_backend, diagnostics=engine)
+        elif jobs is not None:
+            # un archivo grande partido en sentencias de nivel superior y parseado en varios procesos
+            from analisis_semantico.parallel import analyze_parallel
+            code = open(path, 'r', encoding='utf8').read()
+            tree, analyzer = analyze_parallel(code, jobs=jobs, cache=cache, lexer_backend=lexer_backend,
+                                              diagnostics=engine)
+        else:
+            code = open(path, 'r', encoding='utf8').read()
+            tree, analyzer = analyze_code(code, cache=cache, lexer_backend=lexer_backend, diagnostics=engine)
     except Exception as e:
         print(f"Error analizando {path}: {e}")
         return
 
+    from analisis_semantico.render import render
+
+    opt_stats = None
+    if optimize and tree is not None:
+        from analisis_semantico.optimizer import optimize as optimize_tree
+        if report is not None:
+            from analisis_semantico.instrumentation import Profiler
+            with Profiler(report).phase('optimize'):
+                tree, opt_stats = optimize_tree(tree)
+        else:
+            tree, opt_stats = optimize_tree(tree)
+
+    if fmt != 'tree' and output is None:
+        # formato de máquina por stdout: solo el AST; los errores van a stderr
+        render(tree, sys.stdout, fmt)
+        if opt_stats is not None:
+            print(f'Optimización: {opt_stats.eliminated} nodos eliminados', file=sys.stderr)
+        if not json_diagnostics:
+            for d in engine.diagnostics:
+                print(' -', d.message, file=sys.stderr)
+        if report is not None:
+            print(report.format(), file=sys.stderr)
+        return
+
     print(f"\n==> {path}\n")
-    if tree:
-        print(tree.pretty())
+    if tree and output:
+        with open(output, 'wb' if fmt == 'binary' else 'w', **({} if fmt == 'binary' else {'encoding': 'utf8'})) as fh:
+            render(tree, fh, fmt)
+        print(f"AST escrito en {output} ({fmt})\n")
+    elif tree:
+        # colores solo si stdout es una terminal
+        render(tree, sys.stdout, 'tree')
+        print()
     else:
         print("No se pudo generar el AST (error de sintaxis probable).\n")
 
+    if opt_stats is not None:
+        print(f'Optimización: {opt_stats.eliminated} nodos eliminados ({opt_stats.nodes_before} -> '
+              f'{opt_stats.nodes_after}; {opt_stats.folded} plegados, {opt_stats.simplified} simplificados, '
+              f'{opt_stats.propagated} const propagados)')
+        if opt_stats.dead_code is not None and opt_stats.dead_code.total:
+            print(opt_stats.dead_code.format())
+        print()
+
+    if not json_diagnostics:
+        lex_errors = engine.by_prefix('L')
+        if lex_errors:
+            print('Errores léxicos:')
+            for d in lex_errors:
+                print(' ❌', d.message)
+            print()
+        if analyzer.syntax_errors:
+            print('Errores de sintaxis:')
+            for e in analyzer.syntax_errors:
+                print(' ❌', e.message)
+            print()
+
     pretty_print_table(analyzer.table)
-    if analyzer.errors:
-        print('\nErrores semánticos:')
-        for e in analyzer.errors:
-            print(' -', e)
-    else:
-        print('\nNo se encontraron errores semánticos.')
+    if not json_diagnostics:
+        if analyzer.errors:
+            print('\nErrores semánticos:')
+            for e in analyzer.errors:
+                print(' -', e)
+        else:
+            print('\nNo se encontraron errores semánticos.')
+
+    if execute:
+        run_program(tree, analyzer)
+
+    if report is not None:
+        print()
+        print(report.format())
+
+
+def run_program(tree, analyzer):
+    """Compila a bytecode, ejecuta en la VM e imprime las variables globales."""
+    from analisis_semantico.codegen import CompileError, compile_program
+    from analisis_semantico.vm import VMError, run
+
+    if analyzer.syntax_errors or analyzer.errors:
+        print('\nNo se ejecuta: el programa tiene errores.')
+        return
+    try:
+        program = compile_program(tree)
+        slots = run(program)
+    except (CompileError, VMError) as e:
+        print(f'\nError de ejecución: {e}')
+        return
+    print('\nVariables globales:')
+    for name, value in program.globals_of(slots).items():
+        print(f' - {name:10} = {value}')
 
 
 if __name__ == '__main__':
@@ -276,10 +535,37 @@ if __name__ == '__main__':
 
     parser = argparse.ArgumentParser(description='Analizador semántico básico - demo')
     parser.add_argument('file', nargs='?', help='Archivo JS a analizar dentro de ejemplos/')
+    parser.add_argument('--no-cache', action='store_true', help='No leer ni escribir la caché de compilación')
+    parser.add_argument('--cache-dir', default=None, help='Directorio de la caché (por defecto ~/.cache/compilador)')
+    parser.add_argument('--stream', action='store_true', help='Tokenizar el archivo por bloques (mmap) sin cargarlo entero')
+    parser.add_argument('--lexer', choices=LEXER_BACKENDS, default='ply', help='Lexer a usar (fast: scanner de una sola regex)')
+    parser.add_argument('--format', choices=('tree', 'json', 'sexpr', 'binary'), default='tree',
+                        help='Formato del AST (tree: árbol legible; json/sexpr/binary: para otras herramientas)')
+    parser.add_argument('-o', '--output', default=None, help='Escribir el AST en este archivo en lugar de stdout')
+    parser.add_argument('-O', '--optimize', action='store_true',
+                        help='Plegar constantes y simplificar expresiones antes de mostrar el AST')
+    parser.add_argument('--run', action='store_true', help='Compilar a bytecode y ejecutar el programa en la VM')
+    parser.add_argument('--stats', action='store_true',
+                        help='Medir cada fase (tiempo, tokens, nodos, ámbitos, búsquedas); no usa la caché')
+    parser.add_argument('--diagnostics', choices=('text', 'json'), default='text',
+                        help='text: listar los errores al final; json: una línea JSON por diagnóstico en stderr')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Parsear el archivo en N procesos, partido en sentencias de nivel superior')
     args = parser.parse_args()
+    if args.stats and args.stream:
+        parser.error('--stats no se puede combinar con --stream')
+    if args.jobs is not None and (args.stats or args.stream):
+        parser.error('-j no se puede combinar con --stats ni con --stream')
+
+    cache = None
+    if not args.no_cache:
+        from analisis_semantico.cache import CompilationCache
+        cache = CompilationCache(args.cache_dir)
 
     if args.file:
-        run_file(args.file)
+        run_file(args.file, cache=cache, stream=args.stream, lexer_backend=args.lexer,
+                 fmt=args.format, output=args.output, optimize=args.optimize, execute=args.run, stats=args.stats,
+                 diagnostics_format=args.diagnostics, jobs=args.jobs)
     else:
         # Mantener demo anterior si no se pasa archivo
         demo_code = """
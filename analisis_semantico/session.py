@@ -0,0 +1,135 @@
+"""Sesiones de compilación reentrantes.
+
+Un `CompilerSession` posee su propio lexer (clon), parser y analizador y reinicia
+su estado en cada compilación, así que no comparte nada mutable con otras
+sesiones. `SessionPool` reparte sesiones entre hilos (o tareas asyncio) para que
+un servidor pueda compilar muchas peticiones a la vez sin serializarse en los
+singletons de `lexer/lexer.py` y `parser/parser.py`.
+"""
+import sys
+import os
+import asyncio
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import (SemanticAnalyzer, new_parser_and_lexer, parse_and_analyze, parse_code,
+                                         replay_diagnostics)
+
+
+class CompilerSession:
+    """Pipeline léxico -> sintáctico -> semántico con estado privado.
+
+    Una sesión no es segura para usarse desde dos hilos a la vez; para eso está
+    `SessionPool`. Sí puede reutilizarse indefinidamente: cada `compile` empieza
+    con `lineno = 1` y un analizador nuevo.
+    """
+
+    def __init__(self, analyzer_class=SemanticAnalyzer, cache=None, lexer_backend: str = 'ply'):
+        self.parser, self.lexer = new_parser_and_lexer(lexer_backend)
+        if self.parser is None or self.lexer is None:
+            raise RuntimeError("No se pudo importar parser o lexer")
+        self.analyzer_class = analyzer_class
+        self.cache = cache
+        self.analyzer: Optional[SemanticAnalyzer] = None
+        self.compilations = 0
+
+    def reset(self, diagnostics=None):
+        self.lexer.lineno = 1
+        self.analyzer = self.analyzer_class(diagnostics)
+
+    def parse(self, code: str):
+        """Devuelve `(tree, syntax_errors)` con recuperación de errores."""
+        self.lexer.lineno = 1
+        return parse_code(self.parser, code, self.lexer)
+
+    def compile(self, code: str, diagnostics=None):
+        """Compila `code` y devuelve `(tree, analyzer)`, igual que `analyze_code`.
+
+        `diagnostics` es el `DiagnosticEngine` al que se informa de los errores.
+        """
+        self.compilations += 1
+        if self.cache is not None:
+            hit = self.cache.get(code)
+            if hit is not None:
+                replay_diagnostics(hit[1], diagnostics, code)
+                self.analyzer = hit[1]
+                return hit
+        self.reset(diagnostics)
+        tree = parse_and_analyze(self.parser, self.analyzer, code, self.lexer)
+        if self.cache is not None and not self.analyzer.syntax_errors:
+            self.cache.put(code, tree, self.analyzer)
+        return tree, self.analyzer
+
+    def profile(self, code: str, memory: bool = False, observers=(), file: Optional[str] = None,
+                diagnostics=None):
+        """Como `compile` pero instrumentado y sin caché: devuelve `(tree, analyzer, CompileReport)`."""
+        from analisis_semantico.instrumentation import profile_code
+
+        self.compilations += 1
+        tree, self.analyzer, report = profile_code(code, memory=memory, observers=observers, file=file,
+                                                   parser_obj=self.parser, lexer_obj=self.lexer,
+                                                   analyzer_class=self.analyzer_class, diagnostics=diagnostics)
+        return tree, self.analyzer, report
+
+
+class SessionPool:
+    """Pool acotado de `CompilerSession` reutilizables.
+
+    Las sesiones se crean bajo demanda hasta `size`; cuando todas están ocupadas
+    `acquire` bloquea hasta que otra se libera.
+    """
+
+    def __init__(self, size: Optional[int] = None, analyzer_class=SemanticAnalyzer, cache=None,
+                 lexer_backend: str = 'ply'):
+        self.size = size or (os.cpu_count() or 1)
+        self.analyzer_class = analyzer_class
+        self.cache = cache
+        self.lexer_backend = lexer_backend
+        self._idle: "queue.LifoQueue[CompilerSession]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> CompilerSession:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return CompilerSession(self.analyzer_class, self.cache, self.lexer_backend)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get(timeout=timeout)
+
+    def release(self, session: CompilerSession):
+        self._idle.put(session)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        s = self.acquire(timeout)
+        try:
+            yield s
+        finally:
+            self.release(s)
+
+    def compile(self, code: str):
+        with self.session() as s:
+            return s.compile(code)
+
+    async def compile_async(self, code: str, executor=None):
+        """Versión para asyncio: compila en un executor para no bloquear el event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.compile, code)
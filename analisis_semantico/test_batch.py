@@ -0,0 +1,61 @@
+import sys
+import os
+import json
+import io
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.batch import expand_paths, compile_files, run_batch
+
+
+def _write(tmp_path, name, code):
+    path = tmp_path / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(code, encoding='utf8')
+    return str(path)
+
+
+def test_expand_paths_dirs_and_globs(tmp_path):
+    a = _write(tmp_path, 'a.js', 'var a = 1;\n')
+    b = _write(tmp_path, 'sub/b.js', 'var b = 2;\n')
+    _write(tmp_path, 'sub/notas.txt', 'no es js')
+
+    assert expand_paths([str(tmp_path)]) == [a, b]
+    assert expand_paths([str(tmp_path / '**' / '*.js'), a]) == [a, b]
+
+    # los subdirectorios también van en orden, se creen como se creen
+    z = _write(tmp_path, 'z/z.js', 'var z = 3;\n')
+    c = _write(tmp_path, 'c/c.js', 'var c = 4;\n')
+    assert expand_paths([str(tmp_path)]) == [a, c, b, z]
+
+
+def test_compile_files_parallel_matches_serial(tmp_path):
+    paths = [
+        _write(tmp_path, 'ok.js', 'var x = 1;\nx = x + 2;\n'),
+        _write(tmp_path, 'semantico.js', 'y = 3;\n'),
+        _write(tmp_path, 'sintaxis.js', 'var x = (1;\n'),
+    ]
+    serial = {r['file']: r for r in compile_files(paths, jobs=1)}
+    parallel = {r['file']: r for r in compile_files(paths, jobs=2, chunksize=1)}
+
+    for results in (serial, parallel):
+        assert results[paths[0]]['ok'] and results[paths[0]]['symbols'] == 1
+        assert results[paths[1]]['errors'] == ["Asignación a variable no declarada 'y'"]
+        assert results[paths[2]]['ast'] == 'partial' and not results[paths[2]]['ok']
+        assert results[paths[2]]['syntax_errors'][0]['token'] == 'SEMICOLON'
+        assert results[paths[2]]['syntax_errors'][0]['lineno'] == 1
+
+
+def test_run_batch_writes_json_lines(tmp_path):
+    _write(tmp_path, 'a.js', 'var a = 1;\n')
+    _write(tmp_path, 'b.js', 'b = 1;\n')
+    out = io.StringIO()
+
+    failed = run_batch([str(tmp_path)], out=out, jobs=1)
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert failed == 1
+    assert sorted(os.path.basename(r['file']) for r in lines) == ['a.js', 'b.js']
+    assert all('time_ms' in r for r in lines)
@@ -0,0 +1,75 @@
+import sys
+import os
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.cache import VERSIONED_SOURCES, CompilationCache, tree_to_data
+
+CODE = (
+    "var x = 10;\n"
+    "let y = 20;\n"
+    "if (x + 5 > y && y != 0) {\n"
+    "    const z = y * 2 + 1;\n"
+    "} else {\n"
+    "    w = 0;\n"
+    "}\n"
+)
+
+
+def test_cache_hit_restores_tree_table_and_errors(tmp_path):
+    cache = CompilationCache(str(tmp_path))
+    tree, analyzer = analyze_code(CODE, cache=cache)
+    assert cache.misses == 1 and cache.hits == 0
+
+    cached_tree, cached_analyzer = analyze_code(CODE, cache=cache)
+    assert cache.hits == 1
+    assert tree_to_data(cached_tree) == tree_to_data(tree)
+    assert cached_analyzer.errors == analyzer.errors == ["Asignación a variable no declarada 'w'"]
+    assert [s.to_dict() for s in cached_analyzer.table.all_symbols()] == \
+        [s.to_dict() for s in analyzer.table.all_symbols()]
+    assert cached_tree.pretty() == tree.pretty()
+    # la declaración vuelve con tipo y nombre separados y el nombre internado en la tabla
+    decl = cached_tree.children[0].children[0]
+    assert decl.value == ('var', 'x')
+    assert cached_analyzer.table.lookup('x') is cached_analyzer.table.scopes[0][cached_analyzer.table.names.find('x')]
+    assert decl.value.name is cached_analyzer.table.names.name_of(cached_analyzer.table.lookup('x').id)
+
+
+def test_cache_skips_sources_with_syntax_errors(tmp_path):
+    cache = CompilationCache(str(tmp_path))
+    analyze_code("var x = (1;", cache=cache)
+    tree, analyzer = analyze_code("var x = (1;", cache=cache)
+    assert analyzer.syntax_errors and tree.children[0].children[0].type == 'error'
+    assert cache.hits == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = CompilationCache(str(tmp_path), max_bytes=10 ** 9)
+    sources = [f"var v{i} = {i};\n" for i in range(4)]
+    for code in sources:
+        analyze_code(code, cache=cache)
+    # envejecer todas las entradas y refrescar solo la primera con un acierto
+    for entry in cache._entries():
+        os.utime(entry.path, (1, 1))
+    assert analyze_code(sources[0], cache=cache) is not None and cache.hits == 1
+
+    entry_size = max(e.stat().st_size for e in cache._entries())
+    cache.max_bytes = entry_size * 2
+    cache.evict()
+
+    remaining = {e.name[:-len('.json')] for e in cache._entries()}
+    assert cache.key(sources[0]) in remaining
+    assert len(remaining) <= 2
+
+
+def test_rewriting_an_entry_keeps_the_size(tmp_path):
+    cache = CompilationCache(str(tmp_path))
+    tree, analyzer = analyze_code(CODE, cache=cache)
+    for _ in range(3):
+        cache.put(CODE, tree, analyzer)
+    assert cache._size == sum(e.stat().st_size for e in cache._entries())
+    # todo lo que cambia el árbol o la tabla cacheados forma parte de la versión
+    assert {os.path.basename(p) for p in VERSIONED_SOURCES} >= {'visitor.py', 'names.py'}
@@ -0,0 +1,69 @@
+import sys
+import os
+import asyncio
+import threading
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.daemon import CompileDaemon
+from analisis_semantico.client import DaemonClient
+
+
+def _start(tmp_path):
+    daemon = CompileDaemon(str(tmp_path / 'd.sock'), workers=2)
+    thread = threading.Thread(target=lambda: asyncio.run(daemon.serve()), daemon=True)
+    thread.start()
+    assert daemon.ready.wait(30)
+    return daemon, thread
+
+
+def test_analyze_compile_and_cache(tmp_path):
+    source = tmp_path / 'a.js'
+    source.write_text("var a = 6;\nvar b = a * 7;\n", encoding='utf8')
+    daemon, thread = _start(tmp_path)
+    try:
+        with DaemonClient(daemon.socket_path) as client:
+            assert client.request('ping')['result']['pid'] == os.getpid()
+
+            first = client.request('analyze', path=str(source))
+            assert first['ok'] and first['result']['ok'] and first['result']['symbols'] == 2
+            again = client.request('analyze', path=str(source))
+            assert again['result']['cached']
+
+            run = client.request('compile', path=str(source), run=True)['result']
+            assert run['compiled'] and run['globals'] == {'a': 6, 'b': 42}
+
+            editor = client.request('analyze', path=str(source), code="b = 1;\n")['result']
+            assert not editor['ok'] and editor['diagnostics'][0]['code'] == 'S002'
+            assert client.request('compile', path='x.js', code="y = 1;\n")['result']['compiled'] is False
+
+            missing = client.request('analyze', path=str(tmp_path / 'no.js'))
+            assert not missing['ok'] and 'FileNotFoundError' in missing['error']
+            assert client.request('nada')['error'] == "Operación desconocida 'nada'"
+
+            stats = client.request('stats')['result']
+            assert stats['results']['hits'] >= 2 and stats['programs']['entries'] == 1
+    finally:
+        daemon.stop()
+        thread.join(10)
+    assert not os.path.exists(daemon.socket_path)
+
+
+def test_pipelined_requests_from_several_clients(tmp_path):
+    daemon, thread = _start(tmp_path)
+    try:
+        clients = [DaemonClient(daemon.socket_path) for _ in range(3)]
+        batches = [[{"op": "analyze", "path": f"f{c}_{i}.js", "code": f"var v{i} = {i};\nw = v{i};\n"}
+                    for i in range(10)] for c in range(3)]
+        results = [client.request_many(batch) for client, batch in zip(clients, batches)]
+        for client in clients:
+            client.close()
+    finally:
+        daemon.stop()
+        thread.join(10)
+
+    for c, responses in enumerate(results):
+        assert [r['result']['file'] for r in responses] == [f"f{c}_{i}.js" for i in range(10)]
+        assert all(r['result']['errors'] == ["Asignación a variable no declarada 'w'"] for r in responses)
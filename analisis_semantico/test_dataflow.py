@@ -0,0 +1,96 @@
+import sys
+import os
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.optimizer import optimize
+from analisis_semantico.dataflow import eliminate_dead_code
+from analisis_semantico.codegen import compile_program
+from analisis_semantico.vm import run
+from analisis_semantico.render import render_to_string
+
+
+def eliminated(code):
+    tree, _ = analyze_code(code)
+    new, stats = eliminate_dead_code(tree)
+    return render_to_string(new, 'sexpr').strip(), stats
+
+
+def execute(tree):
+    program = compile_program(tree)
+    return program.globals_of(run(program))
+
+
+def test_dead_stores_and_unused_locals():
+    sexpr, stats = eliminated(
+        "var total = 1;\n"
+        "{\n"
+        "  let tmp = total * 2;\n"
+        "  let z = total;\n"
+        "  z = z + 1;\n"
+        "  z = 3;\n"
+        "  total = z;\n"
+        "  total + 1;\n"
+        "}\n")
+    assert sexpr == ('(program (statement_list (declaration "var total" (number 1)) (statement_list'
+                     ' (declaration "let z" (number 0)) (assignment "z" (number 3)) (assignment "total" (identifier "z")))))')
+    assert (stats.dead_stores, stats.unused_declarations, stats.dead_expressions) == (2, 1, 1)
+    assert [(r, line) for r, line, _ in stats.removed] == \
+        [('dead_expression', 8), ('dead_store', 5), ('dead_store', 4), ('unused_declaration', 3)]
+
+
+def test_constant_branches():
+    code = (
+        "const DEBUG = 0;\n"
+        "var modo = 1;\n"
+        "if (DEBUG) { modo = 99; } else { modo = 2; }\n"
+        "if (DEBUG) modo = 5;\n"
+        "if (modo) { let x = 1; } else { modo = 3; }\n"
+        "if (modo) { let y = 1; }\n"
+    )
+    tree, _ = analyze_code(code)
+    new, stats = optimize(tree)
+    # la rama que queda sustituye al `if`; `if` sin nada dentro desaparecen
+    assert render_to_string(new, 'sexpr').strip() == (
+        '(program (statement_list (declaration "const DEBUG" (number 0)) (declaration "var modo" (number 1))'
+        ' (statement_list (assignment "modo" (number 2)))'
+        ' (if-else (identifier "modo") (statement_list) (statement_list (assignment "modo" (number 3))))))')
+    assert stats.dead_code.dead_branches == 3
+    assert execute(new) == execute(tree) == {'DEBUG': 0, 'modo': 2}
+
+
+def test_keeps_effects_and_globals():
+    code = (
+        "var g = 1;\n"
+        "var h = 0;\n"
+        "{ let a = g / h; let b = 4 / 2; let c = desconocida; g / h; }\n"
+        "g = 2;\n"
+    )
+    sexpr, stats = eliminated(code)
+    # la división por una variable puede fallar y el identificador no declarado también
+    assert sexpr == ('(program (statement_list (declaration "var g" (number 1)) (declaration "var h" (number 0))'
+                     ' (statement_list (declaration "let a" (binary_op "/" (identifier "g") (identifier "h")))'
+                     ' (declaration "let c" (identifier "desconocida"))'
+                     ' (expression_statement (binary_op "/" (identifier "g") (identifier "h"))))'
+                     ' (assignment "g" (number 2))))')
+    assert stats.total == 1 and stats.removed[0][2] == 'let b'
+
+
+def test_original_untouched_and_deep_nesting():
+    tree, _ = analyze_code("var a = 1; { let x = 2; } var b = a;")
+    before = render_to_string(tree, 'sexpr')
+    new, stats = eliminate_dead_code(tree)
+    assert render_to_string(tree, 'sexpr') == before and stats.unused_declarations == 1
+    assert new.children[0].children[0] is tree.children[0].children[0]
+
+    # `if` anidados sin recursión: al quitar la local se vacían todos
+    n = 3000
+    code = "var a = 1;\n" + "if (a) {\n" * n + "let t = a + 1;\n" + "}\n" * n + "a = a + 1;\n"
+    tree, _ = analyze_code(code)
+    new, stats = eliminate_dead_code(tree)
+    assert (stats.unused_declarations, stats.dead_branches) == (1, n)
+    assert len(new.children[0].children) == 2
+    assert execute(new) == execute(tree) == {'a': 2}
@@ -0,0 +1,108 @@
+import sys
+import os
+import io
+import json
+import subprocess
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from comun.diagnostics import (CollectSink, Diagnostic, DiagnosticEngine, JsonLinesSink, Sink,
+                               TerminalSink, report, use_engine)
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.cache import CompilationCache
+from analisis_semantico.batch import compile_files, run_batch
+
+CODE = "var a = 1 @ 2;\nb = a;\nvar = ;\n"
+
+
+def test_dedupe_cap_and_lazy_message():
+    sink = CollectSink()
+    engine = DiagnosticEngine([sink], file='a.js', max_per_file=2)
+    first = engine.report('S003', line=1, offset=0, name='x')
+    assert first._message is None
+    engine.report('S003', line=1, offset=0, name='x')
+    engine.report('S003', line=2, offset=5, name='y')
+    engine.report('S003', line=3, offset=9, name='z')
+    engine.report('S003', line=4, offset=12, name='w')
+
+    assert [d.code for d in sink.diagnostics] == ['S003', 'S003', 'D001']
+    assert engine.suppressed == 2
+    assert first.message == "Uso de variable no declarada 'x'"
+    # otro archivo tiene su propio máximo
+    assert engine.add(Diagnostic('S003', file='b.js', line=1, args={'name': 'x'}))
+
+
+def test_message_args_override_position_and_base_sink_ignores():
+    diagnostic = Diagnostic('F001', file='a.js', line=3, args={'error': 'x', 'line': 7, 'file': 'b.js'})
+    assert diagnostic.message == "No se pudo leer el archivo: x"
+    diagnostic = Diagnostic('L001', line=3, args={'char': '#', 'line': 9})
+    assert diagnostic.message == "Caracter ilegal '#' en línea 9"
+    engine = DiagnosticEngine([Sink()])
+    engine.report('S003', line=1, name='x')
+    assert len(engine.diagnostics) == 1
+
+
+def test_lexer_and_parser_do_not_import_the_analyzer():
+    # el parser trae consigo el lexer; ninguno debe cargar `analisis_semantico`
+    script = ("import sys; sys.path.insert(0, %r); import parser; "
+              "print(sorted(m for m in sys.modules if m.split('.')[0] in ('analisis_semantico', 'comun')))"
+              % os.path.join(repo_root, 'parser'))
+    out = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    assert out.split() == ["['comun',", "'comun.diagnostics']"]
+
+
+def test_analyze_code_reports_every_phase_without_printing(capsys):
+    out = io.StringIO()
+    engine = DiagnosticEngine([JsonLinesSink(out)], file='a.js')
+    _, analyzer = analyze_code(CODE, diagnostics=engine)
+
+    assert capsys.readouterr().out == ""
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(r['code'], r['line'], r['column']) for r in records] == [
+        ('L001', 1, 11), ('P001', 1, 13), ('P001', 3, 5), ('S002', 2, 1), ('S003', 2, 5)]
+    assert all(r['file'] == 'a.js' for r in records)
+    assert records[0]['args'] == {'char': '@'}
+    assert analyzer.errors == ["Asignación a variable no declarada 'b'", "Uso de variable no declarada 'a'"]
+    assert [d.code for d in analyzer.lex_diagnostics] == ['L001']
+
+
+def test_terminal_sink_and_default_engine(capsys):
+    TerminalSink(show_location=True).emit(Diagnostic('S002', file='a.js', line=2, column=1, args={'name': 'b'}))
+    assert capsys.readouterr().out == "❌ a.js:2:1: Asignación a variable no declarada 'b' [S002]\n"
+    # sin motor instalado se imprime como antes
+    report('L001', line=3, char='#')
+    assert capsys.readouterr().out == "❌ Caracter ilegal '#' en línea 3\n"
+    engine = DiagnosticEngine()
+    with use_engine(engine):
+        report('L001', line=3, char='#')
+    assert capsys.readouterr().out == "" and len(engine.diagnostics) == 1
+
+
+def test_cache_hit_replays_diagnostics(tmp_path):
+    code = "var a = 1 @;\nb = a;\n"
+    cache = CompilationCache(str(tmp_path))
+    analyze_code(code, cache=cache)
+    engine = DiagnosticEngine(file='otro.js')
+    _, analyzer = analyze_code(code, cache=cache, diagnostics=engine)
+
+    assert cache.hits == 1
+    assert [(d.code, d.file, d.column) for d in engine.diagnostics] == [
+        ('L001', 'otro.js', 11), ('S002', 'otro.js', 1)]
+    assert analyzer.errors == ["Asignación a variable no declarada 'b'"]
+
+
+def test_batch_caps_and_writes_diagnostics(tmp_path):
+    path = tmp_path / 'muchos.js'
+    path.write_text(''.join(f"x{i} = 1;\n" for i in range(10)), encoding='utf8')
+
+    result, = compile_files([str(path)], jobs=1, max_diagnostics=3)
+    assert len(result['errors']) == 10
+    assert [d['code'] for d in result['diagnostics']] == ['S002', 'S002', 'S002', 'D001']
+    assert result['suppressed'] == 7
+
+    diagnostics_out = io.StringIO()
+    run_batch([str(path)], out=io.StringIO(), jobs=1, max_diagnostics=None, diagnostics_out=diagnostics_out)
+    lines = [json.loads(line) for line in diagnostics_out.getvalue().splitlines()]
+    assert len(lines) == 10 and lines[9]['line'] == 10 and lines[9]['file'] == str(path)
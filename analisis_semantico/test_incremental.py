@@ -0,0 +1,130 @@
+import sys
+import os
+import random
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.cache import tree_to_data
+from analisis_semantico.incremental import BLOCK_SIZE, IncrementalDocument
+
+
+def assert_matches_full_analysis(doc):
+    tree, analyzer = analyze_code(doc.text)
+    assert tree is not None
+    assert tree_to_data(doc.tree) == tree_to_data(tree)
+    assert doc.errors == analyzer.errors
+    assert [s.to_dict() for s in doc.table.all_symbols()] == \
+        [s.to_dict() for s in analyzer.table.all_symbols()]
+
+
+def test_edit_reuses_untouched_statements():
+    code = "".join(f"var v{i} = {i};\n" for i in range(50))
+    doc = IncrementalDocument(code)
+    untouched = doc.tree.children[0].children[40]
+
+    pos = doc.text.index("var v10 = 10;") + len("var v10 = ")
+    stats = doc.apply_edit(pos, pos + 2, "v9 + 1")
+
+    assert stats["reparsed"] <= 2 and stats["reused"] >= 48
+    assert stats["relexed_chars"] < 40
+    assert doc.tree.children[0].children[40] is untouched
+    assert_matches_full_analysis(doc)
+
+
+def test_edit_changing_a_declaration_reanalyzes_dependents():
+    doc = IncrementalDocument("var a = 1;\nvar b = 2;\nb = a + b;\n")
+    assert doc.errors == []
+
+    doc.apply_edit(4, 5, "c")
+    assert doc.errors == ["Uso de variable no declarada 'a'"]
+    assert_matches_full_analysis(doc)
+
+
+def test_edit_attaching_else_merges_statements():
+    doc = IncrementalDocument("var a = 1;\nif (a) a = 2;\nvar b = 3;\n")
+    pos = doc.text.index("var b")
+    doc.apply_edit(pos, pos, "else a = 5;\n")
+
+    assert [n.type for n in doc.tree.children[0].children] == ["declaration", "if-else", "declaration"]
+    assert_matches_full_analysis(doc)
+
+
+def test_syntax_error_keeps_other_statements():
+    doc = IncrementalDocument("var a = 1;\nvar b = (2;\nvar c = a;\n")
+    assert doc.syntax_errors == 1
+    # la sentencia errónea queda como nodo `error`
+    assert [n.value for n in doc.tree.children[0].children] == [("var", "a"), None, ("var", "c")]
+
+    pos = doc.text.index("(2")
+    doc.apply_edit(pos, pos + 1, "")
+    assert doc.syntax_errors == 0
+    assert_matches_full_analysis(doc)
+
+
+def test_unterminated_statement_keeps_its_span_after_edits():
+    doc = IncrementalDocument("var a = 1;\nvar bbbbb = 2;\nvar c = (")
+    doc.apply_edit(11, 17, "b")
+    error = doc.tree.children[0].children[-1]
+    assert error.type == 'error'
+    assert (error.start, error.end, error.lineno) == (21, 30, 3)
+    assert doc.text[error.start:error.end] == "var c = ("
+    assert doc.tree.end == len(doc.text)
+
+
+def test_closing_a_comment_relexes_from_its_start():
+    doc = IncrementalDocument("var a = 1;\n/* var b = 2;\nvar c = 3;\nb = c;\n")
+    assert doc.syntax_errors
+    pos = doc.text.index("var c")
+    doc.apply_edit(pos, pos, "*/")
+    assert doc.syntax_errors == 0 and doc.errors == ["Asignación a variable no declarada 'b'"]
+    assert_matches_full_analysis(doc)
+
+
+def test_large_document_edits_stay_local():
+    n = 6 * BLOCK_SIZE
+    doc = IncrementalDocument("".join(f"var v{i} = {i};\n" for i in range(n)))
+    assert len(doc.segments.blocks) > 2
+
+    # muchas sentencias de golpe en medio: se parten bloques y se reetiqueta si hace falta
+    pos = doc.text.index(f"var v{n // 2} ")
+    stats = doc.apply_edit(pos, pos, "".join(f"w{i} = v{i};\n" for i in range(3 * BLOCK_SIZE)))
+    assert stats["reparsed"] == 3 * BLOCK_SIZE + 2 and stats["reanalyzed"] == stats["reparsed"]
+    orders = [seg.order for seg in doc.segments]
+    assert orders == sorted(set(orders))
+    assert_matches_full_analysis(doc)
+
+    # cambiar una declaración solo reanaliza a quien usa el nombre
+    pos = doc.text.index("var v7 ")
+    stats = doc.apply_edit(pos + 4, pos + 6, "z7")
+    assert stats["reparsed"] == 2 and stats["reanalyzed"] == 3
+    pos = doc.text.index(f"var v{n - 1} ")
+    stats = doc.apply_edit(pos, len(doc.text), "")
+    assert stats["relexed_chars"] < 40 and stats["reused"] == len(doc.segments) - 1
+    assert_matches_full_analysis(doc)
+
+
+def test_random_line_edits_match_full_reparse():
+    templates = ["var a{} = {};", "a{} = 1;", "if (a{} > {}) {{ let t = 1; }}", "{{ var a{} = {}; }}", "x{} = a{} + 1;"]
+    rng = random.Random(7)
+
+    def statement():
+        template = rng.choice(templates)
+        return template.format(*(rng.randint(0, 5) for _ in range(template.count('{}')))) + "\n"
+
+    doc = IncrementalDocument("".join(statement() for _ in range(20)))
+    for _ in range(60):
+        lines = doc.text.split("\n")
+        k = rng.randrange(len(lines))
+        pos = sum(len(line) + 1 for line in lines[:k])
+        choice = rng.random()
+        if choice < 0.4 or not lines[k]:
+            doc.apply_edit(pos, pos, statement())
+        elif choice < 0.7:
+            doc.apply_edit(pos, pos + len(lines[k]) + 1, "")
+        else:
+            doc.apply_edit(pos, pos + len(lines[k]), statement().strip())
+        if doc.segments:
+            assert_matches_full_analysis(doc)
@@ -0,0 +1,85 @@
+import sys
+import os
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.cache import tree_to_data
+from analisis_semantico.instrumentation import Observer, Profiler, profile_code
+from analisis_semantico.session import CompilerSession
+from analisis_semantico.batch import compile_files
+
+CODE = (
+    "var x = 10;\n"
+    "let y = x + 5;\n"
+    "if (y > 10 && x != 0) { const z = y * 2 + 1; y = 0; }\n"
+    "w = 1;\n"
+)
+
+
+def test_report_counts_and_same_result():
+    tree, analyzer, report = profile_code(CODE)
+    plain_tree, plain = analyze_code(CODE)
+    assert tree_to_data(tree) == tree_to_data(plain_tree)
+    assert analyzer.errors == plain.errors
+
+    assert list(report.phases) == ['lex', 'parse', 'analyze']
+    assert all(t.wall >= 0 and t.cpu >= 0 for t in report.phases.values())
+    assert report.tokens == 41
+    assert report.total_nodes == len(tree_to_data(tree))
+    assert report.nodes['declaration'] == 3 and report.nodes['binary_op'] == 6
+    assert report.scopes == 2 and report.declarations == 3
+    # x; y, x (condición); y (const z); y (asignación); w
+    assert report.lookups == 6
+    assert (report.lex_errors, report.syntax_errors, report.semantic_errors) == (0, 0, 1)
+    assert report.peak_memory is None
+    data = report.to_dict()
+    assert data["tokens"] == 41 and set(data["phases"]) == {'lex', 'parse', 'analyze'}
+    assert "Estadísticas:" in report.format()
+
+
+def test_errors_memory_and_fast_lexer(capsys):
+    code = "var a = 1 @ 2;\nvar = ;\n"
+    _, analyzer, report = profile_code(code, lexer_backend='fast', memory=True)
+    # los errores van al motor de diagnósticos, no a stdout
+    assert capsys.readouterr().out == ""
+    assert [(d.code, d.line, d.column) for d in analyzer.lex_diagnostics] == [('L001', 1, 11)]
+    _, plain = analyze_code(code, lexer_backend='fast')
+    assert report.lex_errors == 1 and report.syntax_errors == len(plain.syntax_errors) > 0
+    assert report.peak_memory > 0
+
+
+def test_observers_and_extra_phases():
+    events = []
+
+    class Recorder(Observer):
+        def phase_started(self, name):
+            events.append('+' + name)
+
+        def phase_finished(self, name, timing):
+            events.append('-' + name)
+
+        def report_finished(self, report):
+            events.append('report')
+
+    _, _, report = profile_code(CODE, observers=[Recorder()])
+    assert events == ['+lex', '-lex', '+parse', '-parse', '+analyze', '-analyze', 'report']
+
+    with Profiler(report).phase('optimize'):
+        pass
+    assert list(report.phases)[-1] == 'optimize'
+
+
+def test_session_and_batch_stats(tmp_path):
+    session = CompilerSession()
+    _, _, first = session.profile(CODE)
+    _, _, second = session.profile(CODE)
+    assert first.tokens == second.tokens == 41
+
+    path = tmp_path / 'a.js'
+    path.write_text(CODE, encoding='utf8')
+    (result,) = compile_files([str(path)], jobs=1, stats=True)
+    assert result["stats"]["file"] == str(path)
+    assert result["stats"]["semantic_errors"] == 1
@@ -0,0 +1,151 @@
+import sys
+import os
+import random
+
+import pytest
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+sys.path.insert(0, os.path.join(repo_root, 'benchmarks'))
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.codegen import compile_program
+from analisis_semantico.vm import VMError, run
+from analisis_semantico.ir import DEFAULT_PASSES, PASSES, dump, execute, lower, optimize_ir
+from generator import generate
+
+
+def lowered(code):
+    tree, analyzer = analyze_code(code)
+    assert not analyzer.syntax_errors and not analyzer.errors
+    return tree, lower(tree)
+
+
+def vm_globals(tree):
+    program = compile_program(tree)
+    return program.globals_of(run(program))
+
+
+def outcome(run_program, *args):
+    """Globales finales, o `VMError` si la ejecución falla."""
+    try:
+        return run_program(*args)
+    except VMError:
+        return VMError
+
+
+def test_lowering_blocks_and_short_circuit():
+    _, function = lowered("var a = 2;\n"
+                          "var b = a * 3 + a;\n"
+                          "if (a > 1 && b) { let a = b - 1; b = a; } else b = 0;\n"
+                          "var c = a || b / 0;\n")
+    assert dump(function) == (
+        "B0:\n"
+        "    a = 2\n"
+        "    %1 = a * 3\n"
+        "    b = %1 + a\n"
+        "    %4 = a > 1\n"
+        "    if %4 goto B1 else B2\n"
+        "B1:\n"
+        "    %4 = b\n"
+        "    goto B2\n"
+        "B2:\n"
+        "    if %4 goto B3 else B4\n"
+        "B3:\n"
+        "    a.1 = b - 1\n"
+        "    b = a.1\n"
+        "    goto B5\n"
+        "B4:\n"
+        "    b = 0\n"
+        "    goto B5\n"
+        "B5:\n"
+        "    %6 = a\n"
+        "    if %6 goto B7 else B6\n"
+        "B6:\n"
+        "    %6 = b / 0\n"
+        "    goto B7\n"
+        "B7:\n"
+        "    c = %6\n"
+        "    return")
+    # `||` no evalúa la división: la IR, la VM y el árbol coinciden
+    assert execute(function) == {'a': 2, 'b': 7, 'c': 2}
+
+
+def test_each_pass_saves_instructions():
+    code = ("var a = 4;\n"
+            "var b = a / 3;\n"
+            "var x = (a * b + 1) * (a * b + 1);\n"
+            "var y = 0;\n"
+            "if (x > b) { y = a * b + 1; } else { y = a * b; }\n"
+            "var c = y;\n"
+            "var d = c + c * 2;\n")
+    tree, function = lowered(code)
+    expected = vm_globals(tree)
+
+    stats = optimize_ir(function, ('local_cse', 'global_cse', 'copy_propagation'))
+    counts = [(p.name, p.saved) for p in stats.passes]
+    # local: `a * b + 1` se repite en la misma línea; global: `a * b + 1` y `a * b` en las ramas
+    assert counts == [('local_cse', 2), ('global_cse', 1), ('copy_propagation', 0)]
+    assert "y = %3" in dump(function) and "y = %2" in dump(function)
+    assert stats.passes[2].rewritten == 2 and execute(function) == expected
+    assert "c = y" in dump(function) and "d = y + %" in dump(function)
+
+    stats = optimize_ir(function, ('constant_propagation',))
+    # las asignaciones a variables del programa se conservan aunque se sobrescriban
+    assert dump(function) == ("B0:\n    a = 4\n    b = 1\n    x = 25\n    y = 0\n    y = 5\n    c = 5\n"
+                              "    d = 15\n    return")
+    assert stats.passes[0].saved == stats.initial - 8 and execute(function) == expected
+    assert stats.to_dict()["passes"][0]["after"] == 8 and "constant_propagation" in stats.format()
+
+
+def test_division_by_zero_is_kept():
+    code = "var z = 0;\nvar a = 5;\nif (a > 10) { a = a / z; }\nvar b = 1;\nb / z;\n"
+    tree, function = lowered(code)
+    optimize_ir(function)
+    # la rama con `a / z` no se ejecuta y desaparece; `b / z` se conserva aunque no se use
+    assert "1 / 0" in dump(function) and "a / 0" not in dump(function)
+    with pytest.raises(VMError):
+        execute(function)
+    with pytest.raises(VMError):
+        vm_globals(tree)
+
+
+def random_program(rng, statements):
+    names = ['a']
+    lines = ["var a = 3;"]
+
+    def expr(depth):
+        if depth == 0 or rng.random() < 0.3:
+            return rng.choice(names) if rng.random() < 0.6 else f"(0 - {rng.randint(0, 3)})"
+        op = rng.choice(['+', '-', '*', '/', '==', '<', '>=', '&&', '||'])
+        right = expr(depth - 1)
+        if op == '/':
+            right = str(rng.randint(1, 4))
+        return f"({expr(depth - 1)} {op} {right})"
+
+    for i in range(statements):
+        r = rng.random()
+        if r < 0.35:
+            names.append(f"v{i}")
+            lines.append(f"var v{i} = {expr(3)};")
+        elif r < 0.6:
+            lines.append(f"{rng.choice(names)} = {expr(3)};")
+        elif r < 0.8:
+            lines.append(f"if ({expr(2)}) {{ {rng.choice(names)} = {expr(2)}; }} else {rng.choice(names)} = {expr(2)};")
+        else:
+            lines.append(f"if ({expr(2)}) {{ let t = {expr(2)}; {rng.choice(names)} = t * {expr(1)}; }}")
+    return "\n".join(lines) + "\n"
+
+
+def test_passes_preserve_results():
+    rng = random.Random(7)
+    programs = [random_program(rng, 40) for _ in range(30)] + [generate('mixed', 300, seed=2)]
+    for code in programs:
+        tree, _ = lowered(code)
+        expected = outcome(vm_globals, tree)
+        for passes in [DEFAULT_PASSES] + [(name,) for name in PASSES]:
+            function = lower(tree)
+            stats = optimize_ir(function, passes)
+            assert outcome(execute, function) == expected, (passes, code)
+            assert stats.final <= stats.initial
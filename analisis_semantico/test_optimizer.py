@@ -0,0 +1,111 @@
+import sys
+import os
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.optimizer import count_nodes, optimize
+from analisis_semantico.render import render_to_string
+from analisis_semantico.codegen import compile_program
+from analisis_semantico.vm import VMError, run
+
+
+def optimized(code):
+    tree, _ = analyze_code(code)
+    return optimize(tree)
+
+
+def expr_of(code):
+    """S-expresión del inicializador de la última declaración de `code`."""
+    tree, _ = optimized(code)
+    decl = tree.children[0].children[-1]
+    return render_to_string(decl.children[0], 'sexpr').strip()
+
+
+def test_folds_literals():
+    assert expr_of("var a = 2 * 3 + 4;") == "(number 10)"
+    assert expr_of("var a = 1 - 5;") == "(number -4)"
+    assert expr_of("var a = 8 / 4;") == "(number 2)"
+    assert expr_of("var a = 3 > 2 && 1 != 1;") == "(number 0)"
+    # división inexacta o por cero: se deja tal cual
+    assert expr_of("var a = 7 / 2;") == '(binary_op "/" (number 7) (number 2))'
+    assert expr_of("var a = 7 / 0;") == '(binary_op "/" (number 7) (number 0))'
+
+
+def test_identities():
+    assert expr_of("var x = 1; var a = x * 1 + 0;") == '(identifier "x")'
+    assert expr_of("var x = 1; var a = 0 + 1 * (x - 0) / 1;") == '(identifier "x")'
+    assert expr_of("var x = 1; var a = x * 0;") == "(number 0)"
+    # no declarada o con división: no es seguro descartarla
+    assert expr_of("var a = u * 0;") == '(binary_op "*" (identifier "u") (number 0))'
+    assert expr_of("var x = 1; var a = 0 * (1 / x);") == \
+        '(binary_op "*" (number 0) (binary_op "/" (number 1) (identifier "x")))'
+    assert expr_of("var x = 1; var a = 0 || x;") == '(identifier "x")'
+    assert expr_of("var x = 1; var a = 2 && x;") == '(identifier "x")'
+    assert expr_of("var x = 1; var a = 0 && x;") == "(number 0)"
+
+
+def test_const_propagation_respects_scopes():
+    code = (
+        "const k = 2 * 3;\n"
+        "var a = k + 1;\n"
+        "if (a) { const k = a; a = k; }\n"
+        "a = k;\n"
+    )
+    tree, stats = optimized(code)
+    assert render_to_string(tree, 'sexpr').strip() == (
+        '(program (statement_list (declaration "const k" (number 6)) (declaration "var a" (number 7))'
+        ' (if (identifier "a") (statement_list (declaration "const k" (identifier "a"))'
+        ' (assignment "a" (identifier "k")))) (assignment "a" (number 6))))')
+    assert stats.propagated == 2
+    # `var` no se propaga
+    assert expr_of("var v = 1; var a = v;") == '(identifier "v")'
+
+
+def vm_result(tree):
+    program = compile_program(tree)
+    try:
+        return program.globals_of(run(program))
+    except VMError as exc:
+        return type(exc)
+
+
+def test_reassigned_const_is_not_propagated():
+    cases = [
+        ("const c = 5; c = 6; var d = c;", {'c': 6, 'd': 6}),
+        ("const c = 5; if (1) { c = 6; } var d = c + 1;", {'c': 6, 'd': 7}),
+        # con el valor plegado (`1 / 5`) desaparecería la división por cero
+        ("const c = 5; c = 0; var d = 1 / c;", VMError),
+    ]
+    for code, expected in cases:
+        tree, _ = analyze_code(code)
+        folded, stats = optimize(tree)
+        assert vm_result(folded) == vm_result(tree) == expected, code
+        assert stats.propagated == 0
+    # un `const` que nadie reasigna se sigue propagando
+    assert expr_of("const c = 5; var d = c;") == "(number 5)"
+
+
+def test_stats_and_original_untouched():
+    tree, _ = analyze_code("var x = 1; var a = (1 + 2) * x;")
+    before = render_to_string(tree, 'sexpr')
+    new, stats = optimize(tree)
+    assert render_to_string(tree, 'sexpr') == before
+    assert stats.nodes_before == count_nodes(tree) == 10
+    assert stats.nodes_after == count_nodes(new) == 8
+    assert stats.eliminated == 2 and stats.folded == 1
+    # la declaración sin cambios se comparte con el árbol original
+    assert new.children[0].children[0] is tree.children[0].children[0]
+
+
+def test_deep_expression_and_syntax_errors():
+    n = 50000
+    tree, stats = optimized("var a = " + " + ".join(["1"] * n) + ";")
+    assert tree.children[0].children[0].children[0].value == n
+    assert stats.eliminated == 2 * n - 2
+    # el árbol con nodos `error` se optimiza igual
+    tree, _ = optimized("var a = 1 + 1;\nvar = ;\nvar b = a * 1;\n")
+    types = [s.type for s in tree.children[0].children]
+    assert types == ['declaration', 'error', 'declaration']
@@ -0,0 +1,55 @@
+import sys
+import os
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+sys.path.insert(0, os.path.join(repo_root, 'benchmarks'))
+
+from analisis_semantico.parallel import analyze_parallel, split_source
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.cache import table_to_data, tree_to_data
+from comun.diagnostics import DiagnosticEngine
+from generator import generate
+
+
+def result(tree, analyzer, engine):
+    return (tree_to_data(tree), table_to_data(analyzer.table), [e.message for e in analyzer.syntax_errors],
+            [(d.code, d.line, d.offset, d.column, d.args) for d in engine.diagnostics])
+
+
+def both(code, **kwargs):
+    serial_engine, parallel_engine = DiagnosticEngine(), DiagnosticEngine()
+    serial = result(*analyze_code(code, diagnostics=serial_engine), serial_engine)
+    parallel = result(*analyze_parallel(code, jobs=2, diagnostics=parallel_engine, **kwargs), parallel_engine)
+    return serial, parallel
+
+
+def test_split_points():
+    code = ("var a = 1; /* ; } */ // ; {\n"
+            "if (a) { a = 2; } else { a = 3; }\n"
+            "if (a) a = 4;\n else a = 5;\n"
+            "{ let b = 1; { b = 2; } }\n"
+            "elsewhere = 1;\n"
+            "a = 6; // fin ;\n")
+    chunks = split_source(code, 1)
+    assert [code[c.start:c.end].strip().split('\n')[0] for c in chunks] == [
+        "var a = 1;", "/* ; } */ // ; {", "if (a) a = 4;", "{ let b = 1; { b = 2; } }", "elsewhere = 1;", "a = 6; // fin ;"]
+    assert [c.lineno for c in chunks] == [1, 1, 2, 4, 5, 6]
+    assert chunks[-1].end == len(code)
+    # con un mínimo grande no se corta
+    assert len(split_source(code, len(code))) == 1
+
+
+def test_parallel_matches_serial():
+    code = generate('mixed', 400, seed=3) + "\nnueva = 1 @ + 2;\n{ let nueva = 2; nueva = 3; }\n"
+    serial, parallel = both(code, chunk_size=200)
+    assert len(split_source(code, 200)) > 10
+    assert parallel == serial and serial[2] == []
+    assert any(d[0] == 'L001' for d in serial[3]) and any(d[0] == 'S002' for d in serial[3])
+
+
+def test_syntax_errors_fall_back_to_serial():
+    code = "var a = 1;\n" * 50 + "var b = (1;\nif (a { a = 2; }\n" + "a = a + 1;\n" * 50
+    serial, parallel = both(code, chunk_size=40)
+    assert parallel == serial and len(serial[2]) == 2
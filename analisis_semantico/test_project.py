@@ -0,0 +1,63 @@
+import sys
+import os
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.project import Project
+from comun.diagnostics import DiagnosticEngine
+
+
+def _write(tmp_path, name, code):
+    path = tmp_path / name
+    path.write_text(code, encoding='utf8')
+    return str(path)
+
+
+def _codes(project, path):
+    return [(d.code, d.line, d.args.get('name')) for d in project.diagnostics(path)]
+
+
+def test_cross_file_resolution_and_redeclarations(tmp_path):
+    a = _write(tmp_path, 'a.js', 'var total = 0;\nconst paso = 2;\n')
+    b = _write(tmp_path, 'b.js', 'total = total + paso;\nfalta = 1;\n{ let total = 1; }\n')
+    c = _write(tmp_path, 'c.js', 'x = 1;\nvar x = 2;\nlet paso = 3;\n')
+    project = Project(jobs=1)
+    stats = project.update([a, b, c])
+
+    assert stats['analyzed'] == 3 and stats['symbols'] == 3
+    assert project.lookup('total').file == a and project.lookup('paso').kind == 'const'
+    assert [d.file for d in project.definitions('paso')] == [a, c]
+    assert _codes(project, a) == []
+    assert _codes(project, b) == [('S002', 2, 'falta')]
+    # uso antes de la declaración en el mismo archivo y redeclaración de un global de a.js
+    assert _codes(project, c) == [('S002', 1, 'x'), ('S004', 3, 'paso')]
+    redeclared = project.diagnostics(c)[1]
+    assert redeclared.column == 1 and redeclared.message == \
+        f"Redeclaración global de 'paso' (ya declarada en {a}:2)"
+
+    engine = DiagnosticEngine()
+    assert project.report(engine) == 3 and engine.diagnostics[0].file == b
+
+
+def test_incremental_update_and_state(tmp_path):
+    a = _write(tmp_path, 'a.js', 'var base = 1;\n')
+    b = _write(tmp_path, 'b.js', 'var otro = base;\n')
+    c = _write(tmp_path, 'c.js', 'var suelto = 1;\n')
+    state = str(tmp_path / 'estado.json')
+    project = Project(state, jobs=1)
+    project.update([a, b, c])
+    project.save()
+
+    again = Project(state, jobs=1)
+    assert again.update([a, b, c])['analyzed'] == 0 and _codes(again, b) == []
+
+    # quitar `base` solo obliga a reenlazar a quien lo usa
+    _write(tmp_path, 'a.js', 'var nuevo = 10;\n')
+    stats = again.update([a, b, c])
+    assert (stats['analyzed'], stats['relinked']) == (1, 2)
+    assert _codes(again, b) == [('S003', 1, 'base')]
+
+    stats = again.update([b, c])
+    assert stats['removed'] == 1 and again.lookup('nuevo') is None
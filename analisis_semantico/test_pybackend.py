@@ -0,0 +1,178 @@
+import sys
+import os
+import random
+
+import pytest
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.cache import CompilationCache
+from analisis_semantico.codegen import CompileError, compile_program
+from analisis_semantico.vm import VMError, run
+from analisis_semantico import pybackend
+from analisis_semantico.pybackend import CodeCache, compile_tree, run_code, run_source, to_python_source
+
+PROGRAMS = [
+    "var a = 2 + 3 * 4; var b = (a - 20) / 3; var c = 7 / 2;",
+    "var a = 3 > 2; var b = 2 <= 1; var c = 1 == 1 && 2 != 2; var d = (a > b) + (b >= a);",
+    "var a = 0 || 5; var b = 4 && 6; var c = 0 && 1 / 0; var d = 3 || 1 / 0;",
+    "var x = 10;\nlet y = x + 5;\n"
+    "if (y > 10 && x != 0) { const z = y * 2 + 1; y = z; } else { y = 0; }\n"
+    "if (y < 0 || x == 3) { y = 100; }\n"
+    "if (0) x = 1; else { let x = 2; y = y + x; }\n"
+    "x + 1;\n",
+    "var a = 1; { var a = 2; a = a + 1; } var b = a;",
+]
+
+
+def vm_globals(code):
+    tree, _ = analyze_code(code)
+    program = compile_program(tree)
+    return program.globals_of(run(program))
+
+
+def outcome(run_program, code):
+    """Variables globales, o el tipo de la excepción si la ejecución falla."""
+    try:
+        return run_program(code)
+    except VMError as exc:
+        return type(exc)
+
+
+class ProgramGenerator:
+    """Programas aleatorios sin errores semánticos: declaraciones (también `const`
+    reasignados), asignaciones, `if`/`else`, bloques y divisiones que pueden ser por 0."""
+
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+        self.counter = 0
+
+    def expression(self, names, depth=0):
+        r = self.random
+        if depth > 3 or r.random() < 0.3:
+            if names and r.random() < 0.6:
+                return r.choice(names)
+            return str(r.randint(0, 6))
+        op = r.choice(['+', '-', '*', '/', '<', '>=', '==', '!=', '&&', '||'])
+        text = f"{self.expression(names, depth + 1)} {op} {self.expression(names, depth + 1)}"
+        return f"({text})" if r.random() < 0.5 else text
+
+    def statements(self, visible, depth=0):
+        r = self.random
+        scope = []
+        lines = []
+        for _ in range(r.randint(1, 6)):
+            names = visible + scope
+            choice = r.random()
+            if choice < 0.4 or not names:
+                # a veces se repite un nombre de fuera (sombra), nunca uno del mismo ámbito
+                outer = [n for n in visible if n not in scope]
+                if outer and r.random() < 0.3:
+                    name = r.choice(outer)
+                else:
+                    self.counter += 1
+                    name = f"v{self.counter}"
+                kind = r.choice(['var', 'let', 'const'])
+                lines.append(f"{kind} {name} = {self.expression(names)};")
+                scope.append(name)
+            elif choice < 0.7 or depth >= 3:
+                lines.append(f"{r.choice(names)} = {self.expression(names)};")
+            elif choice < 0.9:
+                then = self.statements(names, depth + 1)
+                if r.random() < 0.5:
+                    other = self.statements(names, depth + 1)
+                    lines.append(f"if ({self.expression(names)}) {{ {then} }} else {{ {other} }}")
+                else:
+                    lines.append(f"if ({self.expression(names)}) {{ {then} }}")
+            else:
+                lines.append(f"{{ {self.statements(names, depth + 1)} }}")
+        return " ".join(lines)
+
+    def program(self) -> str:
+        return self.statements([])
+
+
+def test_same_results_as_vm():
+    for code in PROGRAMS:
+        tree, _ = analyze_code(code)
+        assert run_code(compile_tree(tree)) == vm_globals(code), code
+
+
+def test_generated_programs_match_the_vm():
+    programs = [
+        "const c = 5; c = 6; var d = c;",
+        "const c = 5; c = 0; var d = 1 / c;",
+        "const c = 2; if (c) { c = c + 1; } var d = c * 10;",
+    ]
+    generator = ProgramGenerator(1234)
+    programs += [generator.program() for _ in range(300)]
+    for code in programs:
+        _, analyzer = analyze_code(code)
+        assert not analyzer.errors, code
+        # el backend de Python compila ya optimizado; la VM ejecuta el árbol sin optimizar
+        assert outcome(run_source, code) == outcome(vm_globals, code), code
+
+
+def test_generated_source():
+    tree, _ = analyze_code("var x = 1; if (x > 0 && x < 3) { x = x / 2; } var y = x > 0;")
+    source = to_python_source(tree)
+    # en la condición del if la comparación queda directa; como valor da 1 o 0
+    assert "if x_0 > 0 and x_0 < 3:" in source
+    assert "x_0 = _div(x_0, 2)" in source
+    assert "y_1 = 1 if x_0 > 0 else 0" in source
+
+
+def test_code_cache_skips_front_end(tmp_path, monkeypatch):
+    cache = CodeCache(str(tmp_path))
+    assert run_source(PROGRAMS[3], cache) == {'x': 10, 'y': 33}
+    assert cache.misses == 1
+    assert list(tmp_path.glob('python/*/*.marshal'))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no debería analizarse de nuevo")
+
+    monkeypatch.setattr(pybackend, 'analyze_code', fail)
+    assert run_source(PROGRAMS[3], CodeCache(str(tmp_path))) == {'x': 10, 'y': 33}
+
+
+def test_code_cache_keeps_its_own_entries(tmp_path, monkeypatch):
+    tree, analyzer = analyze_code(PROGRAMS[0])
+    json_cache = CompilationCache(str(tmp_path))
+    json_cache.put(PROGRAMS[0], tree, analyzer)
+    code_cache = CodeCache(str(tmp_path))
+    run_source(PROGRAMS[0], code_cache)
+    # cada caché desaloja solo lo suyo
+    code_cache.clear()
+    assert json_cache.get(PROGRAMS[0]) is not None
+    run_source(PROGRAMS[0], code_cache)
+    json_cache.clear()
+    assert code_cache.get(PROGRAMS[0]) is not None
+
+    # la marca de versión no se recalcula en cada clave
+    def fail(*args, **kwargs):
+        raise AssertionError("no debería releer los fuentes")
+
+    key = code_cache.key(PROGRAMS[0])
+    monkeypatch.setattr(pybackend, 'open', fail, raising=False)
+    assert code_cache.key(PROGRAMS[0]) == key
+
+
+def test_deep_expressions():
+    n = 50000
+    assert run_source("var a = " + " + ".join(["1"] * n) + ";") == {'a': n}
+    assert run_source("var a = 0 || " + " + ".join(["1"] * 500) + ";") == {'a': 500}
+    # una división que podría no evaluarse no se puede adelantar a un temporal
+    with pytest.raises(CompileError):
+        run_source("var z = 0; var a = z && " + " + ".join(["1 / z"] * 500) + ";")
+
+
+def test_errors():
+    with pytest.raises(VMError):
+        run_source("var a = 0; var b = 1 / a;")
+    with pytest.raises(CompileError):
+        run_source("var a = b;")
+    with pytest.raises(CompileError):
+        run_source("var a = 1;\nvar = ;\n")
@@ -0,0 +1,86 @@
+import sys
+import os
+import io
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code, get_parser_module
+from analisis_semantico.cache import tree_to_data
+from analisis_semantico.render import (load_binary, load_json, load_sexpr, render, render_to_string,
+                                       render_tree)
+
+CODE = (
+    "var x = 10;\n"
+    "let s = 0;\n"
+    "if (x + 5 > s && s != 0) {\n"
+    "    const z = s * 2 + 12345678901234567890;\n"
+    "} else {\n"
+    "    s = (x - 1) / 3;\n"
+    "}\n"
+)
+
+
+def legacy_pretty(node, level=0, last=True, prefix=""):
+    """`Node.pretty` anterior (recursivo), como referencia del formato."""
+    from colorama import Fore, Style
+    color = get_parser_module().NODE_COLORS.get(node.type, Fore.WHITE)
+    branch = "└── " if last else "├── "
+    ret = prefix + branch + color + f"<{node.type}> " + (str(node.value) if node.value else "") + Style.RESET_ALL + "\n"
+    new_prefix = prefix + ("    " if last else "│   ")
+    for i, child in enumerate(node.children):
+        ret += legacy_pretty(child, level + 1, i == len(node.children) - 1, new_prefix)
+    return ret
+
+
+def test_tree_matches_pretty_and_colors_follow_tty():
+    tree, _ = analyze_code(CODE)
+    assert tree.pretty() == legacy_pretty(tree)
+    assert render_to_string(tree, color=True) == tree.pretty()
+
+    # StringIO no es una terminal: sin códigos de color por defecto
+    plain = render_to_string(tree)
+    assert '\x1b[' not in plain
+    assert plain == tree.pretty(color=False)
+    assert plain.splitlines()[:3] == ["└── <program> ", "    └── <statement_list> ", "        ├── <declaration> var x"]
+
+    class Tty(io.StringIO):
+        def isatty(self):
+            return True
+
+    out = Tty()
+    render_tree(tree, out)
+    assert out.getvalue() == tree.pretty()
+
+
+def test_machine_formats_round_trip():
+    tree, _ = analyze_code(CODE)
+    assert tree_to_data(load_json(render_to_string(tree, 'json'))) == tree_to_data(tree)
+    assert tree_to_data(load_binary(render_to_string(tree, 'binary'))) == tree_to_data(tree)
+
+    sexpr = render_to_string(tree, 'sexpr')
+    assert sexpr.startswith('(program (statement_list (declaration "var x" (number 10)) ')
+    loaded = load_sexpr(sexpr)
+    # sin posiciones, pero con la misma forma y los mismos valores (salvo vacíos)
+    strip = lambda data: [(t, v or None, n) for t, v, n, _, _, _ in data]
+    assert strip(tree_to_data(loaded)) == strip(tree_to_data(tree))
+    assert render_to_string(loaded, 'sexpr') == sexpr
+
+
+def test_deep_tree_renders_without_recursion():
+    Node = get_parser_module().Node
+    expr = Node("identifier", value="x")
+    for _ in range(20000):
+        expr = Node("binary_op", (expr, Node("number", value=1)), "+")
+    tree = Node("program", [Node("statement_list", [Node("expression_statement", (expr,))])])
+    for fmt in ('json', 'binary', 'sexpr'):
+        text = render_to_string(tree, fmt)
+        loader = {'json': load_json, 'binary': load_binary, 'sexpr': load_sexpr}[fmt]
+        assert len(tree_to_data(loader(text))) == len(tree_to_data(tree))
+    # el formato tree tiene sangría proporcional a la profundidad: se prueba con un árbol ancho
+    wide = Node("program", [Node("statement_list", [Node("assignment", (Node("number", value=i),), "x")
+                                                    for i in range(20000)])])
+    out = io.StringIO()
+    render(wide, out, 'tree')
+    assert out.getvalue().count('\n') == len(tree_to_data(wide))
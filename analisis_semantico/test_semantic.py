@@ -20,7 +20,7 @@ parser_mod = importlib.util.module_from_spec(spec_parser)
 sys.modules['parser'] = parser_mod
 spec_parser.loader.exec_module(parser_mod)
 
-from analisis_semantico.semantic import SemanticAnalyzer
+from analisis_semantico.semantic import SemanticAnalyzer, SymbolTable, analyze_code, analyze_stream
 
 
 def test_semantic_basic():
@@ -58,6 +58,121 @@ def test_semantic_basic():
     assert sz is not None and sz.kind == 'const'
 
 
+def test_lookup_uses_innermost_binding_and_ignores_closed_scopes():
+    code = (
+        "var x = 1;\n"
+        "{\n"
+        "    let x = 2;\n"
+        "    let inner = x;\n"
+        "}\n"
+        "inner = x;\n"
+    )
+    tree = parser_mod.parser.parse(code, lexer=lexer_mod.lexer.clone())
+    analyzer = SemanticAnalyzer()
+    table = analyzer.analyze(tree)
+
+    # 'inner' solo existía dentro del bloque ya cerrado
+    assert analyzer.errors == ["Asignación a variable no declarada 'inner'"]
+    assert table.lookup('x').kind == 'var'
+    assert table.lookup('inner') is None
+    assert [s.name for s in table.all_symbols()] == ['x', 'x', 'inner']
+
+
+def test_symbol_table_shadowing_stack():
+    table = SymbolTable()
+    table.push_scope()
+    table.declare('a', 'var')
+    table.push_scope()
+    table.declare('a', 'let')
+    assert table.lookup('a').scope_level == 1
+    table.pop_scope()
+    assert table.lookup('a').scope_level == 0
+    table.pop_scope()
+    assert table.lookup('a') is None
+
+
+def test_identifiers_are_interned_and_symbols_keyed_by_id():
+    code = "var total = 1;\ntotal = total + 2;\n{ let total = 3; }\n"
+    for backend in ('ply', 'fast'):
+        tree, analyzer = analyze_code(code, lexer_backend=backend)
+        decl, assign, block = tree.children[0].children
+        assert decl.value == ('var', 'total') and decl.value.kind == 'var' and str(decl.value) == 'var total'
+        # un solo objeto `str` por nombre en todo el árbol
+        assert assign.value is decl.value.name is assign.children[0].children[0].value
+        assert block.children[0].value.name is decl.value.name
+        table = analyzer.table
+        i = table.names.find('total')
+        assert table.lookup('total').id == i and table.lookup_id(i) is table.scopes[0][i]
+        assert [s.id for s in table.all_symbols()] == [i, i]
+
+
+
+class _NoStringLookups(dict):
+    """`NameTable.ids` que falla si alguien vuelve a buscar un nombre por su cadena."""
+
+    def get(self, key, default=None):
+        raise AssertionError(f"búsqueda por cadena de {key!r}")
+
+    __getitem__ = __contains__ = get
+
+
+def test_analyzer_and_later_passes_resolve_by_lexer_ids():
+    import pickle
+    from analisis_semantico.names import Name
+    from analisis_semantico.optimizer import optimize
+    from analisis_semantico.codegen import compile_program
+    from analisis_semantico.vm import run
+    from analisis_semantico.ir import lower
+    from analisis_semantico.pybackend import compile_tree, run_code
+    code = "const k = 2;\nvar total = k;\nif (total) { let t = total * k; total = t; }\n"
+    tree, analyzer = analyze_code(code)
+    names = analyzer.table.names
+    use = tree.children[0].children[1].children[0]
+    assert use.value.__class__ is Name and use.value.id == names.find('k') and use.value.table is names
+    # fuera del proceso el id no vale: viaja como `str`
+    assert pickle.loads(pickle.dumps(use.value)).__class__ is str
+
+    names.ids = _NoStringLookups(names.ids)
+    again = SemanticAnalyzer(names=names)
+    again.analyze(tree)
+    assert again.errors == []
+    folded, _ = optimize(tree)
+    program = compile_program(folded)
+    assert lower(tree).globals.keys() == {'k', 'total'}
+    assert run_code(compile_tree(tree)) == {'k': 2, 'total': 4}
+    assert program.globals_of(run(program)) == {'k': 2, 'total': 4}
+
+
+def test_analyze_stream_matches_analyze_code():
+    import io
+    from analisis_semantico.cache import tree_to_data
+    code = "var a = 1;\n/* comentario\n largo */ { let b = a + 2; }\nc = b;\n" * 20
+    tree, analyzer = analyze_code(code)
+    s_tree, s_analyzer = analyze_stream(io.BytesIO(code.encode('utf8')), chunk_size=16)
+    assert s_analyzer.errors == analyzer.errors
+    # mismos nodos, valores y posiciones absolutas
+    assert tree_to_data(s_tree) == tree_to_data(tree)
+
+
+def test_fast_lexer_backend_gives_same_result():
+    from analisis_semantico.cache import tree_to_data
+    code = "var a = 1;\n{ let b = a * 2; /* c */ }\nif (a >= 1 && c != 0) { a = 3; } else { d = 4; }\n"
+    tree, analyzer = analyze_code(code)
+    f_tree, f_analyzer = analyze_code(code, lexer_backend='fast')
+    assert f_analyzer.errors == analyzer.errors
+    assert tree_to_data(f_tree) == tree_to_data(tree)
+
+
+def test_syntax_errors_do_not_discard_semantic_results():
+    path = os.path.join(repo_root, 'analisis_semantico', 'ejemplos', 'ejemplo_sintaxis_error.js')
+    with open(path, encoding='utf8') as fh:
+        tree, analyzer = analyze_code(fh.read())
+    assert [e.lineno for e in analyzer.syntax_errors] == [3]
+    # el bloque del `if` mal cerrado se analiza igualmente
+    assert analyzer.errors == ["Asignación a variable no declarada 'y'"]
+    assert analyzer.table.lookup('x').kind == 'var'
+
+
 if __name__ == '__main__':
     test_semantic_basic()
     print('Test semántico básico ejecutado correctamente')
@@ -0,0 +1,63 @@
+import sys
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.session import CompilerSession, SessionPool
+
+
+def _node_count(tree):
+    # número de nodos del árbol: huella estable para comparar resultados
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def test_session_resets_lineno_between_compilations():
+    session = CompilerSession()
+    code = "var x = 1;\n\n\nx = x + 1;\n"
+    session.compile(code)
+    first = session.lexer.lineno
+    session.compile(code)
+    assert session.lexer.lineno == first
+    assert session.compilations == 2
+
+
+def test_analyze_code_does_not_share_lexer_state():
+    tree_a, analyzer_a = analyze_code("var a = 1;\n")
+    tree_b, analyzer_b = analyze_code("b = 2;\n")
+    assert analyzer_a is not analyzer_b
+    assert analyzer_a.errors == []
+    assert analyzer_b.errors == ["Asignación a variable no declarada 'b'"]
+
+
+def test_pool_compiles_concurrently_from_threads():
+    pool = SessionPool(size=4)
+    programs = [f"var v{i} = {i};\nif (v{i} > 0) {{ let w = v{i} * 2; }}\n" for i in range(64)]
+    expected = [_node_count(analyze_code(code)[0]) for code in programs]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(pool.compile, programs))
+
+    assert [_node_count(tree) for tree, _ in results] == expected
+    assert all(analyzer.errors == [] for _, analyzer in results)
+    assert pool._created <= 4
+
+
+def test_pool_compile_async():
+    pool = SessionPool(size=2)
+
+    async def main():
+        return await asyncio.gather(*(pool.compile_async(f"var x{i} = {i};") for i in range(5)))
+
+    results = asyncio.run(main())
+    assert [len(analyzer.table.all_symbols()) for _, analyzer in results] == [1] * 5
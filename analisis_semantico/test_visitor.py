@@ -0,0 +1,61 @@
+import sys
+import os
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import SemanticAnalyzer, analyze_code, get_parser_module
+from analisis_semantico.visitor import NodeVisitor
+
+
+def test_visitor_order_and_skip():
+    tree, _ = analyze_code("var a = 1 + b;\nif (a) { c = 2; }\n")
+    events = []
+
+    class Recorder(NodeVisitor):
+        def visit_binary_op(self, node):
+            events.append('enter +')
+
+        def leave_binary_op(self, node):
+            events.append('leave +')
+
+        def visit_identifier(self, node):
+            events.append(node.value)
+
+        def visit_number(self, node):
+            events.append(node.value)
+
+        def visit_assignment(self, node):
+            events.append('skip ' + node.value)
+            return False
+
+    Recorder().walk(tree)
+    assert events == ['enter +', 1, 'b', 'leave +', 'a', 'skip c']
+
+
+def test_long_expression_chain_does_not_recurse():
+    code = "var x = 1;\nx = " + " + ".join(["x"] * 20000) + " + y;\n"
+    tree, analyzer = analyze_code(code)
+    assert tree is not None
+    assert analyzer.errors == ["Uso de variable no declarada 'y'"]
+
+
+def test_deeply_nested_blocks_keep_scope_semantics():
+    Node = get_parser_module().Node
+    Declared = get_parser_module().Declared
+    depth = 5000
+    inner = [Node("assignment", (Node("identifier", value="outer"),), "outer")]
+    for i in range(depth):
+        inner = [Node("declaration", (Node("number", value=i),), Declared("let", f"v{i}")),
+                 Node("if", (Node("number", value=1), Node("statement_list", inner)), "")]
+    tree = Node("program", [Node("statement_list",
+                                 [Node("declaration", (Node("number", value=0),), Declared("var", "outer"))] + inner)])
+
+    analyzer = SemanticAnalyzer()
+    table = analyzer.analyze(tree)
+
+    assert analyzer.errors == []
+    assert len(table.scopes) == 1
+    assert len(table.completed_scopes) == depth
+    assert max(s.scope_level for s in table.all_symbols()) == depth - 1
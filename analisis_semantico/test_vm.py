@@ -0,0 +1,74 @@
+import sys
+import os
+
+import pytest
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.optimizer import optimize
+from analisis_semantico.codegen import CompileError, LOAD_VAR, compile_program, disassemble
+from analisis_semantico.vm import VMError, run
+
+
+def execute(code):
+    tree, _ = analyze_code(code)
+    program = compile_program(tree)
+    return program.globals_of(run(program))
+
+
+def test_arithmetic_and_logic():
+    assert execute("var a = 2 + 3 * 4; var b = (a - 20) / 3; var c = 7 / 2;") == {'a': 14, 'b': -2, 'c': 3}
+    assert execute("var a = 3 > 2; var b = 2 <= 1; var c = 1 == 1 && 2 != 2;") == {'a': 1, 'b': 0, 'c': 0}
+    # && y || devuelven uno de los operandos y no evalúan el segundo si no hace falta
+    assert execute("var a = 0 || 5; var b = 4 && 6; var c = 0 && 1 / 0; var d = 3 || 1 / 0;") == \
+        {'a': 5, 'b': 6, 'c': 0, 'd': 3}
+
+
+def test_control_flow_and_scopes():
+    code = (
+        "var x = 10;\n"
+        "let y = x + 5;\n"
+        "if (y > 10 && x != 0) { const z = y * 2 + 1; y = z; } else { y = 0; }\n"
+        "if (y < 0) { y = 100; }\n"
+        "if (0) x = 1; else { let x = 2; y = y + x; }\n"
+        "x + 1;\n"
+    )
+    assert execute(code) == {'x': 10, 'y': 33}
+
+
+def test_slots_instead_of_names():
+    tree, _ = analyze_code("var a = 1; { var a = 2; a = a + 1; } var b = a;")
+    program = compile_program(tree)
+    # cada declaración tiene su slot, aunque el nombre se repita
+    assert program.slot_names == ['a', 'a', 'b']
+    assert program.globals_of(run(program)) == {'a': 1, 'b': 1}
+    assert program.code.typecode == 'i'
+    assert LOAD_VAR in program.code
+    assert "STORE_VAR              1 (a)" in disassemble(program)
+
+
+def test_same_result_after_optimize():
+    code = "const k = 6; var a = k * 1 + 0; var b = (a - k) * 0 + 2 * 3 > 5;"
+    tree, _ = analyze_code(code)
+    folded, _ = optimize(tree)
+    plain = compile_program(tree)
+    optimized = compile_program(folded)
+    assert len(optimized.code) < len(plain.code)
+    assert optimized.globals_of(run(optimized)) == plain.globals_of(run(plain)) == {'k': 6, 'a': 6, 'b': 1}
+
+
+def test_errors():
+    with pytest.raises(VMError):
+        execute("var a = 0; var b = 1 / a;")
+    with pytest.raises(CompileError):
+        execute("var a = b;")
+    with pytest.raises(CompileError):
+        execute("var a = 1;\nvar = ;\n")
+
+
+def test_deep_expression():
+    n = 50000
+    assert execute("var a = " + " + ".join(["1"] * n) + ";") == {'a': n}
@@ -0,0 +1,69 @@
+"""Recorrido iterativo del AST con pila explícita.
+
+`NodeVisitor` no usa recursión de Python, así que no depende del límite de
+recursión: sirve para cadenas `a + a + ...` de cientos de miles de términos o
+bloques `if` anidados a cualquier profundidad, y evita el coste de una llamada
+recursiva por nodo.
+
+Las subclases definen métodos por tipo de nodo (los `-` del tipo pasan a `_`):
+
+- `visit_<tipo>(node)`: al entrar en el nodo, antes que sus hijos. Si devuelve
+  `False` no se visitan los hijos ni se llama a `leave_<tipo>`.
+- `leave_<tipo>(node)`: al salir, después de todos los hijos.
+
+Los hijos se visitan en orden, de izquierda a derecha.
+"""
+from typing import Callable, Dict, Optional, Tuple
+
+_Handlers = Tuple[Optional[Callable], Optional[Callable]]
+
+
+class NodeVisitor:
+    # caché por clase: tipo de nodo -> nombres de (visit, leave)
+    _handler_names: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._handler_names = {}
+
+    def _handlers(self, node_type: str) -> _Handlers:
+        names = self._handler_names.get(node_type)
+        if names is None:
+            suffix = node_type.replace('-', '_')
+            visit = 'visit_' + suffix
+            leave = 'leave_' + suffix
+            names = (visit if hasattr(self, visit) else None,
+                     leave if hasattr(self, leave) else None)
+            self._handler_names[node_type] = names
+        visit, leave = names
+        return (getattr(self, visit) if visit else None,
+                getattr(self, leave) if leave else None)
+
+    def walk(self, root):
+        """Recorre `root` en preorden llamando a los `visit_*`/`leave_*` definidos."""
+        if root is None:
+            return
+        cache: Dict[str, _Handlers] = {}
+        # entradas de la pila: un nodo (entrar) o una tupla (leave, nodo) para salir
+        stack = [root]
+        pop = stack.pop
+        push = stack.append
+        extend = stack.extend
+        while stack:
+            item = pop()
+            if item.__class__ is tuple:
+                item[0](item[1])
+                continue
+            if item is None:
+                continue
+            try:
+                visit, leave = cache[item.type]
+            except KeyError:
+                visit, leave = cache[item.type] = self._handlers(item.type)
+            if visit is not None and visit(item) is False:
+                continue
+            if leave is not None:
+                push((leave, item))
+            children = item.children
+            if children:
+                extend(reversed(children))
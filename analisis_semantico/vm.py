@@ -0,0 +1,142 @@
+"""Máquina virtual de pila para el bytecode de `codegen.py`.
+
+`run` es un único bucle de despacho: el código se indexa como lista, las
+constantes, los slots y la pila son listas locales y los códigos de operación
+se comparan con variables locales, sin llamadas a funciones por instrucción.
+
+Uso:
+    program = compile_program(tree)
+    slots = run(program)
+    print(program.globals_of(slots))
+"""
+import sys
+import os
+from typing import List
+
+# Asegurar que el proyecto raíz esté en sys.path para importar el paquete analisis_semantico
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico import codegen
+from analisis_semantico.codegen import Program
+
+
+class VMError(Exception):
+    """Error en tiempo de ejecución (por ejemplo, división por cero)."""
+
+    def __init__(self, message: str, pc: int = -1):
+        super().__init__(f"{message} (instrucción {pc})" if pc >= 0 else message)
+        self.pc = pc
+
+
+def run(program: Program) -> List[int]:
+    """Ejecuta `program` y devuelve el valor final de cada slot."""
+    code = program.ops()
+    consts = program.consts
+    slots = [0] * program.n_slots
+    stack: List[int] = []
+    push = stack.append
+    pop = stack.pop
+
+    LOAD_CONST = codegen.LOAD_CONST
+    LOAD_VAR = codegen.LOAD_VAR
+    STORE_VAR = codegen.STORE_VAR
+    POP = codegen.POP
+    ADD = codegen.ADD
+    SUB = codegen.SUB
+    MUL = codegen.MUL
+    DIV = codegen.DIV
+    EQ = codegen.EQ
+    NE = codegen.NE
+    LT = codegen.LT
+    LE = codegen.LE
+    GT = codegen.GT
+    GE = codegen.GE
+    JUMP = codegen.JUMP
+    JUMP_IF_FALSE = codegen.JUMP_IF_FALSE
+    JUMP_IF_FALSE_OR_POP = codegen.JUMP_IF_FALSE_OR_POP
+    JUMP_IF_TRUE_OR_POP = codegen.JUMP_IF_TRUE_OR_POP
+    HALT = codegen.HALT
+
+    pc = 0
+    while True:
+        op = code[pc]
+        # las instrucciones más frecuentes primero
+        if op == LOAD_VAR:
+            push(slots[code[pc + 1]])
+            pc += 2
+        elif op == LOAD_CONST:
+            push(consts[code[pc + 1]])
+            pc += 2
+        elif op == STORE_VAR:
+            slots[code[pc + 1]] = pop()
+            pc += 2
+        elif op == ADD:
+            b = pop()
+            stack[-1] += b
+            pc += 1
+        elif op == SUB:
+            b = pop()
+            stack[-1] -= b
+            pc += 1
+        elif op == MUL:
+            b = pop()
+            stack[-1] *= b
+            pc += 1
+        elif op == DIV:
+            b = pop()
+            if b == 0:
+                raise VMError("División por cero", pc)
+            a = stack[-1]
+            q = abs(a) // abs(b)
+            stack[-1] = q if (a < 0) == (b < 0) else -q
+            pc += 1
+        elif op == JUMP_IF_FALSE:
+            if pop():
+                pc += 2
+            else:
+                pc = code[pc + 1]
+        elif op == LT:
+            b = pop()
+            stack[-1] = 1 if stack[-1] < b else 0
+            pc += 1
+        elif op == GT:
+            b = pop()
+            stack[-1] = 1 if stack[-1] > b else 0
+            pc += 1
+        elif op == EQ:
+            b = pop()
+            stack[-1] = 1 if stack[-1] == b else 0
+            pc += 1
+        elif op == NE:
+            b = pop()
+            stack[-1] = 1 if stack[-1] != b else 0
+            pc += 1
+        elif op == LE:
+            b = pop()
+            stack[-1] = 1 if stack[-1] <= b else 0
+            pc += 1
+        elif op == GE:
+            b = pop()
+            stack[-1] = 1 if stack[-1] >= b else 0
+            pc += 1
+        elif op == JUMP:
+            pc = code[pc + 1]
+        elif op == JUMP_IF_FALSE_OR_POP:
+            if stack[-1]:
+                pop()
+                pc += 2
+            else:
+                pc = code[pc + 1]
+        elif op == JUMP_IF_TRUE_OR_POP:
+            if stack[-1]:
+                pc = code[pc + 1]
+            else:
+                pop()
+                pc += 2
+        elif op == POP:
+            pop()
+            pc += 1
+        elif op == HALT:
+            return slots
+        else:
+            raise VMError(f"Código de operación desconocido {op}", pc)
@@ -0,0 +1,72 @@
+"""Benchmark del léxico: lexer de PLY frente a `FastLexer`.
+
+Genera un fuente sintético con declaraciones, expresiones, bloques y comentarios,
+lo tokeniza con cada backend y comprueba que ambos producen los mismos tokens.
+
+Uso:
+    python benchmarks/bench_lexer.py --lines 100000
+"""
+import sys
+import os
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lexer'))
+
+from lexer import lexer as ply_lexer
+from fastlexer import FastLexer
+
+SNIPPET = (
+    "var x{i} = {i}; /* bloque\n con dos líneas */ let y{i} = x{i} + 20 >= 3 && z != 4; // fin\n"
+    "if (x{i} <= y{i} || w == 0) {{ b = c * 2; }} else {{ d = e / f - 1; }}\n"
+)
+
+
+def build_source(lines):
+    return ''.join(SNIPPET.format(i=i) for i in range(max(1, lines // 3)))
+
+
+def lex_all(lx, code):
+    lx.lineno = 1
+    lx.input(code)
+    token = lx.token
+    count = 0
+    while token() is not None:
+        count += 1
+    return count
+
+
+def token_stream(lx, code):
+    lx.lineno = 1
+    lx.input(code)
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lx.token, None)]
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Benchmark del lexer')
+    arg_parser.add_argument('--lines', type=int, default=60000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    code = build_source(args.lines)
+    print(f"fuente: {len(code)} caracteres")
+    results = {}
+    for name, factory in (('ply', ply_lexer.clone), ('fast', FastLexer)):
+        best = None
+        for _ in range(args.repeat):
+            lx = factory()
+            start = time.perf_counter()
+            count = lex_all(lx, code)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best
+        print(f"{name:<5} {count} tokens  {best:.3f}s  {count / best / 1e6:.2f} Mtok/s")
+
+    if token_stream(ply_lexer.clone(), code) != token_stream(FastLexer(), code):
+        raise SystemExit("Los lexers no producen los mismos tokens")
+    print(f"aceleración: {results['ply'] / results['fast']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
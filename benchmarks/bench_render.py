@@ -0,0 +1,92 @@
+"""Benchmark de la salida del AST: `pretty` recursivo anterior frente a `render`.
+
+Parsea un programa sintético de ~N nodos y mide cuánto tarda cada formato en
+escribirse (a un archivo temporal) y, para los formatos de máquina, en cargarse.
+
+Uso:
+    python benchmarks/bench_render.py --nodes 100000
+"""
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from colorama import Fore, Style
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.render import load_binary, load_json, load_sexpr, render
+
+SNIPPET = "var x{i} = {i} + y * 2;\nif (x{i} > 3 && y != 0) {{ y = x{i} - 1; }} else {{ z = (y + 1) / 2; }}\n"
+NODES_PER_SNIPPET = 19
+
+
+def legacy_pretty(node, level=0, last=True, prefix=""):
+    """Implementación anterior de `Node.pretty` (concatenación recursiva)."""
+    color_map = {
+        "program": Fore.CYAN + Style.BRIGHT,
+        "statement_list": Fore.MAGENTA + Style.BRIGHT,
+        "declaration": Fore.GREEN + Style.BRIGHT,
+        "assignment": Fore.YELLOW + Style.BRIGHT,
+        "if": Fore.BLUE + Style.BRIGHT,
+        "if-else": Fore.BLUE + Style.BRIGHT,
+        "binary_op": Fore.RED + Style.BRIGHT,
+        "number": Fore.WHITE + Style.BRIGHT,
+        "identifier": Fore.WHITE + Style.BRIGHT,
+        "expression_statement": Fore.CYAN + Style.BRIGHT
+    }
+    color = color_map.get(node.type, Fore.WHITE)
+    branch = "└── " if last else "├── "
+    line = prefix + branch + color + f"<{node.type}> " + (str(node.value) if node.value else "")
+    ret = line + Style.RESET_ALL + "\n"
+    new_prefix = prefix + ("    " if last else "│   ")
+    for i, child in enumerate(node.children):
+        ret += legacy_pretty(child, level + 1, i == len(node.children) - 1, new_prefix)
+    return ret
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Benchmark de salida del AST')
+    arg_parser.add_argument('--nodes', type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    code = ''.join(SNIPPET.format(i=i) for i in range(max(1, args.nodes // NODES_PER_SNIPPET)))
+    tree, _ = analyze_code(code)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def write_text(fn):
+            with open(os.path.join(tmp, 'out.txt'), 'w', encoding='utf8') as fh:
+                fn(fh)
+
+        _, t = timed(lambda: write_text(lambda fh: fh.write(legacy_pretty(tree))))
+        print(f"{'pretty anterior':<16} {t:8.3f}s")
+        _, t = timed(lambda: write_text(lambda fh: fh.write(tree.pretty())))
+        print(f"{'pretty':<16} {t:8.3f}s")
+        _, t = timed(lambda: write_text(lambda fh: render(tree, fh, 'tree', color=True)))
+        print(f"{'tree (color)':<16} {t:8.3f}s")
+        _, t = timed(lambda: write_text(lambda fh: render(tree, fh, 'tree')))
+        print(f"{'tree':<16} {t:8.3f}s")
+
+        loaders = {'json': load_json, 'sexpr': load_sexpr, 'binary': load_binary}
+        for fmt, loader in loaders.items():
+            path = os.path.join(tmp, 'out.' + fmt)
+            mode = 'wb' if fmt == 'binary' else 'w'
+            with open(path, mode, **({} if fmt == 'binary' else {'encoding': 'utf8'})) as fh:
+                _, t_write = timed(lambda: render(tree, fh, fmt))
+            with open(path, 'rb' if fmt == 'binary' else 'r', **({} if fmt == 'binary' else {'encoding': 'utf8'})) as fh:
+                data = fh.read()
+            _, t_load = timed(lambda: loader(data))
+            print(f"{fmt:<16} {t_write:8.3f}s  carga {t_load:.3f}s  {os.path.getsize(path) / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
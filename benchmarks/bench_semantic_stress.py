@@ -0,0 +1,94 @@
+"""Benchmark de estrés del análisis semántico sobre árboles de ~1M de nodos.
+
+Construye los árboles directamente con `Node` (sin pasar por el parser) con tres
+formas que antes agotaban el límite de recursión o el tiempo:
+
+- chain:  `x + x + ... + x` con una cadena de `binary_op` tan profunda como larga
+- nested: `if (1) { var vN = N; if (1) { ... } }` anidado
+- wide:   muchas sentencias `var`/asignación en el ámbito global
+
+Uso:
+    python benchmarks/bench_semantic_stress.py --nodes 1000000
+"""
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import SemanticAnalyzer, get_parser_module
+
+Node = get_parser_module().Node
+Declared = get_parser_module().Declared
+
+
+def program(statements):
+    return Node("program", [Node("statement_list", statements)])
+
+
+def build_chain(n_nodes):
+    """Cadena asociada a la izquierda: 2 nodos por término."""
+    terms = max(1, n_nodes // 2)
+    expr = Node("identifier", value="x")
+    for _ in range(terms - 1):
+        expr = Node("binary_op", (expr, Node("identifier", value="x")), "+")
+    decl = Node("declaration", (Node("number", value=0),), Declared("var", "x"))
+    return program([decl, Node("expression_statement", (expr,))])
+
+
+def build_nested(n_nodes):
+    """`if` anidados: 5 nodos por nivel (if, number, statement_list, declaration, number)."""
+    levels = max(1, n_nodes // 5)
+    inner = [Node("declaration", (Node("number", value=levels),), Declared("var", f"v{levels}"))]
+    for i in range(levels - 1, 0, -1):
+        block = Node("statement_list", inner)
+        inner = [Node("declaration", (Node("number", value=i),), Declared("var", f"v{i}")),
+                 Node("if", (Node("number", value=1), block), "")]
+    return program(inner)
+
+
+def build_wide(n_nodes):
+    """Sentencias planas: 4 nodos por par declaración/uso."""
+    pairs = max(1, n_nodes // 4)
+    statements = []
+    for i in range(pairs):
+        statements.append(Node("declaration", (Node("number", value=i),), Declared("var", f"v{i}")))
+        statements.append(Node("assignment", (Node("identifier", value=f"v{i}"),), f"v{i}"))
+    return program(statements)
+
+
+SHAPES = {"chain": build_chain, "nested": build_nested, "wide": build_wide}
+
+
+def count_nodes(tree):
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def run(shape, n_nodes):
+    tree = SHAPES[shape](n_nodes)
+    total = count_nodes(tree)
+    analyzer = SemanticAnalyzer()
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    elapsed = time.perf_counter() - start
+    print(f"{shape:7} {total:>9} nodos  {elapsed:7.3f} s  {total / elapsed:>12,.0f} nodos/s  "
+          f"errores={len(analyzer.errors)} recursion_limit={sys.getrecursionlimit()}")
+    return elapsed
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Benchmark de estrés del analizador semántico')
+    arg_parser.add_argument('--nodes', type=int, default=1_000_000, help='Tamaño aproximado de cada árbol')
+    arg_parser.add_argument('--shape', choices=sorted(SHAPES) + ['all'], default='all')
+    args = arg_parser.parse_args()
+
+    for shape in (sorted(SHAPES) if args.shape == 'all' else [args.shape]):
+        run(shape, args.nodes)
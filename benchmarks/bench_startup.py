@@ -0,0 +1,71 @@
+"""Benchmark de arranque en frío del compilador.
+
+Mide, en procesos nuevos, cuánto tarda:
+
+- import:  importar `parser/parser.py` (el parser aún no se construye)
+- parse:   importar y parsear un programa corto (carga parsetab.py)
+- cli:     `analisis_semantico/semantic.py` sobre un ejemplo, de principio a fin
+
+y, dentro de este proceso, construir el parser desde las tablas precompiladas
+frente a generar las tablas LALR desde la gramática (lo que pasaba antes en
+cada arranque).
+
+Uso:
+    python benchmarks/bench_startup.py --runs 10
+"""
+import sys
+import os
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+EXAMPLE = os.path.join(ROOT, 'analisis_semantico', 'ejemplos', 'ejemplo_correcto.js')
+
+SNIPPETS = {
+    'import': "from parser import parser",
+    # parser.py deja lexer/ en sys.path, así que `lexer` es ya lexer/lexer.py
+    'parse': "from parser import parser\nimport lexer\nparser.parser.parse('var x = 1;', lexer=lexer.lexer)",
+}
+
+
+def run_cold(args, runs):
+    """Mediana (en ms) de `runs` ejecuciones de `python <args>` desde un directorio neutro."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=os.path.dirname(ROOT), check=True,
+                       stdout=subprocess.DEVNULL, env=dict(os.environ, PYTHONPATH=ROOT))
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Benchmark de arranque')
+    arg_parser.add_argument('--runs', type=int, default=10)
+    args = arg_parser.parse_args()
+
+    baseline = run_cold(['-c', 'pass'], args.runs)
+    print(f"{'python -c pass':<16} {baseline:8.1f} ms")
+    for name, code in SNIPPETS.items():
+        print(f"{name:<16} {run_cold(['-c', code], args.runs):8.1f} ms")
+    print(f"{'cli':<16} {run_cold([os.path.join(ROOT, 'analisis_semantico', 'semantic.py'), EXAMPLE, '--no-cache'], args.runs):8.1f} ms")
+
+    from parser import parser as parser_module
+    start = time.perf_counter()
+    parser_module.build_parser()
+    from_tables = (time.perf_counter() - start) * 1000
+    yacc = parser_module.yacc
+    start = time.perf_counter()
+    parser_module._yacc('parsetab_bench', write_tables=False, errorlog=yacc.NullLogger())
+    generated = (time.perf_counter() - start) * 1000
+    print(f"{'tablas .py':<16} {from_tables:8.1f} ms")
+    print(f"{'generar LALR':<16} {generated:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark de ejecución: VM de bytecode y backend a Python frente a un intérprete directo del AST.
+
+El intérprete de referencia es el enfoque ingenuo: recorre el árbol
+recursivamente en cada ejecución y busca las variables por nombre en una cadena
+de diccionarios. La VM ejecuta el `Program` de `codegen.py` con slots y el
+backend de `pybackend.py` un objeto código de CPython. Se comprueba que todos
+dejan las mismas variables globales.
+
+Uso:
+    python benchmarks/bench_vm.py --statements 20000 --repeat 5
+"""
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.codegen import compile_program
+from analisis_semantico.vm import run
+from analisis_semantico.pybackend import compile_tree, run_code
+
+SNIPPET = (
+    "var a{i} = {i} + a{p} * 3 / 7 - 2;\n"
+    "if (a{i} > 100 && a{i} != 5 || a{p} < 0) {{ let t{i} = a{i} - 1; a{i} = t{i} * 2 / 3; }}"
+    " else {{ a{i} = a{i} + (1 || a{p}); }}\n"
+)
+
+
+def build_source(statements):
+    parts = ["var a0 = 1;\n"]
+    for i in range(1, max(1, statements // 2) + 1):
+        parts.append(SNIPPET.format(i=i, p=i - 1))
+    return ''.join(parts)
+
+
+# -----------------------------
+# Intérprete directo del AST
+# -----------------------------
+def _lookup(scopes, name):
+    for scope in reversed(scopes):
+        if name in scope:
+            return scope
+    raise NameError(name)
+
+
+def _truncdiv(a, b):
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def eval_expr(node, scopes):
+    if node.type == 'number':
+        return node.value
+    if node.type == 'identifier':
+        return _lookup(scopes, node.value)[node.value]
+    op = node.value
+    left = eval_expr(node.children[0], scopes)
+    if op == '&&':
+        return eval_expr(node.children[1], scopes) if left else left
+    if op == '||':
+        return left if left else eval_expr(node.children[1], scopes)
+    right = eval_expr(node.children[1], scopes)
+    if op == '+':
+        return left + right
+    if op == '-':
+        return left - right
+    if op == '*':
+        return left * right
+    if op == '/':
+        return _truncdiv(left, right)
+    return 1 if {'==': left == right, '!=': left != right, '<': left < right,
+                 '<=': left <= right, '>': left > right, '>=': left >= right}[op] else 0
+
+
+def exec_stmt(node, scopes):
+    kind = node.type
+    if kind == 'statement_list':
+        scopes.append({})
+        for child in node.children:
+            exec_stmt(child, scopes)
+        scopes.pop()
+    elif kind == 'declaration':
+        name = node.value.name
+        scopes[-1][name] = 0
+        scopes[-1][name] = eval_expr(node.children[0], scopes)
+    elif kind == 'assignment':
+        scope = _lookup(scopes, node.value)
+        scope[node.value] = eval_expr(node.children[0], scopes)
+    elif kind == 'expression_statement':
+        eval_expr(node.children[0], scopes)
+    elif kind == 'if':
+        if eval_expr(node.children[0], scopes):
+            exec_stmt(node.children[1], scopes)
+    elif kind == 'if-else':
+        exec_stmt(node.children[1] if eval_expr(node.children[0], scopes) else node.children[2], scopes)
+
+
+def interpret(tree):
+    """Ejecuta el árbol y devuelve las variables globales."""
+    scopes = [{}]
+    for child in tree.children[0].children:
+        exec_stmt(child, scopes)
+    return scopes[0]
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Benchmark de la VM')
+    arg_parser.add_argument('--statements', type=int, default=20000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    tree, analyzer = analyze_code(build_source(args.statements))
+    if analyzer.errors or analyzer.syntax_errors:
+        raise SystemExit("El programa generado tiene errores")
+
+    compile_time, program = best_of(args.repeat, lambda: compile_program(tree))
+    print(f"programa: {program}")
+    print(f"codegen          {compile_time:.3f}s")
+    ast_time, expected = best_of(args.repeat, lambda: interpret(tree))
+    print(f"intérprete AST   {ast_time:.3f}s")
+    vm_time, slots = best_of(args.repeat, lambda: run(program))
+    print(f"vm               {vm_time:.3f}s  ({ast_time / vm_time:.2f}x)")
+    py_compile_time, code = best_of(args.repeat, lambda: compile_tree(tree))
+    print(f"compilar Python  {py_compile_time:.3f}s")
+    py_time, py_globals = best_of(args.repeat, lambda: run_code(code))
+    print(f"python           {py_time:.3f}s  ({ast_time / py_time:.2f}x)")
+
+    if program.globals_of(slots) != expected or py_globals != expected:
+        raise SystemExit("Los backends y el intérprete no coinciden")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Generador de programas sintéticos para los benchmarks.
+
+Produce fuentes válidos para la gramática de `parser/parser.py` (sin errores de
+sintaxis ni semánticos) con un tamaño y una forma ajustables:
+
+- declarations: muchas declaraciones `var`/`let`/`const` con expresiones cortas
+- nesting:      `if` anidados hasta la profundidad pedida
+- chain:        una expresión `a + b * c - ...` muy larga en una sola sentencia
+- blocks:       muchos bloques hermanos con variables locales que ocultan globales
+- mixed:        mezcla de todo lo anterior, como un programa "normal"
+
+`size` es aproximadamente el número de sentencias (en `chain`, de términos; en
+`nesting`, de niveles). Con la misma `seed` el resultado es siempre el mismo.
+
+Uso:
+    python benchmarks/generator.py mixed 10000 > programa.js
+"""
+import random
+from typing import List
+
+SHAPES = ('declarations', 'nesting', 'chain', 'blocks', 'mixed')
+
+ARITHMETIC = ('+', '-', '*', '/')
+RELATIONAL = ('==', '!=', '<', '<=', '>', '>=')
+LOGIC = ('&&', '||')
+
+
+class ProgramGenerator:
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+        # variables globales ya declaradas (las que puede usar cualquier expresión)
+        self.names: List[str] = []
+        self.counter = 0
+
+    def _new_name(self, prefix: str = 'v') -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def operand(self) -> str:
+        if self.names and self.rng.random() < 0.6:
+            return self.rng.choice(self.names)
+        return str(self.rng.randint(0, 999))
+
+    def expression(self, terms: int) -> str:
+        rng = self.rng
+        parts = [self.operand()]
+        for _ in range(terms - 1):
+            r = rng.random()
+            op = rng.choice(ARITHMETIC if r < 0.7 else RELATIONAL if r < 0.85 else LOGIC)
+            parts.append(op)
+            parts.append(self.operand())
+        text = ' '.join(parts)
+        if terms > 2 and rng.random() < 0.3:
+            text = f"({text})"
+        return text
+
+    def condition(self) -> str:
+        return (f"{self.operand()} {self.rng.choice(RELATIONAL)} {self.operand()} "
+                f"{self.rng.choice(LOGIC)} {self.operand()}")
+
+    def declaration(self, kind: str = None) -> str:
+        kind = kind or self.rng.choice(('var', 'let', 'const'))
+        init = self.expression(self.rng.randint(1, 5))
+        name = self._new_name()
+        self.names.append(name)
+        return f"{kind} {name} = {init};"
+
+    # -----------------------------
+    # Formas
+    # -----------------------------
+    def declarations(self, size: int) -> List[str]:
+        return [self.declaration() for _ in range(size)]
+
+    def nesting(self, size: int) -> List[str]:
+        lines = [self.declaration('var')]
+        target = self.names[-1]
+        for level in range(size):
+            lines.append("    " * (level % 8) + f"if ({self.condition()}) {{")
+        lines.append(f"{target} = {self.expression(3)};")
+        lines.append("}" * size)
+        return lines
+
+    def chain(self, size: int) -> List[str]:
+        lines = [self.declaration('var') for _ in range(min(10, size))]
+        name = self._new_name('chain')
+        lines.append(f"var {name} = {self.expression(size)};")
+        self.names.append(name)
+        return lines
+
+    def block(self) -> str:
+        """Un bloque con una variable que oculta una global y otra local."""
+        shadowed = self.rng.choice(self.names)
+        local = self._new_name('t')
+        return (f"{{ let {shadowed} = {self.expression(2)}; let {local} = {shadowed} * 2; "
+                f"{shadowed} = {local} - {self.operand()}; }}")
+
+    def blocks(self, size: int) -> List[str]:
+        lines = [self.declaration('var') for _ in range(min(10, size))]
+        for _ in range(max(1, size // 4)):
+            lines.append(self.block())
+        return lines
+
+    def mixed(self, size: int) -> List[str]:
+        lines = []
+        rng = self.rng
+        while len(lines) < size:
+            r = rng.random()
+            if r < 0.5 or not self.names:
+                lines.append(self.declaration())
+            elif r < 0.7:
+                lines.append(f"{rng.choice(self.names)} = {self.expression(rng.randint(1, 6))};")
+            elif r < 0.85:
+                body = f"{rng.choice(self.names)} = {self.expression(3)};"
+                if rng.random() < 0.5:
+                    lines.append(f"if ({self.condition()}) {{ {body} }}")
+                else:
+                    lines.append(f"if ({self.condition()}) {{ {body} }} else {{ {rng.choice(self.names)} = 0; }}")
+            elif r < 0.95:
+                lines.append(self.block())
+            else:
+                lines.append(f"{self.expression(4)};")
+        return lines
+
+
+def generate(shape: str, size: int, seed: int = 0) -> str:
+    """Fuente sintético de forma `shape` (una de `SHAPES`) y tamaño aproximado `size`."""
+    if shape not in SHAPES:
+        raise ValueError(f"Forma desconocida '{shape}' (opciones: {', '.join(SHAPES)})")
+    generator = ProgramGenerator(seed)
+    lines = getattr(generator, shape)(max(1, size))
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Generar un programa sintético')
+    arg_parser.add_argument('shape', choices=SHAPES)
+    arg_parser.add_argument('size', type=int)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+    print(generate(args.shape, args.size, args.seed), end='')
@@ -0,0 +1,181 @@
+"""Suite de benchmarks del pipeline con seguimiento de regresiones.
+
+Para cada caso (forma y tamaño de `generator.py`) mide:
+
+- `lex`, `parse` y `analyze` por separado (`instrumentation.profile_code`);
+- `end_to_end`: `analyze_code` sin caché, que es el camino real con el léxico y
+  el parseo intercalados;
+- rendimiento en líneas/s y tokens/s del camino completo;
+- memoria pico (`tracemalloc`, en una pasada aparte porque ralentiza).
+
+De cada tiempo se guarda el mejor de `--repeat` ejecuciones. Los resultados se
+pueden guardar como JSON (`--save`) y compararse con un archivo anterior
+(`--baseline`): si algún tiempo empeora más que `--threshold` (fracción, 0.25 =
+25%) se informa y el proceso termina con código 1. Los tiempos dependen de la
+máquina, así que la línea base debe generarse en la misma en que se compara.
+
+Uso:
+    python benchmarks/suite.py --save base.json
+    python benchmarks/suite.py --baseline base.json --threshold 0.2
+    python benchmarks/suite.py --quick
+"""
+import sys
+import os
+import json
+import platform
+import time
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from analisis_semantico.semantic import analyze_code
+from analisis_semantico.instrumentation import profile_code
+from generator import generate
+
+RESULTS_FORMAT = "benchmark-suite"
+RESULTS_VERSION = 1
+# tiempos que se comparan con la línea base
+TIMED_METRICS = ('lex', 'parse', 'analyze', 'end_to_end')
+
+# (nombre, forma, tamaño)
+CASES = [
+    ('declarations', 'declarations', 20000),
+    ('nesting', 'nesting', 2000),
+    ('chain', 'chain', 50000),
+    ('blocks', 'blocks', 20000),
+    ('mixed', 'mixed', 20000),
+]
+QUICK_SCALE = 0.05
+
+
+def run_case(name: str, shape: str, size: int, repeat: int = 3, seed: int = 0,
+             memory: bool = True, lexer_backend: str = 'ply') -> Dict:
+    code = generate(shape, size, seed)
+    lines = code.count('\n')
+    best: Dict[str, float] = {}
+
+    def keep(metric, seconds):
+        best[metric] = min(seconds, best.get(metric, seconds))
+
+    report = None
+    for _ in range(repeat):
+        _, analyzer, report = profile_code(code, lexer_backend=lexer_backend)
+        if analyzer.errors or analyzer.syntax_errors or report.lex_errors:
+            raise SystemExit(f"El programa generado para '{name}' tiene errores")
+        for phase, timing in report.phases.items():
+            keep(phase, timing.wall)
+        start = time.perf_counter()
+        analyze_code(code, lexer_backend=lexer_backend)
+        keep('end_to_end', time.perf_counter() - start)
+
+    result = {
+        "shape": shape,
+        "size": size,
+        "seed": seed,
+        "lines": lines,
+        "bytes": len(code.encode('utf8')),
+        "tokens": report.tokens,
+        "nodes": report.total_nodes,
+        "seconds": {metric: round(best[metric], 6) for metric in TIMED_METRICS},
+        "lines_per_sec": round(lines / best['end_to_end'], 1),
+        "tokens_per_sec": round(report.tokens / best['end_to_end'], 1),
+        "peak_memory": None,
+    }
+    if memory:
+        _, _, mem_report = profile_code(code, lexer_backend=lexer_backend, memory=True)
+        result["peak_memory"] = mem_report.peak_memory
+    return result
+
+
+def run_suite(cases=None, repeat: int = 3, scale: float = 1.0, memory: bool = True,
+              lexer_backend: str = 'ply', out=None) -> Dict:
+    out = out or sys.stdout
+    results = {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "lexer": lexer_backend,
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "cases": {},
+    }
+    for name, shape, size in cases or CASES:
+        size = max(1, int(size * scale))
+        case = run_case(name, shape, size, repeat, memory=memory, lexer_backend=lexer_backend)
+        results["cases"][name] = case
+        s = case["seconds"]
+        mem = f"{case['peak_memory'] / 1048576:7.1f} MiB" if case["peak_memory"] is not None else ""
+        out.write(f"{name:<13} {case['lines']:>7} líneas {case['tokens']:>8} tokens  "
+                  f"lex {s['lex']:.3f}s  parse {s['parse']:.3f}s  analyze {s['analyze']:.3f}s  "
+                  f"total {s['end_to_end']:.3f}s  {case['tokens_per_sec'] / 1000:8.1f} ktok/s {mem}\n")
+        out.flush()
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Devuelve una línea por cada tiempo que empeoró más de `threshold` respecto a `baseline`."""
+    regressions = []
+    for name, case in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None or (base["shape"], base["size"], base["seed"]) != (case["shape"], case["size"], case["seed"]):
+            continue
+        for metric in TIMED_METRICS:
+            old = base["seconds"].get(metric)
+            new = case["seconds"].get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + threshold:
+                regressions.append(f"{name}.{metric}: {old:.4f}s -> {new:.4f}s (+{(ratio - 1) * 100:.1f}%)")
+    return regressions
+
+
+def load_results(path: str) -> Dict:
+    with open(path, 'r', encoding='utf8') as fh:
+        data = json.load(fh)
+    if data.get("format") != RESULTS_FORMAT:
+        raise SystemExit(f"{path} no es un resultado de la suite de benchmarks")
+    return data
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Suite de benchmarks con línea base')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--scale', type=float, default=1.0, help='Multiplicador de los tamaños de los casos')
+    arg_parser.add_argument('--quick', action='store_true', help=f'Casos pequeños (escala {QUICK_SCALE})')
+    arg_parser.add_argument('--case', action='append', help='Ejecutar solo estos casos (se puede repetir)')
+    arg_parser.add_argument('--lexer', choices=('ply', 'fast'), default='ply')
+    arg_parser.add_argument('--no-memory', action='store_true', help='No medir la memoria pico')
+    arg_parser.add_argument('--save', default=None, help='Guardar los resultados en este JSON')
+    arg_parser.add_argument('--baseline', default=None, help='JSON anterior con el que comparar')
+    arg_parser.add_argument('--threshold', type=float, default=0.25, help='Empeoramiento tolerado (0.25 = 25%%)')
+    args = arg_parser.parse_args(argv)
+
+    cases = [c for c in CASES if not args.case or c[0] in args.case]
+    if not cases:
+        arg_parser.error(f"Casos disponibles: {', '.join(c[0] for c in CASES)}")
+    baseline = load_results(args.baseline) if args.baseline else None
+    results = run_suite(cases, repeat=args.repeat, scale=QUICK_SCALE if args.quick else args.scale,
+                        memory=not args.no_memory, lexer_backend=args.lexer)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf8') as fh:
+            json.dump(results, fh, indent=2, ensure_ascii=False)
+            fh.write('\n')
+        print(f"resultados guardados en {args.save}")
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresiones (umbral {args.threshold * 100:.0f}%):")
+            for line in regressions:
+                print(" -", line)
+            return 1
+        print(f"\nsin regresiones respecto a {args.baseline} (umbral {args.threshold * 100:.0f}%)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
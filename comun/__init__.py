@@ -0,0 +1 @@
+"""Código compartido por el lexer, el parser y el analizador semántico."""
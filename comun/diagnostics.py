@@ -0,0 +1,276 @@
+"""Diagnósticos estructurados del compilador.
+
+El lexer, el parser y el analizador no imprimen: crean un `Diagnostic` (código,
+severidad, archivo, línea, offset/columna y argumentos del mensaje) y lo
+entregan a un `DiagnosticEngine`, que descarta los repetidos, aplica un máximo
+por archivo y lo reenvía a sus sumideros:
+
+- `CollectSink`: guarda los diagnósticos en una lista;
+- `JsonLinesSink`: una línea JSON por diagnóstico;
+- `TerminalSink`: texto legible (`❌ mensaje`), opcionalmente con `archivo:línea:columna`.
+
+El texto del mensaje solo se formatea cuando alguien lo pide (`message`), a
+partir de la plantilla de `MESSAGES` y los argumentos.
+
+El módulo está fuera de `analisis_semantico` porque el lexer y el parser también
+informan a través de él y no deben depender del analizador.
+
+El motor activo es por hilo: `use_engine(engine)` lo instala mientras dura el
+bloque y `report(...)` entrega al instalado o, si no hay ninguno, a uno por
+defecto que imprime por stdout como hacía antes el lexer.
+
+Uso:
+    engine = DiagnosticEngine([JsonLinesSink(sys.stderr)], file='a.js', max_per_file=100)
+    tree, analyzer = analyze_code(code, diagnostics=engine)
+"""
+import sys
+import json
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+SEVERITIES = ('error', 'warning', 'note')
+
+# código -> plantilla (`str.format` con los argumentos del diagnóstico)
+MESSAGES: Dict[str, str] = {
+    # léxico
+    'L001': "Caracter ilegal '{char}' en línea {line}",
+    # sintaxis
+    'P001': "Error de sintaxis en '{value}' (tipo: {token}) en la línea {line}",
+    'P002': "Error de sintaxis: fin de archivo inesperado",
+    # semántica
+    'S001': "Redeclaración de '{name}' en el mismo ámbito",
+    'S002': "Asignación a variable no declarada '{name}'",
+    'S003': "Uso de variable no declarada '{name}'",
+    'S004': "Redeclaración global de '{name}' (ya declarada en {other}:{other_line})",
+    # proyecto
+    'F001': "No se pudo leer el archivo: {error}",
+    # del propio motor
+    'D001': "Demasiados diagnósticos en {file}: se omiten los siguientes (máximo {limit})",
+}
+
+_TERMINAL_PREFIX = {'error': '❌', 'warning': '⚠️', 'note': 'ℹ️'}
+
+
+class Diagnostic:
+    __slots__ = ('code', 'severity', 'file', 'line', 'offset', 'column', 'args', '_message')
+
+    def __init__(self, code: str, severity: str = 'error', file: Optional[str] = None,
+                 line: Optional[int] = None, offset: Optional[int] = None, column: Optional[int] = None,
+                 args: Optional[Dict] = None):
+        self.code = code
+        self.severity = severity
+        self.file = file
+        self.line = line
+        self.offset = offset
+        self.column = column
+        self.args = args or {}
+        self._message = None
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            template = MESSAGES.get(self.code)
+            if template is None:
+                self._message = f"{self.code} {self.args}"
+            else:
+                # un argumento `line` o `file` del diagnóstico tiene prioridad sobre la posición
+                self._message = template.format_map({'line': self.line, 'file': self.file, **self.args})
+        return self._message
+
+    def location(self) -> str:
+        parts = [self.file or '<fuente>']
+        if self.line is not None:
+            parts.append(str(self.line))
+            if self.column is not None:
+                parts.append(str(self.column))
+        return ':'.join(parts)
+
+    def to_dict(self):
+        return {"code": self.code, "severity": self.severity, "file": self.file, "line": self.line,
+                "column": self.column, "offset": self.offset, "message": self.message, "args": self.args}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Diagnostic":
+        return cls(data["code"], data["severity"], data.get("file"), data.get("line"), data.get("offset"),
+                   data.get("column"), data.get("args"))
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return f"Diagnostic({self.code}, {self.location()}, {self.args})"
+
+
+# -----------------------------
+# Sumideros
+# -----------------------------
+class Sink:
+    """Base de los sumideros: por defecto ignora los diagnósticos."""
+
+    def emit(self, diagnostic: Diagnostic):
+        pass
+
+    def close(self):
+        pass
+
+
+class CollectSink(Sink):
+    def __init__(self):
+        self.diagnostics: List[Diagnostic] = []
+
+    def emit(self, diagnostic: Diagnostic):
+        self.diagnostics.append(diagnostic)
+
+
+class JsonLinesSink(Sink):
+    def __init__(self, out=None):
+        # None: `sys.stdout` en el momento de escribir (respeta redirecciones)
+        self.out = out
+
+    def emit(self, diagnostic: Diagnostic):
+        out = self.out or sys.stdout
+        out.write(json.dumps(diagnostic.to_dict(), ensure_ascii=False) + "\n")
+
+
+class TerminalSink(Sink):
+    def __init__(self, out=None, show_location: bool = False):
+        self.out = out
+        self.show_location = show_location
+
+    def emit(self, diagnostic: Diagnostic):
+        out = self.out or sys.stdout
+        prefix = _TERMINAL_PREFIX.get(diagnostic.severity, '-')
+        if self.show_location:
+            out.write(f"{prefix} {diagnostic.location()}: {diagnostic.message} [{diagnostic.code}]\n")
+        else:
+            out.write(f"{prefix} {diagnostic.message}\n")
+
+
+# -----------------------------
+# Motor
+# -----------------------------
+class DiagnosticEngine:
+    """Recibe diagnósticos, descarta duplicados, aplica el máximo por archivo y los reparte a los sumideros.
+
+    `diagnostics` guarda los aceptados en orden. Si se asigna `source` (el texto
+    del archivo), la columna se calcula a partir del offset.
+    """
+
+    def __init__(self, sinks: Iterable[Sink] = (), file: Optional[str] = None,
+                 max_per_file: Optional[int] = None, dedupe: bool = True):
+        self.sinks: List[Sink] = list(sinks)
+        self.file = file
+        self.max_per_file = max_per_file
+        self.dedupe = dedupe
+        self.diagnostics: List[Diagnostic] = []
+        self.suppressed = 0
+        self._seen = set()
+        self._per_file: Dict[Optional[str], int] = {}
+        self._source: Optional[str] = None
+        self._line_starts: Optional[List[int]] = None
+
+    @property
+    def source(self) -> Optional[str]:
+        return self._source
+
+    @source.setter
+    def source(self, text: Optional[str]):
+        self._source = text
+        self._line_starts = None
+
+    def column(self, offset: Optional[int]) -> Optional[int]:
+        """Columna (desde 1) de `offset` en `source`, o None si no se conoce el texto."""
+        if self._source is None or offset is None or offset < 0 or offset > len(self._source):
+            return None
+        if self._line_starts is None:
+            starts = [0]
+            find = self._source.find
+            pos = find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = find('\n', pos + 1)
+            self._line_starts = starts
+        index = bisect.bisect_right(self._line_starts, offset) - 1
+        return offset - self._line_starts[index] + 1
+
+    def report(self, code: str, severity: str = 'error', line: Optional[int] = None,
+               offset: Optional[int] = None, file: Optional[str] = None, **args) -> Diagnostic:
+        """Crea y entrega un diagnóstico; lo devuelve aunque se descarte."""
+        diagnostic = Diagnostic(code, severity, file or self.file, line, offset, self.column(offset), args)
+        self.add(diagnostic)
+        return diagnostic
+
+    def add(self, diagnostic: Diagnostic) -> bool:
+        """Entrega un diagnóstico ya creado. Devuelve False si se descartó."""
+        if self.dedupe:
+            key = (diagnostic.code, diagnostic.file, diagnostic.line, diagnostic.offset,
+                   tuple(sorted(diagnostic.args.items())))
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+        if self.max_per_file is not None:
+            count = self._per_file.get(diagnostic.file, 0)
+            if count >= self.max_per_file:
+                if count == self.max_per_file:
+                    self._per_file[diagnostic.file] = count + 1
+                    self._deliver(Diagnostic('D001', 'note', diagnostic.file,
+                                             args={'limit': self.max_per_file}))
+                self.suppressed += 1
+                return False
+            self._per_file[diagnostic.file] = count + 1
+        self._deliver(diagnostic)
+        return True
+
+    def _deliver(self, diagnostic: Diagnostic):
+        self.diagnostics.append(diagnostic)
+        for sink in self.sinks:
+            sink.emit(diagnostic)
+
+    def count(self, severity: str = 'error', prefix: str = '') -> int:
+        return sum(1 for d in self.diagnostics if d.severity == severity and d.code.startswith(prefix))
+
+    def by_prefix(self, prefix: str, start: int = 0) -> List[Diagnostic]:
+        """Diagnósticos aceptados (desde el índice `start`) cuyo código empieza por `prefix` (`L`, `P`, `S`...)."""
+        return [d for d in self.diagnostics[start:] if d.code.startswith(prefix)]
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+# -----------------------------
+# Motor activo por hilo
+# -----------------------------
+_state = threading.local()
+# sin motor instalado: se imprime por stdout, sin límites (comportamiento histórico)
+_default_engine = DiagnosticEngine([TerminalSink()], dedupe=False)
+
+
+def current() -> Optional[DiagnosticEngine]:
+    """El motor instalado con `use_engine` en este hilo, o None."""
+    return getattr(_state, 'engine', None)
+
+
+@contextmanager
+def use_engine(engine: DiagnosticEngine):
+    previous = getattr(_state, 'engine', None)
+    _state.engine = engine
+    try:
+        yield engine
+    finally:
+        _state.engine = previous
+
+
+def report(code: str, severity: str = 'error', line: Optional[int] = None, offset: Optional[int] = None,
+           **args) -> Diagnostic:
+    """Entrega un diagnóstico al motor activo (o al que imprime por defecto)."""
+    engine = getattr(_state, 'engine', None) or _default_engine
+    if engine is _default_engine:
+        # el motor por defecto no acumula: solo imprime
+        diagnostic = Diagnostic(code, severity, None, line, offset, None, args)
+        for sink in engine.sinks:
+            sink.emit(diagnostic)
+        return diagnostic
+    return engine.report(code, severity, line, offset, **args)
@@ -0,0 +1,181 @@
+"""Scanner rápido con la misma API de tokens que el lexer de PLY.
+
+PLY prueba su expresión maestra en cada llamada a `token()` y llama a una
+función de Python por cada `ID`, `NUMBER`, salto de línea y comentario.
+`FastLexer` usa una sola expresión regular que salta los espacios y captura el
+siguiente lexema, y la recorre con un bucle `finditer`: el tipo se obtiene con
+una búsqueda en tabla (`OPERATORS` para los lexemas fijos, `reserved` para las
+palabras reservadas) o por el primer carácter del lexema.
+
+Las alternativas están en el mismo orden en que PLY combina las reglas de
+`lexer.py` (funciones por línea de definición, luego cadenas de mayor a menor
+longitud), así que genera los mismos `type`, `value`, `lineno` y `lexpos`.
+Si cambian las reglas de `lexer.py` hay que actualizar este archivo;
+`lexer/tests/test_fastlexer.py` compara ambos lexers sobre un corpus.
+
+Uso:
+    lexer = FastLexer()
+    parser.parse(code, lexer=lexer)
+"""
+import sys
+import os
+import re
+
+# Asegurar que la carpeta lexer esté en sys.path para importar lexer.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import lexer as lexer_module
+if not hasattr(lexer_module, 'tokens'):
+    # `lexer` resolvió a la carpeta (paquete de espacio de nombres), no a lexer.py
+    from lexer import lexer as lexer_module
+
+# Espacios de `t_ignore` y, en el grupo 1, el lexema siguiente. La última
+# alternativa captura un carácter ilegal, de modo que las coincidencias son
+# contiguas y no hace falta buscar huecos.
+MASTER = re.compile(r"""
+    [ \t\r]*
+    ( /\*[\s\S]*?\*/             # t_ignore_MCOMMENT
+    | [a-zA-Z_][a-zA-Z0-9_]*     # t_ID
+    | \d+                        # t_NUMBER
+    | \n+                        # t_newline
+    | ==|!=|<=|>=|<|>            # t_REL_OP
+    | &&|\|\|                    # t_LOGIC_OP
+    | //.*                       # t_ignore_COMMENT
+    | [-+*/=(){},;]              # operadores de un carácter
+    | [^ \t\r]                   # carácter ilegal
+    )""", re.VERBOSE)
+
+OPERATORS = {
+    '==': 'REL_OP', '!=': 'REL_OP', '<=': 'REL_OP', '>=': 'REL_OP', '<': 'REL_OP', '>': 'REL_OP',
+    '&&': 'LOGIC_OP', '||': 'LOGIC_OP',
+    '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE', '=': 'ASSIGN',
+    '(': 'LPAREN', ')': 'RPAREN', '{': 'LBRACE', '}': 'RBRACE',
+    ',': 'COMMA', ';': 'SEMICOLON',
+}
+ID_START = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_')
+
+
+class Token:
+    """Equivalente ligero de `ply.lex.LexToken` (los `NUMBER` llevan además `end`)."""
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'end', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __str__(self):
+        return 'LexToken(%s,%r,%d,%d)' % (self.type, self.value, self.lineno, self.lexpos)
+
+    __repr__ = __str__
+
+
+class FastLexer:
+    """Lexer compatible con `ply.lex.Lexer` para `parser.parse(lexer=...)`.
+
+    Implementa `input`, `token`, `clone`, `skip`, `lineno`, `lexpos` y
+    `lexerrorf` (el manejador de caracteres ilegales, por defecto el mismo mensaje
+    que `t_error`). Mientras se generan tokens `lexpos` solo se actualiza al
+    encontrar un carácter ilegal y al terminar la entrada, así que cambiarlo
+    solo tiene efecto justo después de `input`.
+    """
+
+    def __init__(self):
+        self.reserved = lexer_module.reserved
+        self.lexdata = ''
+        self.lexpos = 0
+        self.lineno = 1
+        self.lexerrorf = None
+        # `NameTable` de la compilación en curso, como en el lexer de PLY
+        self.names = None
+        self.input('')
+
+    def input(self, data: str):
+        self.lexdata = data
+        self.lexpos = 0
+        # `token` es directamente el `__next__` del generador: el parser lo llama
+        # una vez por token y así se ahorra una llamada intermedia
+        self.token = self._scan().__next__
+
+    def clone(self):
+        other = FastLexer.__new__(FastLexer)
+        other.__dict__.update(self.__dict__)
+        other.token = other._scan().__next__
+        return other
+
+    def skip(self, n: int):
+        self.lexpos += n
+
+    def token(self):
+        """Siguiente token o `None` al final (se reemplaza en `input`)."""
+        return None
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+    def _illegal(self, pos: int):
+        if self.lexerrorf is None:
+            lexer_module.report_illegal_char(self.lexdata[pos], self.lineno, pos)
+            self.lexpos = pos + 1
+            return
+        tok = Token('error', self.lexdata[pos:pos + 1], self.lineno, pos)
+        tok.lexer = self
+        self.lexpos = pos
+        self.lexerrorf(tok)
+        if self.lexpos == pos:
+            raise lexer_module.lex.LexError(f"Caracter ilegal '{self.lexdata[pos]}' en la posición {pos}",
+                                            self.lexdata[pos:])
+
+    def _scan(self):
+        """Genera los tokens desde `lexpos` y después `None` indefinidamente, como `token()` de PLY.
+
+        El generador no empieza hasta la primera llamada, así que respeta un
+        `lexpos`/`lineno` fijado después de `input`. Solo se reinicia `finditer`
+        si el manejador de errores salta más de un carácter.
+        """
+        data = self.lexdata
+        end = len(data)
+        finditer = MASTER.finditer
+        operators_get = OPERATORS.get
+        reserved_get = self.reserved.get
+        intern = self.names.intern if self.names is not None else None
+        lineno = self.lineno
+        pos = self.lexpos
+        while pos < end:
+            for m in finditer(data, pos):
+                start, pos = m.span(1)
+                text = data[start:pos]
+                kind = operators_get(text)
+                if kind is not None:
+                    yield Token(kind, text, lineno, start)
+                    continue
+                c = text[0]
+                if c in ID_START:
+                    kind = reserved_get(text, 'ID')
+                    if intern is not None and kind == 'ID':
+                        text = intern(text)
+                    yield Token(kind, text, lineno, start)
+                elif c == '\n':
+                    lineno += pos - start
+                    self.lineno = lineno
+                elif c.isdecimal():
+                    tok = Token('NUMBER', int(text), lineno, start)
+                    tok.end = pos
+                    yield tok
+                elif c == '/':
+                    # comentario (`//` o `/* */`); el `/` suelto ya lo resolvió OPERATORS
+                    if text[1] == '*':
+                        lineno += text.count('\n')
+                        self.lineno = lineno
+                else:
+                    self._illegal(start)
+                    lineno = self.lineno
+                    if self.lexpos != pos:
+                        pos = self.lexpos
+                        break
+            else:
+                break
+        self.lexpos = end
+        while True:
+            yield None
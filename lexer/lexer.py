@@ -1,6 +1,13 @@
 # Guarda este archivo como lexico_corregido.py
+import sys
+import os
 import ply.lex as lex
 
+# Asegurar que el proyecto raíz esté en sys.path para importar los diagnósticos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comun import diagnostics
+
 # -----------------------------
 # Palabras reservadas (sin cambios)
 # -----------------------------
@@ -62,6 +69,10 @@ def t_ignore_MCOMMENT(t):
 def t_ID(t):
     r'[a-zA-Z_][a-zA-Z0-9_]*'
     t.type = reserved.get(t.value, 'ID')
+    # con una tabla de nombres instalada (`lexer.names`) el nombre sale internado
+    names = t.lexer.names
+    if names is not None and t.type == 'ID':
+        t.value = names.intern(t.value)
     return t
 
 # -----------------------------
@@ -69,6 +80,8 @@ def t_ID(t):
 # -----------------------------
 def t_NUMBER(t):
     r'\d+'
+    # el valor pasa a int: se guarda dónde acaba el lexema para las posiciones del AST
+    t.end = t.lexpos + len(t.value)
     t.value = int(t.value)
     return t
 
@@ -82,13 +95,19 @@ def t_newline(t):
 # -----------------------------
 # Manejo de errores
 # -----------------------------
+def report_illegal_char(char, lineno, offset=None):
+    # sin motor de diagnósticos instalado se imprime como siempre
+    diagnostics.report('L001', line=lineno, offset=offset, char=char)
+
 def t_error(t):
-    print(f"❌ Caracter ilegal '{t.value[0]}' en línea {t.lexer.lineno}")
+    report_illegal_char(t.value[0], t.lexer.lineno, t.lexpos)
     t.lexer.skip(1)
 
 # -----------------------------
 # Construcción del lexer
 # -----------------------------
 lexer = lex.lex()
+# `NameTable` de la compilación en curso (la instala `parse_code`); None: sin internar
+lexer.names = None
 
 
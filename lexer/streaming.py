@@ -0,0 +1,213 @@
+"""Lexer por streaming: tokeniza fuentes enormes por bloques con memoria acotada.
+
+`StreamingLexer` lee de un archivo (texto o binario) o de un `mmap` en bloques de
+`chunk_size` caracteres y genera los mismos tokens que el lexer de PLY sobre el
+texto completo, con `lexpos` y `lineno` absolutos. Expone `token()`, así que se
+puede pasar directamente a `parser.parse(lexer=...)`.
+
+Cada bloque se lexea solo hasta un punto de corte seguro: el último espacio en
+blanco (ningún token lo contiene), retrocediendo hasta un `//` de esa línea para
+no partir un comentario de línea. El único constructo que puede cruzar el corte
+es `/* ... */`: si la región contiene un `/*` sin cerrar, PLY lo devuelve como
+`DIVIDE` seguido de `TIMES` en posiciones contiguas (el comentario completo lo
+habría consumido `t_ignore_MCOMMENT`). En ese caso se confirma solo lo anterior
+y el resto se conserva hasta leer el `*/`.
+
+Los errores de caracteres ilegales se reportan solo para la parte confirmada, de
+modo que no se duplican al relexear.
+
+Uso (volcado de tokens):
+    python lexer/streaming.py bundle.js --chunk-size 1048576 --mmap
+"""
+import sys
+import os
+import codecs
+import mmap
+from contextlib import contextmanager
+
+# Asegurar que la carpeta lexer esté en sys.path para importar lexer.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import lexer as lexer_module
+if not hasattr(lexer_module, 'tokens'):
+    # `lexer` resolvió a la carpeta (paquete de espacio de nombres), no a lexer.py
+    from lexer import lexer as lexer_module
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+WHITESPACE = (' ', '\t', '\n', '\r')
+
+
+class StreamingLexer:
+    def __init__(self, source, chunk_size: int = DEFAULT_CHUNK_SIZE, base_lexer=None):
+        """`source` es un objeto con `read(n)` (archivo de texto o binario, `mmap`) o un `str`."""
+        self.source = source
+        self.chunk_size = chunk_size
+        self.lexer = (base_lexer or lexer_module.lexer).clone()
+        self.lexer.lineno = 1
+        self.lexer.lexerrorf = self._record_error
+        self._errors = []
+        self._decoder = None
+        self._tokens = None
+        # PLY consulta estos atributos en algunos mensajes de error
+        self.lineno = 1
+        self.lexpos = 0
+
+    @property
+    def names(self):
+        """`NameTable` del lexer interno (los nombres se internan al lexear cada bloque)."""
+        return self.lexer.names
+
+    @names.setter
+    def names(self, table):
+        self.lexer.names = table
+
+    # -----------------------------
+    # Lectura
+    # -----------------------------
+    def _read(self) -> str:
+        if isinstance(self.source, str):
+            data, self.source = self.source, ''
+            return data
+        data = self.source.read(self.chunk_size)
+        if not isinstance(data, (bytes, bytearray)):
+            return data
+        if self._decoder is None:
+            self._decoder = codecs.getincrementaldecoder('utf-8')()
+        text = self._decoder.decode(data, final=not data)
+        # un bloque puede terminar a mitad de un carácter multibyte y no producir texto
+        while not text and data:
+            data = self.source.read(self.chunk_size)
+            text = self._decoder.decode(data, final=not data)
+        return text
+
+    def _record_error(self, t):
+        self._errors.append((t.lexpos, t.value[0], t.lexer.lineno))
+        t.lexer.skip(1)
+
+    @staticmethod
+    def _safe_cut(text: str) -> int:
+        """Longitud del prefijo de `text` que se puede lexear sin partir un token ni un `//`."""
+        cut = max(text.rfind(ws) for ws in WHITESPACE) + 1
+        if cut == 0:
+            return 0
+        line_start = text.rfind('\n', 0, cut) + 1
+        comment = text.find('//', line_start, cut)
+        if comment != -1:
+            cut = comment
+        return cut
+
+    # -----------------------------
+    # Tokens
+    # -----------------------------
+    def tokens(self):
+        """Genera los tokens del fuente completo."""
+        lexer = self.lexer
+        pending = ''          # texto leído que aún no se ha confirmado
+        base = 0              # offset de pending[0] en el fuente
+        eof = False
+        comment_scan = None   # si pending empieza con `/*` abierto: desde dónde buscar el `*/`
+        while True:
+            if not eof:
+                data = self._read()
+                if data:
+                    pending += data
+                else:
+                    eof = True
+            if not pending:
+                if eof:
+                    break
+                continue
+
+            if eof:
+                cut = len(pending)
+            else:
+                min_cut = 1
+                if comment_scan is not None:
+                    close = pending.find('*/', comment_scan)
+                    if close == -1:
+                        comment_scan = max(2, len(pending) - 1)
+                        continue
+                    min_cut = close + 2
+                cut = self._safe_cut(pending)
+                if cut < min_cut:
+                    continue
+            comment_scan = None
+
+            lexer.input(pending[:cut])
+            self._errors = []
+            tokens = []
+            commit = cut
+            prev = None
+            while True:
+                tok = lexer.token()
+                if tok is None:
+                    break
+                if (not eof and prev is not None and prev.type == 'DIVIDE' and tok.type == 'TIMES'
+                        and tok.lexpos == prev.lexpos + 1):
+                    # `/*` sin cerrar dentro de la región
+                    tokens.pop()
+                    commit = prev.lexpos
+                    lexer.lineno = prev.lineno
+                    comment_scan = 2
+                    break
+                tokens.append(tok)
+                prev = tok
+
+            for lexpos, char, lineno in self._errors:
+                if lexpos < commit:
+                    lexer_module.report_illegal_char(char, lineno, base + lexpos)
+            for tok in tokens:
+                tok.lexpos += base
+                if tok.type == 'NUMBER':
+                    tok.end += base
+                yield tok
+
+            pending = pending[commit:]
+            base += commit
+            self.lineno = lexer.lineno
+            self.lexpos = base
+            if eof and comment_scan is None:
+                break
+
+    def token(self):
+        """Interfaz de PLY: siguiente token o `None` al final."""
+        if self._tokens is None:
+            self._tokens = self.tokens()
+        return next(self._tokens, None)
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+
+@contextmanager
+def open_source(path: str, use_mmap: bool = False):
+    """Abre `path` para `StreamingLexer`, opcionalmente mapeado en memoria."""
+    with open(path, 'rb') as fh:
+        if use_mmap and os.fstat(fh.fileno()).st_size > 0:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+        else:
+            yield fh
+
+
+def dump_tokens(source, out=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Escribe un token por línea (mismo formato que lexer/tests/test_lexer.py) y devuelve cuántos hubo."""
+    out = out or sys.stdout
+    count = 0
+    for tok in StreamingLexer(source, chunk_size):
+        out.write(f"Tipo: {tok.type:<12} Valor: {tok.value:<8} Línea: {tok.lineno}\n")
+        count += 1
+    return count
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Volcado de tokens por streaming')
+    arg_parser.add_argument('file', help='Archivo JS a tokenizar')
+    arg_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Tamaño de bloque en bytes')
+    arg_parser.add_argument('--mmap', action='store_true', help='Leer el archivo con mmap')
+    args = arg_parser.parse_args()
+
+    with open_source(args.file, args.mmap) as source:
+        dump_tokens(source, chunk_size=args.chunk_size)
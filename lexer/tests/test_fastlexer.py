@@ -0,0 +1,94 @@
+import sys
+import os
+import glob
+import random
+
+# Agregar el directorio padre (lexer) al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer
+from fastlexer import FastLexer
+from streaming import StreamingLexer
+
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Casos límite además de los ejemplos del repositorio
+CORPUS = [
+    "",
+    "   \t\r\n\n  ",
+    "var x = 10;\nlet y = 20;\nif (x + 5 > y && y != 0) { const z = y * 2 + 1; } else { y = 0; }\n",
+    "iff elsewhere var_1 _let const2 function return while for",
+    "a==b!=c<=d>=e<f>g=h&&i||j",
+    "a/b; c /* bloque\n de\n líneas */ / d; e // fin /* no abre\nf",
+    "x = 1 /* sin cerrar\n y = 2;",
+    "007 + 12345678901234567890 - 0",
+    "x @ y # z $ ñ é\n\x0c; !a | b & c",
+    "fin sin salto de línea   \t",
+    "// solo comentario",
+    "/**/*//**/",
+    "var ٣ = ٤٥;",
+]
+
+FRAGMENTS = ["var", "let", "x", "y1", "_z", "42", "0", " ", "\t", "\r\n", "\n\n", "+", "-", "*", "/",
+             "=", "==", "!=", "<", ">=", "&&", "||", "(", ")", "{", "}", ",", ";", "// c\n",
+             "/* a\nb */", "/*", "*/", "@", "!", "if", "else"]
+
+
+def js_files():
+    return sorted(glob.glob(os.path.join(repo_root, '**', '*.js'), recursive=True))
+
+
+def token_stream(lx, text):
+    lx.lineno = 1
+    lx.input(text)
+    out = []
+    while True:
+        tok = lx.token()
+        if not tok:
+            break
+        out.append((tok.type, tok.value, tok.lineno, tok.lexpos, getattr(tok, 'end', None)))
+    return out, lx.lineno
+
+
+def assert_same(text, capsys):
+    expected = token_stream(lexer.clone(), text)
+    ply_out = capsys.readouterr().out
+    got = token_stream(FastLexer(), text)
+    fast_out = capsys.readouterr().out
+    assert got == expected
+    # mismos mensajes de caracteres ilegales, en el mismo orden
+    assert fast_out == ply_out
+
+
+def test_corpus_matches_ply(capsys):
+    for text in CORPUS:
+        assert_same(text, capsys)
+    for path in js_files():
+        with open(path, encoding='utf8') as fh:
+            assert_same(fh.read(), capsys)
+
+
+def test_random_fragments_match_ply(capsys):
+    rng = random.Random(1234)
+    for _ in range(300):
+        assert_same(''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 60))), capsys)
+
+
+def test_lexpos_and_lineno_after_input():
+    # como hace IncrementalDocument: relexear desde una posición intermedia
+    text = "var a = 1;\nb = a;\n"
+    lx = FastLexer()
+    lx.input(text)
+    lx.lexpos = text.index('b')
+    lx.lineno = 2
+    tok = lx.token()
+    assert (tok.type, tok.value, tok.lineno, tok.lexpos) == ('ID', 'b', 2, 11)
+
+
+def test_streaming_with_fast_backend(capsys):
+    text = CORPUS[5] * 30 + CORPUS[8]
+    expected = [(t.type, t.value, t.lineno, t.lexpos) for t in StreamingLexer(text, 17)]
+    ply_out = capsys.readouterr().out
+    got = [(t.type, t.value, t.lineno, t.lexpos) for t in StreamingLexer(text, 17, base_lexer=FastLexer())]
+    assert got == expected
+    assert capsys.readouterr().out == ply_out
@@ -0,0 +1,62 @@
+import sys
+import os
+import io
+
+# Agregar el directorio padre (lexer) al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer
+from streaming import StreamingLexer, dump_tokens, open_source
+
+code = """var x = 10; /* comentario
+de varias líneas con // dentro, * y / */ let y = 20;
+// comentario de línea /* que no abre bloque
+if (x + 5 >= y && y != 0 || x<=3) { const z = y * 2 + 1; } else { y = 0; }
+a/b; c /* c */ / d; e //fin
+f = 007;*//**/g;
+"""
+
+
+def full_tokens(text):
+    lx = lexer.clone()
+    lx.lineno = 1
+    lx.input(text)
+    out = []
+    while True:
+        tok = lx.token()
+        if not tok:
+            break
+        out.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+    return out
+
+
+def stream_tokens(source, chunk_size):
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in StreamingLexer(source, chunk_size)]
+
+
+def test_stream_matches_ply_for_every_chunk_size():
+    expected = full_tokens(code)
+    for chunk_size in range(1, 48):
+        assert stream_tokens(io.StringIO(code), chunk_size) == expected
+        # en binario un carácter multibyte (í) puede quedar partido entre bloques
+        assert stream_tokens(io.BytesIO(code.encode('utf8')), chunk_size) == expected
+
+
+def test_unterminated_comment_and_illegal_chars(capsys):
+    text = "var a = 1;\nb @ c;\n/* sin cerrar\nvar d = 2;\n"
+    expected = full_tokens(text)
+    full_output = capsys.readouterr().out
+    assert stream_tokens(io.StringIO(text), 3) == expected
+    # el error de '@' se reporta una sola vez aunque la región se relexee
+    assert capsys.readouterr().out == full_output
+    assert full_output.count("'@'") == 1
+
+
+def test_dump_tokens_from_mmap(tmp_path):
+    path = tmp_path / 'fuente.js'
+    path.write_text(code, encoding='utf8')
+    out = io.StringIO()
+    with open_source(str(path), use_mmap=True) as source:
+        count = dump_tokens(source, out=out, chunk_size=16)
+    assert count == len(full_tokens(code))
+    assert out.getvalue().splitlines()[0].split() == ['Tipo:', 'VAR', 'Valor:', 'var', 'Línea:', '1']
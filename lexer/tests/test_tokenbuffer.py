@@ -0,0 +1,74 @@
+import sys
+import os
+
+# Agregar el directorio padre (lexer) y la raíz del proyecto al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import pytest
+
+from fastlexer import FastLexer
+from tokenbuffer import TokenBuffer
+
+code = """var x = 10; /* comentario
+de varias líneas */ let y = 20;
+if (x + 5 >= y && y != 0 || x<=3) { const z = y * 2 + 1; } else { y = 0; }
+a/b; x = 007 + 12345678901234567890; // fin
+var ñandú = x;
+"""
+
+
+def tokens(lexer):
+    lexer.lineno = 1
+    lexer.input(code)
+    return [(t.type, t.value, t.lineno, t.lexpos, getattr(t, 'end', None)) for t in iter(lexer.token, None)]
+
+
+def test_round_trip_and_mmap(tmp_path, capsys):
+    expected = tokens(FastLexer())
+    capsys.readouterr()
+    buffer = TokenBuffer.from_source(code)
+    # "ñ" y "ú" son ilegales: se informan al construir el búfer, no al leerlo
+    assert capsys.readouterr().out.count("Caracter ilegal") == 2
+    assert len(buffer) == len(expected)
+    assert [(t.type, t.value, t.lineno, t.lexpos) for t in buffer] == [e[:4] for e in expected]
+    # cada valor distinto una sola vez; enteros y texto no se mezclan
+    assert len(buffer.table) == len(set(e[1] for e in expected))
+    big = [t for t in buffer if t.type == 'NUMBER'][-1]
+    assert big.value == 12345678901234567890 and code[big.lexpos:big.end] == str(big.value)
+
+    loaded = TokenBuffer.load(buffer.to_bytes())
+    assert isinstance(loaded.starts, memoryview)
+    assert [(t.type, t.value, t.end) for t in loaded] == [(t.type, t.value, t.end) for t in buffer]
+
+    path = str(tmp_path / 'programa.tokb')
+    buffer.save(path)
+    with TokenBuffer.open(path) as mapped:
+        assert mapped.source_length == len(code)
+        assert mapped.to_bytes() == buffer.to_bytes()
+        assert [t.value for t in mapped.lexer()] == [e[1] for e in expected]
+    assert capsys.readouterr().out == ''
+
+    with pytest.raises(ValueError):
+        TokenBuffer.load(b'nada')
+
+
+def test_parser_consumes_buffer(tmp_path, capsys):
+    from analisis_semantico.semantic import get_parser_and_lexer, parse_code
+    from analisis_semantico.cache import tree_to_data
+
+    source = "var x = 10;\nlet y = x * 2;\n{ const z = y + x; }\nif (x > y) x = y; else { y = 0; }\n"
+    parser_obj, _ = get_parser_and_lexer()
+    expected, errors = parse_code(parser_obj, source)
+    path = str(tmp_path / 'programa.tokb')
+    TokenBuffer.from_source(source, 'ply').save(path)
+    with TokenBuffer.open(path) as buffer:
+        tree, buffer_errors = parse_code(parser_obj, lexer_obj=buffer.lexer())
+    assert tree_to_data(tree) == tree_to_data(expected)
+    assert buffer_errors == errors == []
+    # los identificadores salen internados: un solo objeto por nombre
+    declared = tree.children[0].children[0].value.name
+    used = tree.children[0].children[1].children[0].children[0].value
+    assert declared == used == 'x' and declared is used
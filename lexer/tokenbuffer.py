@@ -0,0 +1,317 @@
+"""Búfer de tokens compacto: arrays tipados, guardable en disco y legible con `mmap`.
+
+PLY crea un `LexToken` por token y nadie conserva el flujo: cada herramienta que
+necesita los tokens vuelve a lexear. `TokenBuffer` los guarda en columnas
+paralelas de `array` (tipo, offset de inicio, longitud, línea e índice del
+valor) más una tabla de valores con cada cadena o número distinto una sola vez.
+Un token ocupa 21 bytes en lugar de un objeto de Python.
+
+`BufferLexer` lo ofrece con la interfaz de un lexer (`token()`, `input`,
+`clone`), así que `parser.parse(lexer=...)` o `parse_code` lo consumen igual que
+al lexer de PLY, sin volver a lexear.
+
+Formato en disco (little-endian, versión 1):
+
+    cabecera (32 bytes): b'TOKB', versión u8, 3 bytes a 0, nº de tokens u64,
+                         nº de tipos u32, nº de valores u32, longitud del fuente u64
+    kinds    u8  × n   índice en la tabla de tipos
+    starts   u64 × n   offset del token en el fuente (`lexpos`)
+    lengths  u32 × n   longitud del lexema
+    lines    u32 × n   línea (`lineno`)
+    values   u32 × n   índice en la tabla de valores
+    tipos:   por tipo, longitud u8 + nombre ASCII
+    valores: por valor, clase u8 (0: texto, 1: entero en decimal) + longitud u32 + UTF-8
+
+Cada columna empieza en un offset múltiplo de 8. `TokenBuffer.load` (y `open`
+con `mmap`) crea las columnas como `memoryview` sobre los bytes leídos, sin
+copiarlas; solo las tablas de tipos y valores se decodifican.
+
+Uso:
+    buffer = TokenBuffer.from_source(code)
+    buffer.save('programa.tokb')
+    with TokenBuffer.open('programa.tokb') as buffer:
+        tree, errors = parse_code(parser, lexer_obj=buffer.lexer())
+
+    python lexer/tokenbuffer.py programa.js -o programa.tokb
+    python lexer/tokenbuffer.py programa.tokb --dump
+"""
+import sys
+import os
+import mmap
+import struct
+from array import array
+from typing import Dict, List, Optional
+
+# Asegurar que la carpeta lexer esté en sys.path para importar lexer.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import lexer as lexer_module
+if not hasattr(lexer_module, 'tokens'):
+    # `lexer` resolvió a la carpeta (paquete de espacio de nombres), no a lexer.py
+    from lexer import lexer as lexer_module
+from fastlexer import FastLexer, Token
+
+MAGIC = b'TOKB'
+VERSION = 1
+HEADER = struct.Struct('<4sB3xQIIQ')
+# (atributo, código de `array`) de cada columna, en el orden del archivo
+COLUMNS = (('kinds', 'B'), ('starts', 'Q'), ('lengths', 'I'), ('lines', 'I'), ('values', 'I'))
+VALUE_STR, VALUE_INT = 0, 1
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class TokenBuffer:
+    """Tokens en columnas. Se construye con `append`/`extend` o se lee con `load`/`open`."""
+
+    def __init__(self, types: Optional[List[str]] = None):
+        # tipos de token; el índice es el valor de `kinds`
+        self.types: List[str] = list(types if types is not None else lexer_module.tokens)
+        self.kinds = array('B')
+        self.starts = array('Q')
+        self.lengths = array('I')
+        self.lines = array('I')
+        self.values = array('I')
+        # tabla de valores: cada cadena o número distinto una vez
+        self.table: List = []
+        self.source_length = 0
+        self._kind_index: Dict[str, int] = {t: i for i, t in enumerate(self.types)}
+        self._value_index: Dict = {}
+        self._mmap = None
+        self._views: List[memoryview] = []
+
+    # -----------------------------
+    # Construcción
+    # -----------------------------
+    def append(self, type: str, value, lineno: int, lexpos: int, length: int):
+        kind = self._kind_index.get(type)
+        if kind is None:
+            kind = self._kind_index[type] = len(self.types)
+            self.types.append(type)
+        index = self._value_index.get(value)
+        if index is None:
+            index = len(self.table)
+            self._value_index[value] = index
+            self.table.append(value)
+        self.kinds.append(kind)
+        self.starts.append(lexpos)
+        self.lengths.append(length)
+        self.lines.append(lineno)
+        self.values.append(index)
+
+    def extend(self, tokens):
+        """Añade los tokens de un lexer (`LexToken` de PLY o `Token` de `FastLexer`)."""
+        append = self.append
+        for tok in tokens:
+            if tok.type == 'NUMBER':
+                length = tok.end - tok.lexpos
+            else:
+                length = len(tok.value)
+            append(tok.type, tok.value, tok.lineno, tok.lexpos, length)
+        return self
+
+    @classmethod
+    def from_source(cls, code: str, lexer_backend: str = 'fast'):
+        """Lexea `code` una vez y guarda sus tokens (los caracteres ilegales se informan como siempre)."""
+        if lexer_backend == 'fast':
+            lexer = FastLexer()
+        else:
+            lexer = lexer_module.lexer.clone()
+            lexer.names = None
+        lexer.lineno = 1
+        lexer.input(code)
+        buffer = cls().extend(iter(lexer.token, None))
+        buffer.source_length = len(code)
+        return buffer
+
+    # -----------------------------
+    # Lectura
+    # -----------------------------
+    def __len__(self):
+        return len(self.kinds)
+
+    def token(self, i: int) -> Token:
+        start = self.starts[i]
+        tok = Token(self.types[self.kinds[i]], self.table[self.values[i]], self.lines[i], start)
+        tok.end = start + self.lengths[i]
+        return tok
+
+    def __iter__(self):
+        return (self.token(i) for i in range(len(self)))
+
+    def lexer(self, names=None) -> 'BufferLexer':
+        return BufferLexer(self, names)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes que ocupan las columnas (sin la tabla de valores)."""
+        return sum(len(getattr(self, name)) * getattr(self, name).itemsize for name, _ in COLUMNS)
+
+    # -----------------------------
+    # Disco
+    # -----------------------------
+    def to_bytes(self) -> bytes:
+        n = len(self)
+        out = bytearray(HEADER.pack(MAGIC, VERSION, n, len(self.types), len(self.table), self.source_length))
+        for name, code in COLUMNS:
+            out += bytes(_align(len(out)) - len(out))
+            column = getattr(self, name)
+            if isinstance(column, memoryview):
+                out += column.tobytes()
+            else:
+                if sys.byteorder != 'little':
+                    column = array(code, column)
+                    column.byteswap()
+                out += column.tobytes()
+        for type_name in self.types:
+            data = type_name.encode('ascii')
+            out += struct.pack('<B', len(data)) + data
+        for value in self.table:
+            if value.__class__ is int:
+                data = str(value).encode('ascii')
+                out += struct.pack('<BI', VALUE_INT, len(data)) + data
+            else:
+                data = value.encode('utf8')
+                out += struct.pack('<BI', VALUE_STR, len(data)) + data
+        return bytes(out)
+
+    def save(self, path: str):
+        with open(path, 'wb') as fh:
+            fh.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, data) -> 'TokenBuffer':
+        """Lee el formato desde `bytes`, `bytearray`, `memoryview` o `mmap`; las columnas no se copian."""
+        view = memoryview(data)
+        if len(view) < HEADER.size or bytes(view[:4]) != MAGIC:
+            raise ValueError("No es un búfer de tokens")
+        _, version, n, n_types, n_values, source_length = HEADER.unpack_from(view)
+        if version != VERSION:
+            raise ValueError(f"Versión de búfer de tokens no soportada: {version}")
+        buffer = cls([])
+        buffer.source_length = source_length
+        offset = HEADER.size
+        for name, code in COLUMNS:
+            offset = _align(offset)
+            size = n * struct.calcsize(code)
+            if offset + size > len(view):
+                raise ValueError("Búfer de tokens truncado")
+            column = view[offset:offset + size].cast(code)
+            if sys.byteorder != 'little' and code != 'B':
+                column = array(code, column)
+                column.byteswap()
+            else:
+                buffer._views.append(column)
+            setattr(buffer, name, column)
+            offset += size
+        types = []
+        for _ in range(n_types):
+            length = view[offset]
+            types.append(str(view[offset + 1:offset + 1 + length], 'ascii'))
+            offset += 1 + length
+        table = []
+        for _ in range(n_values):
+            tag, length = struct.unpack_from('<BI', view, offset)
+            offset += 5
+            text = str(view[offset:offset + length], 'utf8')
+            table.append(int(text) if tag == VALUE_INT else text)
+            offset += length
+        buffer.types = types
+        buffer.table = table
+        buffer._kind_index = {t: i for i, t in enumerate(types)}
+        buffer._value_index = {v: i for i, v in enumerate(table)}
+        return buffer
+
+    @classmethod
+    def open(cls, path: str) -> 'TokenBuffer':
+        """Mapea `path` en memoria y lo lee con `load`; cerrar con `close()` o usar `with`."""
+        with open(path, 'rb') as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            buffer = cls.load(mm)
+        except Exception:
+            mm.close()
+            raise
+        buffer._mmap = mm
+        return buffer
+
+    def close(self):
+        """Suelta las vistas sobre el archivo mapeado (el búfer deja de poder leerse)."""
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BufferLexer:
+    """Lexer de solo lectura sobre un `TokenBuffer`, para `parser.parse(lexer=...)`.
+
+    Con una `NameTable` en `names` (la instala `parse_code`) los identificadores
+    se internan como en los lexers normales.
+    """
+
+    def __init__(self, buffer: TokenBuffer, names=None):
+        self.buffer = buffer
+        self.names = names
+        self.lineno = 1
+        self.lexpos = 0
+        self._index = 0
+
+    def input(self, data=None):
+        """Vuelve al primer token; el texto se ignora (los tokens ya están en el búfer)."""
+        self._index = 0
+        self.lineno = 1
+        self.lexpos = 0
+
+    def clone(self):
+        return BufferLexer(self.buffer, self.names)
+
+    def token(self):
+        i = self._index
+        buffer = self.buffer
+        if i >= len(buffer):
+            self.lexpos = buffer.source_length
+            return None
+        self._index = i + 1
+        tok = buffer.token(i)
+        if self.names is not None and tok.type == 'ID':
+            tok.value = self.names.intern(tok.value)
+        self.lineno = tok.lineno
+        self.lexpos = tok.end
+        return tok
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Búfer de tokens en disco')
+    arg_parser.add_argument('file', help='Archivo JS a tokenizar o búfer .tokb (con --dump)')
+    arg_parser.add_argument('-o', '--output', default=None, help='Guardar el búfer en este archivo')
+    arg_parser.add_argument('--lexer', choices=('ply', 'fast'), default='fast', help='Lexer con que se tokeniza')
+    arg_parser.add_argument('--dump', action='store_true', help='Mostrar los tokens de un búfer guardado')
+    args = arg_parser.parse_args()
+
+    if args.dump:
+        with TokenBuffer.open(args.file) as buffer:
+            for tok in buffer:
+                print(f"Tipo: {tok.type:<12} Valor: {tok.value:<8} Línea: {tok.lineno}")
+        sys.exit(0)
+
+    with open(args.file, 'r', encoding='utf8') as fh:
+        buffer = TokenBuffer.from_source(fh.read(), args.lexer)
+    output = args.output or os.path.splitext(args.file)[0] + '.tokb'
+    buffer.save(output)
+    print(f"{len(buffer)} tokens ({buffer.nbytes} bytes en columnas, {len(buffer.table)} valores) -> {output}")
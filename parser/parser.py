@@ -1,12 +1,16 @@
 # sintactico_corregido.py
 import sys
 import os
+import hashlib
+import importlib.util
+import threading
 
 # Agregar la carpeta lexer al path
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lexer'))
 
 import ply.yacc as yacc
 from lexer import tokens, lexer
+from comun import diagnostics
 from colorama import Fore, Style, init
 
 # Inicializa colorama (para Windows también funciona)
@@ -15,44 +19,160 @@ init(autoreset=True)
 # -----------------------------
 # Clase Node (nodo del AST)
 # -----------------------------
+# Las hojas comparten esta tupla vacía en lugar de tener cada una su propia lista
+EMPTY_CHILDREN = ()
+
+# `start + 1`, `end + 1` y `lineno` van empaquetados en un solo entero por nodo
+# (offsets >= -1 y menores que 2**40 - 1)
+_SPAN_BITS = 40
+_SPAN_MASK = (1 << _SPAN_BITS) - 1
+
+
 class Node:
-    def __init__(self, type, children=None, value=None):
+    """Nodo compacto del AST.
+
+    Usa `__slots__` (sin `__dict__` por instancia) y las hojas comparten
+    `EMPTY_CHILDREN`. Los nodos de aridad fija guardan sus hijos en una tupla;
+    solo `statement_list` (o un nodo creado con una lista, aunque esté vacía)
+    admite `append`. `start`/`end` son offsets
+    [start, end) en el fuente tomados de los tokens de PLY y `lineno` la línea
+    donde empieza el nodo; valen -1/0 en nodos construidos a mano.
+
+    Las tres posiciones se guardan juntas en `_span`: un solo
+    entero de 40 bytes en lugar de tres de 32, que en un archivo grande casi
+    nunca son enteros pequeños compartidos. Se leen y asignan como atributos.
+    """
+    __slots__ = ('type', 'children', 'value', '_span')
+
+    def __init__(self, type, children=None, value=None, start=-1, end=-1, lineno=0):
         self.type = type
-        self.children = children if children else []
+        self.children = children if children is not None else EMPTY_CHILDREN
         self.value = value
+        self._span = (start + 1) | ((end + 1) << _SPAN_BITS) | (lineno << (2 * _SPAN_BITS))
+
+    @property
+    def start(self):
+        return (self._span & _SPAN_MASK) - 1
+
+    @start.setter
+    def start(self, start):
+        self._span = (self._span & ~_SPAN_MASK) | (start + 1)
+
+    @property
+    def end(self):
+        return ((self._span >> _SPAN_BITS) & _SPAN_MASK) - 1
+
+    @end.setter
+    def end(self, end):
+        self._span = (self._span & ~(_SPAN_MASK << _SPAN_BITS)) | ((end + 1) << _SPAN_BITS)
+
+    @property
+    def lineno(self):
+        return self._span >> (2 * _SPAN_BITS)
+
+    @lineno.setter
+    def lineno(self, lineno):
+        self._span = (self._span & ((1 << (2 * _SPAN_BITS)) - 1)) | (lineno << (2 * _SPAN_BITS))
+
+    def move(self, shift, line_shift=0):
+        """Desplaza la posición del nodo `shift` caracteres y `line_shift` líneas.
+
+        Un nodo sin posición (`start == -1`) no se toca: sus campos valen 0 y un
+        desplazamiento negativo se llevaría bits de un campo a otro.
+        """
+        if self._span & _SPAN_MASK:
+            self._span += shift + (shift << _SPAN_BITS) + (line_shift << (2 * _SPAN_BITS))
 
     def __repr__(self):
         # Evita la recursión infinita y duplicaciones al imprimir
         return f"<Node {self.type} {self.value if self.value else ''}>"
 
-    def pretty(self, level=0, last=True, prefix=""):
-        """Imprime el árbol en consola con colores y líneas jerárquicas."""
-        # Asignar colores por tipo de nodo
-        color_map = {
-            "program": Fore.CYAN + Style.BRIGHT,
-            "statement_list": Fore.MAGENTA + Style.BRIGHT,
-            "declaration": Fore.GREEN + Style.BRIGHT,
-            "assignment": Fore.YELLOW + Style.BRIGHT,
-            "if": Fore.BLUE + Style.BRIGHT,
-            "if-else": Fore.BLUE + Style.BRIGHT,
-            "binary_op": Fore.RED + Style.BRIGHT,
-            "number": Fore.WHITE + Style.BRIGHT,
-            "identifier": Fore.WHITE + Style.BRIGHT,
-            "expression_statement": Fore.CYAN + Style.BRIGHT
-        }
-        color = color_map.get(self.type, Fore.WHITE)
+    def pretty(self, level=0, last=True, prefix="", color=True):
+        """Devuelve el árbol como texto con líneas jerárquicas (y colores si `color`)."""
+        return "".join(tree_lines(self, color, last, prefix))
 
-        # Dibujar líneas jerárquicas
-        branch = "└── " if last else "├── "
-        line = prefix + branch + color + f"<{self.type}> " + (str(self.value) if self.value else "")
-        ret = line + Style.RESET_ALL + "\n"
 
-        # Ajustar prefijo para los hijos
-        new_prefix = prefix + ("    " if last else "│   ")
+class Declared(tuple):
+    """Valor de un nodo `declaration`: `(kind, name)`.
+
+    El tipo (`var`, `let`, `const`) y el nombre van por separado, así que nadie
+    tiene que partir una cadena `"var x"`; `str()` la sigue dando para mostrar el
+    árbol y para los formatos de salida.
+    """
+    __slots__ = ()
+
+    def __new__(cls, kind, name):
+        return tuple.__new__(cls, (kind, name))
+
+    @property
+    def kind(self):
+        return self[0]
+
+    @property
+    def name(self):
+        return self[1]
 
-        for i, child in enumerate(self.children):
-            ret += child.pretty(level + 1, i == len(self.children) - 1, new_prefix)
-        return ret
+    @classmethod
+    def parse(cls, text):
+        """Inversa de `str()`: `"var x"` -> `Declared('var', 'x')`."""
+        kind, name = text.split()[:2]
+        return cls(DECLARATION_KINDS.get(kind, kind), name)
+
+    def __str__(self):
+        return f"{self[0]} {self[1]}"
+
+    def __repr__(self):
+        return f"Declared({self[0]!r}, {self[1]!r})"
+
+
+# Cada tipo de declaración como objeto único (el lexer da una cadena nueva por token)
+DECLARATION_KINDS = {'var': 'var', 'let': 'let', 'const': 'const'}
+# Lo mismo para los operadores de dos caracteres (los de uno ya los comparte CPython)
+OPERATORS = {op: op for op in ('==', '!=', '<=', '>=', '<', '>', '&&', '||', '+', '-', '*', '/')}
+
+
+# Colores por tipo de nodo para `pretty`
+NODE_COLORS = {
+    "program": Fore.CYAN + Style.BRIGHT,
+    "statement_list": Fore.MAGENTA + Style.BRIGHT,
+    "declaration": Fore.GREEN + Style.BRIGHT,
+    "assignment": Fore.YELLOW + Style.BRIGHT,
+    "if": Fore.BLUE + Style.BRIGHT,
+    "if-else": Fore.BLUE + Style.BRIGHT,
+    "binary_op": Fore.RED + Style.BRIGHT,
+    "number": Fore.WHITE + Style.BRIGHT,
+    "identifier": Fore.WHITE + Style.BRIGHT,
+    "expression_statement": Fore.CYAN + Style.BRIGHT
+}
+
+
+def tree_lines(root, color=True, last=True, prefix=""):
+    """Genera las líneas de `Node.pretty` en preorden, sin recursión.
+
+    Cada línea se produce una sola vez y en orden, así que el coste es lineal en
+    el tamaño de la salida y se puede escribir según se genera.
+    """
+    colors = NODE_COLORS
+    reset = Style.RESET_ALL
+    default = Fore.WHITE
+    stack = [(root, last, prefix)]
+    while stack:
+        node, is_last, pre = stack.pop()
+        # Dibujar líneas jerárquicas
+        branch = "└── " if is_last else "├── "
+        text = f"<{node.type}> " + (str(node.value) if node.value else "")
+        if color:
+            yield pre + branch + colors.get(node.type, default) + text + reset + "\n"
+        else:
+            yield pre + branch + text + "\n"
+        children = node.children
+        if children:
+            # Ajustar prefijo para los hijos
+            child_prefix = pre + ("    " if is_last else "│   ")
+            n = len(children)
+            stack.append((children[-1], True, child_prefix))
+            for i in range(n - 2, -1, -1):
+                stack.append((children[i], False, child_prefix))
 
 # -----------------------------
 # Precedencia de operadores
@@ -64,20 +184,31 @@ precedence = (
     ('left', 'TIMES', 'DIVIDE'),
 )
 
+# -----------------------------
+# Posiciones en el fuente
+# -----------------------------
+def _token_end(p, n):
+    """Offset justo después del token `n` (NUMBER guarda `end` porque su valor ya es int)."""
+    tok = p.slice[n]
+    if tok.type == 'NUMBER':
+        return tok.end
+    return tok.lexpos + len(tok.value)
+
 # -----------------------------
 # Gramática Principal
 # -----------------------------
 def p_program(p):
     """program : statement_list"""
-    p[0] = Node("program", [p[1]])
+    p[0] = Node("program", (p[1],), start=p[1].start, end=p[1].end, lineno=p[1].lineno)
 
 def p_statement_list(p):
     """statement_list : statement
                       | statement_list statement"""
     if len(p) == 2:
-        p[0] = Node("statement_list", [p[1]])
+        p[0] = Node("statement_list", [p[1]], start=p[1].start, end=p[1].end, lineno=p[1].lineno)
     else:
         p[1].children.append(p[2])
+        p[1].end = p[2].end
         p[0] = p[1]
 
 # -----------------------------
@@ -92,7 +223,7 @@ def p_statement(p):
 
 def p_expression_stmt(p):
     """expression_stmt : expression SEMICOLON"""
-    p[0] = Node("expression_statement", [p[1]])
+    p[0] = Node("expression_statement", (p[1],), start=p[1].start, end=p.lexpos(2) + 1, lineno=p[1].lineno)
 
 def p_assignment_stmt(p):
     """assignment_stmt : VAR ID ASSIGN expression SEMICOLON
@@ -100,21 +231,29 @@ def p_assignment_stmt(p):
                        | CONST ID ASSIGN expression SEMICOLON
                        | ID ASSIGN expression SEMICOLON"""
     if len(p) == 6:
-        p[0] = Node("declaration", children=[p[4]], value=f"{p[1]} {p[2]}")
+        p[0] = Node("declaration", children=(p[4],), value=Declared(DECLARATION_KINDS[p[1]], p[2]),
+                    start=p.lexpos(1), end=p.lexpos(5) + 1, lineno=p.lineno(1))
     else:
-        p[0] = Node("assignment", children=[p[3]], value=p[1])
+        p[0] = Node("assignment", children=(p[3],), value=p[1],
+                    start=p.lexpos(1), end=p.lexpos(4) + 1, lineno=p.lineno(1))
 
 def p_block_stmt(p):
     """block_stmt : LBRACE statement_list RBRACE"""
+    # el bloque abarca también las llaves
     p[0] = p[2]
+    p[0].start = p.lexpos(1)
+    p[0].end = p.lexpos(3) + 1
+    p[0].lineno = p.lineno(1)
 
 def p_if_stmt(p):
     """if_stmt : IF LPAREN expression RPAREN statement
                | IF LPAREN expression RPAREN statement ELSE statement"""
     if len(p) == 6:
-        p[0] = Node("if", children=[p[3], p[5]], value="")
+        p[0] = Node("if", children=(p[3], p[5]), value="",
+                    start=p.lexpos(1), end=p[5].end, lineno=p.lineno(1))
     else:
-        p[0] = Node("if-else", children=[p[3], p[5], p[7]], value="")
+        p[0] = Node("if-else", children=(p[3], p[5], p[7]), value="",
+                    start=p.lexpos(1), end=p[7].end, lineno=p.lineno(1))
 
 # -----------------------------
 # Expresiones
@@ -126,7 +265,8 @@ def p_expression_binop(p):
                   | expression DIVIDE expression
                   | expression REL_OP expression
                   | expression LOGIC_OP expression"""
-    p[0] = Node("binary_op", children=[p[1], p[3]], value=p[2])
+    p[0] = Node("binary_op", children=(p[1], p[3]), value=OPERATORS.get(p[2], p[2]),
+                start=p[1].start, end=p[3].end, lineno=p[1].lineno)
 
 def p_expression_group(p):
     """expression : LPAREN expression RPAREN"""
@@ -136,23 +276,244 @@ def p_expression_terminals(p):
     """expression : NUMBER
                   | ID"""
     if p.slice[1].type == 'NUMBER':
-        p[0] = Node("number", value=p[1])
+        p[0] = Node("number", value=p[1], start=p.lexpos(1), end=_token_end(p, 1), lineno=p.lineno(1))
+    else:
+        p[0] = Node("identifier", value=p[1], start=p.lexpos(1), end=_token_end(p, 1), lineno=p.lineno(1))
+
+# -----------------------------
+# Recuperación de errores (modo pánico)
+# -----------------------------
+# Tras un error PLY desapila estados hasta poder desplazar `error` y descarta
+# tokens hasta uno que pueda seguirle: `;` (fin de sentencia), `{` (se parsea el
+# bloque que sigue) o `}` (cierre del bloque en curso).
+def p_statement_error(p):
+    """statement : error SEMICOLON"""
+    p[0] = Node("error", start=p.lexpos(1), end=p.lexpos(2) + 1, lineno=p.lineno(1))
+
+def p_statement_error_block(p):
+    """statement : error block_stmt"""
+    p[0] = Node("error", (p[2],), start=p.lexpos(1), end=p[2].end, lineno=p.lineno(1))
+
+def p_block_stmt_error(p):
+    """block_stmt : LBRACE error RBRACE
+                  | LBRACE statement_list error RBRACE"""
+    n = len(p) - 2
+    error = Node("error", start=p.lexpos(n), end=p.lexpos(n + 1), lineno=p.lineno(n))
+    if n == 2:
+        p[0] = Node("statement_list", [error])
     else:
-        p[0] = Node("identifier", value=p[1])
+        p[0] = p[2]
+        p[0].children.append(error)
+    p[0].start = p.lexpos(1)
+    p[0].end = p.lexpos(n + 1) + 1
+    p[0].lineno = p.lineno(1)
 
 # -----------------------------
 # Manejo de errores
 # -----------------------------
+class SyntaxErrorInfo:
+    """Error de sintaxis estructurado (token inesperado o fin de archivo)."""
+    __slots__ = ('message', 'lineno', 'lexpos', 'token_type', 'value', 'code')
+
+    def __init__(self, message, lineno=None, lexpos=None, token_type=None, value=None, code=None):
+        self.message = message
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.token_type = token_type
+        self.value = value
+        self.code = code or ('P002' if token_type is None else 'P001')
+
+    @classmethod
+    def from_token(cls, p):
+        if p is None:
+            return cls(diagnostics.MESSAGES['P002'], code='P002')
+        return cls(f"Error de sintaxis en '{p.value}' (tipo: {p.type}) en la línea {p.lineno}",
+                   p.lineno, p.lexpos, p.type, p.value, 'P001')
+
+    def report(self):
+        """Entrega el error al motor de diagnósticos activo."""
+        if self.code == 'P002':
+            return diagnostics.report('P002')
+        return diagnostics.report(self.code, line=self.lineno, offset=self.lexpos,
+                                  value=self.value, token=self.token_type)
+
+    def to_dict(self):
+        return {"message": self.message, "lineno": self.lineno, "lexpos": self.lexpos,
+                "token": self.token_type, "value": self.value, "code": self.code}
+
+    def __repr__(self):
+        return f"SyntaxErrorInfo({self.message!r})"
+
+
+# errores de la llamada a `parse_with_errors` en curso en este hilo (None: solo diagnósticos)
+_recovery = threading.local()
+
+
 def p_error(p):
-    if p:
-        print(f"❌ Error de sintaxis en '{p.value}' (tipo: {p.type}) en la línea {p.lineno}")
-    else:
-        print("❌ Error de sintaxis: fin de archivo inesperado")
+    info = SyntaxErrorInfo.from_token(p)
+    errors = getattr(_recovery, 'errors', None)
+    if errors is not None:
+        errors.append(info)
+    # al recoger errores solo se avisa a un motor instalado explícitamente (el de por defecto imprime)
+    if errors is None or diagnostics.current() is not None:
+        info.report()
+
+
+def _symbol_span(symbol):
+    """`(start, end, lineno)` de un símbolo de la pila de PLY, o None si no se conoce."""
+    value = symbol.value
+    if isinstance(value, Node):
+        return (value.start, value.end, value.lineno) if value.start >= 0 else None
+    lexpos = getattr(symbol, 'lexpos', None)
+    if lexpos is None:
+        return None
+    if getattr(value, 'lexpos', None) is not None:
+        # el token `error` de PLY lleva como valor el token que lo provocó
+        return _symbol_span(value)
+    # NUMBER guarda dónde acaba el lexema: su valor ya es un int
+    end = getattr(symbol, 'end', None)
+    return lexpos, end if end is not None else lexpos + len(str(value)), symbol.lineno
+
+
+def _salvage(parser_obj, errors=()):
+    """Tras un fin de archivo inesperado PLY abandona el parseo; se conservan las
+    sentencias completas de nivel superior que quedaron en su pila y lo que queda
+    detrás (la sentencia sin terminar) pasa a ser un nodo `error`.
+
+    Si PLY ya descartó todos esos tokens, el nodo `error` toma la posición de los
+    tokens de `errors` que lo provocaron.
+    """
+    symstack = getattr(parser_obj, 'symstack', None) or []
+    statements = []
+    rest = symstack[1:]
+    if rest and isinstance(rest[0].value, Node) and rest[0].value.type == 'statement_list':
+        statements = list(rest[0].value.children)
+        rest = rest[1:]
+    spans = [span for span in map(_symbol_span, rest) if span is not None]
+    if not spans:
+        after = statements[-1].end if statements else 0
+        spans = [(e.lexpos, e.lexpos + len(str(e.value)), e.lineno)
+                 for e in errors if e.lexpos is not None and e.lexpos >= after]
+    error_span = {}
+    if spans:
+        error_span = dict(start=spans[0][0], end=max(end for _, end, _ in spans), lineno=spans[0][2])
+    statements.append(Node("error", **error_span))
+    positioned = [node for node in statements if node.start >= 0]
+    span = {}
+    if positioned:
+        span = dict(start=positioned[0].start, end=positioned[-1].end, lineno=positioned[0].lineno)
+    return Node("program", (Node("statement_list", statements, **span),), **span)
+
+
+def parse_with_errors(parser_obj=None, data=None, lexer=None, tokenfunc=None):
+    """Parsea con recuperación de errores y devuelve `(tree, errores)`.
+
+    Los errores se devuelven como `SyntaxErrorInfo` en lugar de imprimirse. El
+    árbol contiene un nodo `error` por cada zona descartada y, si hubo errores,
+    nunca es None.
+    """
+    if parser_obj is None:
+        parser_obj = globals().get('parser') or __getattr__('parser')
+    errors = []
+    previous = getattr(_recovery, 'errors', None)
+    _recovery.errors = errors
+    try:
+        tree = parser_obj.parse(data, lexer=lexer, tokenfunc=tokenfunc)
+    finally:
+        _recovery.errors = previous
+    if tree is None and errors:
+        tree = _salvage(parser_obj, errors)
+    return tree, errors
 
 # -----------------------------
 # Construir el parser
 # -----------------------------
-parser = yacc.yacc()
+# Las tablas LALR precompiladas (parsetab.py) se versionan junto a la gramática
+# y llevan `_grammar_hash`. Al arrancar solo se importan, en modo lectura y por
+# ruta (sin depender del directorio actual); el parser se construye la primera
+# vez que se accede a `parser`. Si la gramática cambió se generan las tablas en
+# memoria y se avisa: hay que regenerarlas con `python parser/parser.py --build-tables`.
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parsetab.py')
+DEBUG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser.out')
+
+
+def grammar_hash():
+    """Hash del texto de la gramática: tokens, precedencia y, en orden, el nombre y
+    el docstring de cada producción.
+
+    Se lee directamente de las funciones `p_*` del módulo, sin `ParserReflect`
+    (que repite en cada arranque el recorrido que `yacc` ya hace al construir).
+    Los espacios de los docstrings se normalizan: su sangrado cambia, por
+    ejemplo, con la versión de Python.
+    """
+    rules = sorted((f.__code__.co_firstlineno, name, f.__doc__ or '')
+                   for name, f in globals().items()
+                   if name.startswith('p_') and name != 'p_error' and callable(f))
+    parts = [repr(precedence), ' '.join(tokens)] + [f"{name}: {doc}" for _, name, doc in rules]
+    return hashlib.sha256(' '.join(' '.join(parts).split()).encode()).hexdigest()
+
+
+def load_tables():
+    """Importa parsetab.py por ruta sin ejecutar PLY; devuelve None si no existe o no carga."""
+    spec = importlib.util.spec_from_file_location('parsetab', TABLES_PATH)
+    if spec is None:
+        return None
+    tables = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(tables)
+    except (OSError, SyntaxError):
+        return None
+    return tables
+
+
+def _yacc(tabmodule, **kwargs):
+    return yacc.yacc(module=sys.modules[__name__], tabmodule=tabmodule, debug=False, **kwargs)
+
+
+def build_parser():
+    """Construye el parser desde las tablas precompiladas si siguen siendo válidas."""
+    tables = load_tables()
+    if tables is not None and getattr(tables, '_grammar_hash', None) == grammar_hash():
+        return _yacc(tables, optimize=True, write_tables=False, errorlog=yacc.NullLogger())
+    print("⚠️  parser/parsetab.py no corresponde a la gramática; se generan las tablas en memoria "
+          "(ejecuta python parser/parser.py --build-tables)", file=sys.stderr)
+    # un nombre de tabla que no existe obliga a PLY a generar las tablas sin leer ninguna
+    return _yacc('parsetab_' + grammar_hash()[:16], write_tables=False, errorlog=yacc.NullLogger())
+
+
+def build_tables(debug=True):
+    """Regenera parsetab.py (y parser.out si `debug`) a partir de la gramática actual."""
+    import tempfile
+
+    digest = grammar_hash()
+    name = 'parsetab_' + digest[:16]
+    with tempfile.TemporaryDirectory() as tmp:
+        yacc.yacc(module=sys.modules[__name__], tabmodule=name, outputdir=tmp,
+                  debug=debug, debugfile=DEBUG_PATH, write_tables=True)
+        with open(os.path.join(tmp, name + '.py'), encoding='utf-8') as fh:
+            source = fh.read()
+    source = source.replace(f"# {name}.py", "# parsetab.py", 1)
+    marker = "_lr_signature = "
+    source = source.replace(marker, f"_grammar_hash = {digest!r}\n\n{marker}", 1)
+    tmp_path = TABLES_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        fh.write(source)
+    os.replace(tmp_path, TABLES_PATH)
+
+
+# varios hilos (p. ej. un `SessionPool`) pueden pedir `parser` a la vez la primera vez
+_build_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # construcción diferida: `parser` no existe hasta que alguien lo usa
+    if name == 'parser':
+        with _build_lock:
+            value = globals().get('parser')
+            if value is None:
+                value = globals()['parser'] = build_parser()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # -----------------------------
 # Prueba del parser
@@ -169,8 +530,13 @@ if __name__ == "__main__":
     }
     """
 
-    # 🔧 Compilar parser una sola vez
-    parser = yacc.yacc(optimize=True, write_tables=False)
+    if '--build-tables' in sys.argv:
+        build_tables()
+        print(f"Tablas regeneradas en {TABLES_PATH}")
+        sys.exit(0)
+
+    # 🔧 Compilar parser una sola vez (desde parsetab.py)
+    parser = build_parser()
 
     print(Fore.CYAN + Style.BRIGHT + "\n🌳 Árbol Sintáctico Abstracto (AST) Generado:\n" + Style.RESET_ALL)
     tree = parser.parse(code, lexer=lexer)
@@ -6,9 +6,11 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'leftLOGIC_OPleftREL_OPleftPLUSMINUSleftTIMESDIVIDEASSIGN COMMA CONST DIVIDE ELSE FOR FUNCTION ID IF LBRACE LET LOGIC_OP LPAREN MINUS NUMBER PLUS RBRACE REL_OP RETURN RPAREN SEMICOLON TIMES VAR WHILEprogram : statement_liststatement_list : statement\n| statement_list statementstatement : assignment_stmt\n| expression_stmt\n| if_stmt\n| block_stmtexpression_stmt : expression SEMICOLONassignment_stmt : VAR ID ASSIGN expression SEMICOLON\n| LET ID ASSIGN expression SEMICOLON\n| CONST ID ASSIGN expression SEMICOLON\n| ID ASSIGN expression SEMICOLONblock_stmt : LBRACE statement_list RBRACEif_stmt : IF LPAREN expression RPAREN statement\n| IF LPAREN expression RPAREN statement ELSE statementexpression : expression PLUS expression\n| expression MINUS expression\n| expression TIMES expression\n| expression DIVIDE expression\n| expression REL_OP expression\n| expression LOGIC_OP expressionexpression : LPAREN expression RPARENexpression : NUMBER\n| ID'
+_grammar_hash = '5b6a3baa80b72694efef1193fba5a2288083e78d304e4af49650dc73ec688402'
+
+_lr_signature = 'leftLOGIC_OPleftREL_OPleftPLUSMINUSleftTIMESDIVIDEASSIGN COMMA CONST DIVIDE ELSE FOR FUNCTION ID IF LBRACE LET LOGIC_OP LPAREN MINUS NUMBER PLUS RBRACE REL_OP RETURN RPAREN SEMICOLON TIMES VAR WHILEprogram : statement_liststatement_list : statement\n                      | statement_list statementstatement : assignment_stmt\n                 | expression_stmt\n                 | if_stmt\n                 | block_stmtexpression_stmt : expression SEMICOLONassignment_stmt : VAR ID ASSIGN expression SEMICOLON\n                       | LET ID ASSIGN expression SEMICOLON\n                       | CONST ID ASSIGN expression SEMICOLON\n                       | ID ASSIGN expression SEMICOLONblock_stmt : LBRACE statement_list RBRACEif_stmt : IF LPAREN expression RPAREN statement\n               | IF LPAREN expression RPAREN statement ELSE statementexpression : expression PLUS expression\n                  | expression MINUS expression\n                  | expression TIMES expression\n                  | expression DIVIDE expression\n                  | expression REL_OP expression\n                  | expression LOGIC_OP expressionexpression : LPAREN expression RPARENexpression : NUMBER\n                  | IDstatement : error SEMICOLONstatement : error block_stmtblock_stmt : LBRACE error RBRACE\n                  | LBRACE statement_list error RBRACE'
     
-_lr_action_items = {'VAR':([0,2,3,4,5,6,7,15,17,20,32,45,47,50,51,52,53,54,55,56,],[8,8,-2,-4,-5,-6,-7,8,-3,-8,8,-13,-12,8,-9,-10,-11,-14,8,-15,]),'LET':([0,2,3,4,5,6,7,15,17,20,32,45,47,50,51,52,53,54,55,56,],[11,11,-2,-4,-5,-6,-7,11,-3,-8,11,-13,-12,11,-9,-10,-11,-14,11,-15,]),'CONST':([0,2,3,4,5,6,7,15,17,20,32,45,47,50,51,52,53,54,55,56,],[12,12,-2,-4,-5,-6,-7,12,-3,-8,12,-13,-12,12,-9,-10,-11,-14,12,-15,]),'ID':([0,2,3,4,5,6,7,8,11,12,14,15,17,19,20,21,22,23,24,25,26,29,32,33,41,42,45,47,50,51,52,53,54,55,56,],[9,9,-2,-4,-5,-6,-7,18,27,28,31,9,-3,31,-8,31,31,31,31,31,31,31,9,31,31,31,-13,-12,9,-9,-10,-11,-14,9,-15,]),'IF':([0,2,3,4,5,6,7,15,17,20,32,45,47,50,51,52,53,54,55,56,],[13,13,-2,-4,-5,-6,-7,13,-3,-8,13,-13,-12,13,-9,-10,-11,-14,13,-15,]),'LBRACE':([0,2,3,4,5,6,7,15,17,20,32,45,47,50,51,52,53,54,55,56,],[15,15,-2,-4,-5,-6,-7,15,-3,-8,15,-13,-12,15,-9,-10,-11,-14,15,-15,]),'LPAREN':([0,2,3,4,5,6,7,13,14,15,17,19,20,21,22,23,24,25,26,29,32,33,41,42,45,47,50,51,52,53,54,55,56,],[14,14,-2,-4,-5,-6,-7,29,14,14,-3,14,-8,14,14,14,14,14,14,14,14,14,14,14,-13,-12,14,-9,-10,-11,-14,14,-15,]),'NUMBER':([0,2,3,4,5,6,7,14,15,17,19,20,21,22,23,24,25,26,29,32,33,41,42,45,47,50,51,52,53,54,55,56,],[16,16,-2,-4,-5,-6,-7,16,16,-3,16,-8,16,16,16,16,16,16,16,16,16,16,16,-13,-12,16,-9,-10,-11,-14,16,-15,]),'$end':([1,2,3,4,5,6,7,17,20,45,47,51,52,53,54,56,],[0,-1,-2,-4,-5,-6,-7,-3,-8,-13,-12,-9,-10,-11,-14,-15,]),'RBRACE':([3,4,5,6,7,17,20,32,45,47,51,52,53,54,56,],[-2,-4,-5,-6,-7,-3,-8,45,-13,-12,-9,-10,-11,-14,-15,]),'ELSE':([4,5,6,7,20,45,47,51,52,53,54,56,],[-4,-5,-6,-7,-8,-13,-12,-9,-10,-11,55,-15,]),'ASSIGN':([9,18,27,28,],[19,33,41,42,]),'SEMICOLON':([9,10,16,31,34,35,36,37,38,39,40,44,46,48,49,],[-24,20,-23,-24,47,-16,-17,-18,-19,-20,-21,-22,51,52,53,]),'PLUS':([9,10,16,30,31,34,35,36,37,38,39,40,43,44,46,48,49,],[-24,21,-23,21,-24,21,-16,-17,-18,-19,21,21,21,-22,21,21,21,]),'MINUS':([9,10,16,30,31,34,35,36,37,38,39,40,43,44,46,48,49,],[-24,22,-23,22,-24,22,-16,-17,-18,-19,22,22,22,-22,22,22,22,]),'TIMES':([9,10,16,30,31,34,35,36,37,38,39,40,43,44,46,48,49,],[-24,23,-23,23,-24,23,23,23,-18,-19,23,23,23,-22,23,23,23,]),'DIVIDE':([9,10,16,30,31,34,35,36,37,38,39,40,43,44,46,48,49,],[-24,24,-23,24,-24,24,24,24,-18,-19,24,24,24,-22,24,24,24,]),'REL_OP':([9,10,16,30,31,34,35,36,37,38,39,40,43,44,46,48,49,],[-24,25,-23,25,-24,25,-16,-17,-18,-19,-20,25,25,-22,25,25,25,]),'LOGIC_OP':([9,10,16,30,31,34,35,36,37,38,39,40,43,44,46,48,49,],[-24,26,-23,26,-24,26,-16,-17,-18,-19,-20,-21,26,-22,26,26,26,]),'RPAREN':([16,30,31,35,36,37,38,39,40,43,44,],[-23,44,-24,-16,-17,-18,-19,-20,-21,50,-22,]),}
+_lr_action_items = {'error':([0,2,3,4,5,6,7,16,18,19,20,23,35,49,51,53,56,57,58,59,60,61,62,63,],[8,8,-2,-4,-5,-6,-7,36,-3,-25,-26,-8,50,-13,-27,-12,8,-28,-9,-10,-11,-14,8,-15,]),'VAR':([0,2,3,4,5,6,7,16,18,19,20,23,35,49,51,53,56,57,58,59,60,61,62,63,],[9,9,-2,-4,-5,-6,-7,9,-3,-25,-26,-8,9,-13,-27,-12,9,-28,-9,-10,-11,-14,9,-15,]),'LET':([0,2,3,4,5,6,7,16,18,19,20,23,35,49,51,53,56,57,58,59,60,61,62,63,],[12,12,-2,-4,-5,-6,-7,12,-3,-25,-26,-8,12,-13,-27,-12,12,-28,-9,-10,-11,-14,12,-15,]),'CONST':([0,2,3,4,5,6,7,16,18,19,20,23,35,49,51,53,56,57,58,59,60,61,62,63,],[13,13,-2,-4,-5,-6,-7,13,-3,-25,-26,-8,13,-13,-27,-12,13,-28,-9,-10,-11,-14,13,-15,]),'ID':([0,2,3,4,5,6,7,9,12,13,15,16,18,19,20,22,23,24,25,26,27,28,29,32,35,37,45,46,49,51,53,56,57,58,59,60,61,62,63,],[10,10,-2,-4,-5,-6,-7,21,30,31,34,10,-3,-25,-26,34,-8,34,34,34,34,34,34,34,10,34,34,34,-13,-27,-12,10,-28,-9,-10,-11,-14,10,-15,]),'IF':([0,2,3,4,5,6,7,16,18,19,20,23,35,49,51,53,56,57,58,59,60,61,62,63,],[14,14,-2,-4,-5,-6,-7,14,-3,-25,-26,-8,14,-13,-27,-12,14,-28,-9,-10,-11,-14,14,-15,]),'LBRACE':([0,2,3,4,5,6,7,8,16,18,19,20,23,35,36,49,50,51,53,56,57,58,59,60,61,62,63,],[16,16,-2,-4,-5,-6,-7,16,16,-3,-25,-26,-8,16,16,-13,16,-27,-12,16,-28,-9,-10,-11,-14,16,-15,]),'LPAREN':([0,2,3,4,5,6,7,14,15,16,18,19,20,22,23,24,25,26,27,28,29,32,35,37,45,46,49,51,53,56,57,58,59,60,61,62,63,],[15,15,-2,-4,-5,-6,-7,32,15,15,-3,-25,-26,15,-8,15,15,15,15,15,15,15,15,15,15,15,-13,-27,-12,15,-28,-9,-10,-11,-14,15,-15,]),'NUMBER':([0,2,3,4,5,6,7,15,16,18,19,20,22,23,24,25,26,27,28,29,32,35,37,45,46,49,51,53,56,57,58,59,60,61,62,63,],[17,17,-2,-4,-5,-6,-7,17,17,-3,-25,-26,17,-8,17,17,17,17,17,17,17,17,17,17,17,-13,-27,-12,17,-28,-9,-10,-11,-14,17,-15,]),'$end':([1,2,3,4,5,6,7,18,19,20,23,49,51,53,57,58,59,60,61,63,],[0,-1,-2,-4,-5,-6,-7,-3,-25,-26,-8,-13,-27,-12,-28,-9,-10,-11,-14,-15,]),'RBRACE':([3,4,5,6,7,18,19,20,23,35,36,49,50,51,53,57,58,59,60,61,63,],[-2,-4,-5,-6,-7,-3,-25,-26,-8,49,51,-13,57,-27,-12,-28,-9,-10,-11,-14,-15,]),'ELSE':([4,5,6,7,19,20,23,49,51,53,57,58,59,60,61,63,],[-4,-5,-6,-7,-25,-26,-8,-13,-27,-12,-28,-9,-10,-11,62,-15,]),'SEMICOLON':([8,10,11,17,34,36,38,39,40,41,42,43,44,48,50,52,54,55,],[19,-24,23,-23,-24,19,53,-16,-17,-18,-19,-20,-21,-22,19,58,59,60,]),'ASSIGN':([10,21,30,31,],[22,37,45,46,]),'PLUS':([10,11,17,33,34,38,39,40,41,42,43,44,47,48,52,54,55,],[-24,24,-23,24,-24,24,-16,-17,-18,-19,24,24,24,-22,24,24,24,]),'MINUS':([10,11,17,33,34,38,39,40,41,42,43,44,47,48,52,54,55,],[-24,25,-23,25,-24,25,-16,-17,-18,-19,25,25,25,-22,25,25,25,]),'TIMES':([10,11,17,33,34,38,39,40,41,42,43,44,47,48,52,54,55,],[-24,26,-23,26,-24,26,26,26,-18,-19,26,26,26,-22,26,26,26,]),'DIVIDE':([10,11,17,33,34,38,39,40,41,42,43,44,47,48,52,54,55,],[-24,27,-23,27,-24,27,27,27,-18,-19,27,27,27,-22,27,27,27,]),'REL_OP':([10,11,17,33,34,38,39,40,41,42,43,44,47,48,52,54,55,],[-24,28,-23,28,-24,28,-16,-17,-18,-19,-20,28,28,-22,28,28,28,]),'LOGIC_OP':([10,11,17,33,34,38,39,40,41,42,43,44,47,48,52,54,55,],[-24,29,-23,29,-24,29,-16,-17,-18,-19,-20,-21,29,-22,29,29,29,]),'RPAREN':([17,33,34,39,40,41,42,43,44,47,48,],[-23,48,-24,-16,-17,-18,-19,-20,-21,56,-22,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +19,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,15,],[2,32,]),'statement':([0,2,15,32,50,55,],[3,17,3,17,54,56,]),'assignment_stmt':([0,2,15,32,50,55,],[4,4,4,4,4,4,]),'expression_stmt':([0,2,15,32,50,55,],[5,5,5,5,5,5,]),'if_stmt':([0,2,15,32,50,55,],[6,6,6,6,6,6,]),'block_stmt':([0,2,15,32,50,55,],[7,7,7,7,7,7,]),'expression':([0,2,14,15,19,21,22,23,24,25,26,29,32,33,41,42,50,55,],[10,10,30,10,34,35,36,37,38,39,40,43,10,46,48,49,10,10,]),}
+_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,16,],[2,35,]),'statement':([0,2,16,35,56,62,],[3,18,3,18,61,63,]),'assignment_stmt':([0,2,16,35,56,62,],[4,4,4,4,4,4,]),'expression_stmt':([0,2,16,35,56,62,],[5,5,5,5,5,5,]),'if_stmt':([0,2,16,35,56,62,],[6,6,6,6,6,6,]),'block_stmt':([0,2,8,16,35,36,50,56,62,],[7,7,20,7,7,20,20,7,7,]),'expression':([0,2,15,16,22,24,25,26,27,28,29,32,35,37,45,46,56,62,],[11,11,33,11,38,39,40,41,42,43,44,47,11,52,54,55,11,11,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,28 +29,32 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> program","S'",1,None,None,None),
-  ('program -> statement_list','program',1,'p_program','parser.py',71),
-  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',75),
-  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',76),
-  ('statement -> assignment_stmt','statement',1,'p_statement','parser.py',87),
-  ('statement -> expression_stmt','statement',1,'p_statement','parser.py',88),
-  ('statement -> if_stmt','statement',1,'p_statement','parser.py',89),
-  ('statement -> block_stmt','statement',1,'p_statement','parser.py',90),
-  ('expression_stmt -> expression SEMICOLON','expression_stmt',2,'p_expression_stmt','parser.py',94),
-  ('assignment_stmt -> VAR ID ASSIGN expression SEMICOLON','assignment_stmt',5,'p_assignment_stmt','parser.py',98),
-  ('assignment_stmt -> LET ID ASSIGN expression SEMICOLON','assignment_stmt',5,'p_assignment_stmt','parser.py',99),
-  ('assignment_stmt -> CONST ID ASSIGN expression SEMICOLON','assignment_stmt',5,'p_assignment_stmt','parser.py',100),
-  ('assignment_stmt -> ID ASSIGN expression SEMICOLON','assignment_stmt',4,'p_assignment_stmt','parser.py',101),
-  ('block_stmt -> LBRACE statement_list RBRACE','block_stmt',3,'p_block_stmt','parser.py',108),
-  ('if_stmt -> IF LPAREN expression RPAREN statement','if_stmt',5,'p_if_stmt','parser.py',112),
-  ('if_stmt -> IF LPAREN expression RPAREN statement ELSE statement','if_stmt',7,'p_if_stmt','parser.py',113),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',123),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',124),
-  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',125),
-  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser.py',126),
-  ('expression -> expression REL_OP expression','expression',3,'p_expression_binop','parser.py',127),
-  ('expression -> expression LOGIC_OP expression','expression',3,'p_expression_binop','parser.py',128),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',132),
-  ('expression -> NUMBER','expression',1,'p_expression_terminals','parser.py',136),
-  ('expression -> ID','expression',1,'p_expression_terminals','parser.py',137),
+  ('program -> statement_list','program',1,'p_program','parser.py',200),
+  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',204),
+  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',205),
+  ('statement -> assignment_stmt','statement',1,'p_statement','parser.py',217),
+  ('statement -> expression_stmt','statement',1,'p_statement','parser.py',218),
+  ('statement -> if_stmt','statement',1,'p_statement','parser.py',219),
+  ('statement -> block_stmt','statement',1,'p_statement','parser.py',220),
+  ('expression_stmt -> expression SEMICOLON','expression_stmt',2,'p_expression_stmt','parser.py',224),
+  ('assignment_stmt -> VAR ID ASSIGN expression SEMICOLON','assignment_stmt',5,'p_assignment_stmt','parser.py',228),
+  ('assignment_stmt -> LET ID ASSIGN expression SEMICOLON','assignment_stmt',5,'p_assignment_stmt','parser.py',229),
+  ('assignment_stmt -> CONST ID ASSIGN expression SEMICOLON','assignment_stmt',5,'p_assignment_stmt','parser.py',230),
+  ('assignment_stmt -> ID ASSIGN expression SEMICOLON','assignment_stmt',4,'p_assignment_stmt','parser.py',231),
+  ('block_stmt -> LBRACE statement_list RBRACE','block_stmt',3,'p_block_stmt','parser.py',240),
+  ('if_stmt -> IF LPAREN expression RPAREN statement','if_stmt',5,'p_if_stmt','parser.py',248),
+  ('if_stmt -> IF LPAREN expression RPAREN statement ELSE statement','if_stmt',7,'p_if_stmt','parser.py',249),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',261),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',262),
+  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',263),
+  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser.py',264),
+  ('expression -> expression REL_OP expression','expression',3,'p_expression_binop','parser.py',265),
+  ('expression -> expression LOGIC_OP expression','expression',3,'p_expression_binop','parser.py',266),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',271),
+  ('expression -> NUMBER','expression',1,'p_expression_terminals','parser.py',275),
+  ('expression -> ID','expression',1,'p_expression_terminals','parser.py',276),
+  ('statement -> error SEMICOLON','statement',2,'p_statement_error','parser.py',289),
+  ('statement -> error block_stmt','statement',2,'p_statement_error_block','parser.py',293),
+  ('block_stmt -> LBRACE error RBRACE','block_stmt',3,'p_block_stmt_error','parser.py',297),
+  ('block_stmt -> LBRACE statement_list error RBRACE','block_stmt',4,'p_block_stmt_error','parser.py',298),
 ]
@@ -0,0 +1,181 @@
+import sys
+import os
+import importlib.util
+import threading
+
+# Cargar dinámicamente lexer.py y parser.py desde la raíz del repo
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+lexer_path = os.path.join(repo_root, 'lexer', 'lexer.py')
+spec_lexer = importlib.util.spec_from_file_location('lexer', lexer_path)
+lexer_mod = importlib.util.module_from_spec(spec_lexer)
+sys.modules['lexer'] = lexer_mod
+spec_lexer.loader.exec_module(lexer_mod)
+
+parser_path = os.path.join(repo_root, 'parser', 'parser.py')
+spec_parser = importlib.util.spec_from_file_location('parser', parser_path)
+parser_mod = importlib.util.module_from_spec(spec_parser)
+sys.modules['parser'] = parser_mod
+spec_parser.loader.exec_module(parser_mod)
+
+
+def parse(code):
+    lexer = lexer_mod.lexer.clone()
+    lexer.lineno = 1
+    return parser_mod.parser.parse(code, lexer=lexer)
+
+
+def walk(node):
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        yield n
+        stack.extend(n.children)
+
+
+def test_nodes_are_slotted_and_leaves_share_children():
+    tree = parse("var x = 1 + y;")
+    for node in walk(tree):
+        assert not hasattr(node, '__dict__')
+    leaves = [n for n in walk(tree) if not n.children]
+    assert len(leaves) == 2
+    assert all(leaf.children is parser_mod.EMPTY_CHILDREN for leaf in leaves)
+    # los operadores de dos caracteres son un único objeto por operador
+    a, b = parse("x <= 1; y <= 2;").children[0].children
+    assert a.children[0].value is b.children[0].value
+
+
+def test_packed_spans_read_and_write_like_attributes():
+    node = parser_mod.Node("identifier", value="x")
+    assert (node.start, node.end, node.lineno) == (-1, -1, 0)
+    node.end = 2 ** 39
+    node.start = 7
+    node.lineno = 123456
+    assert (node.start, node.end, node.lineno) == (7, 2 ** 39, 123456)
+    node.move(-3, 2)
+    node.start += 1
+    assert (node.start, node.end, node.lineno) == (5, 2 ** 39 - 3, 123458)
+    # un nodo sin posición no se desplaza (los campos a 0 no pueden tomar prestado)
+    unplaced = parser_mod.Node("error")
+    unplaced.move(-3, -1)
+    assert (unplaced.start, unplaced.end, unplaced.lineno) == (-1, -1, 0)
+
+
+def test_spans_point_at_source_text():
+    code = (
+        "var x = 10;\n"
+        "if (x + 5 > 007) {\n"
+        "    x = x * 2;\n"
+        "} else y;\n"
+    )
+    tree = parse(code)
+    stmts = tree.children[0].children
+    decl, if_else = stmts
+
+    assert code[decl.start:decl.end] == "var x = 10;"
+    assert decl.lineno == 1
+    assert code[if_else.start:if_else.end] == code[code.index("if"):].rstrip("\n")
+    cond, block, alt = if_else.children
+    assert code[cond.start:cond.end] == "x + 5 > 007"
+    assert code[block.start:block.end] == "{\n    x = x * 2;\n}"
+    assert block.lineno == 2
+    assert block.children[0].lineno == 3
+    assert code[alt.start:alt.end] == "y;"
+    assert (tree.start, tree.end) == (0, len(code) - 1)
+
+
+def test_prebuilt_tables_match_grammar():
+    # si falla, regenerar con: python parser/parser.py --build-tables
+    tables = parser_mod.load_tables()
+    assert tables is not None
+    assert tables._grammar_hash == parser_mod.grammar_hash()
+
+
+def test_parser_is_built_lazily_without_writing_files():
+    spec = importlib.util.spec_from_file_location('parser_lazy', parser_path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules['parser_lazy'] = mod
+    before = {name: os.path.getmtime(os.path.join(repo_root, 'parser', name))
+              for name in ('parsetab.py', 'parser.out')}
+    try:
+        spec.loader.exec_module(mod)
+        assert 'parser' not in vars(mod)
+        tree = mod.parser.parse("var x = 1;", lexer=lexer_mod.lexer.clone())
+        assert tree.type == 'program'
+        assert 'parser' in vars(mod)
+    finally:
+        del sys.modules['parser_lazy']
+    after = {name: os.path.getmtime(os.path.join(repo_root, 'parser', name)) for name in before}
+    assert after == before
+
+
+def test_concurrent_first_use_builds_one_parser():
+    spec = importlib.util.spec_from_file_location('parser_threads', parser_path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules['parser_threads'] = mod
+    try:
+        spec.loader.exec_module(mod)
+        builds = []
+        build = mod.build_parser
+        mod.build_parser = lambda: builds.append(1) or build()
+        barrier = threading.Barrier(4)
+        seen = []
+
+        def use():
+            barrier.wait()
+            seen.append(mod.parser)
+
+        threads = [threading.Thread(target=use) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(builds) == 1
+        assert len({id(p) for p in seen}) == 1
+    finally:
+        del sys.modules['parser_threads']
+
+
+def parse_with_errors(code):
+    lexer = lexer_mod.lexer.clone()
+    lexer.lineno = 1
+    return parser_mod.parse_with_errors(parser_mod.parser, code, lexer)
+
+
+def test_recovery_reports_every_error_and_keeps_valid_statements():
+    code = (
+        "var a = 1;\n"
+        "var b = (2;\n"
+        "if (a > 1 { c = a; }\n"
+        "{ d = 1; e = }\n"
+        "var f = a +;\n"
+        "var g = 3;\n"
+    )
+    tree, errors = parse_with_errors(code)
+    assert [(e.lineno, e.token_type) for e in errors] == [(2, 'SEMICOLON'), (3, 'LBRACE'), (4, 'RBRACE'), (5, 'SEMICOLON')]
+    assert errors[1].to_dict()["value"] == "{"
+    top = tree.children[0].children
+    assert [n.type for n in top] == ['declaration', 'error', 'error', 'statement_list', 'error', 'declaration']
+    # `if (a > 1 {`: se descarta la cabecera y se parsea el bloque
+    assert top[2].children[0].children[0].value == 'c'
+    # `{ d = 1; e = }`: el bloque conserva lo anterior al error
+    assert [n.type for n in top[3].children] == ['assignment', 'error']
+    assert code[top[3].start:top[3].end] == "{ d = 1; e = }"
+
+
+def test_unexpected_eof_keeps_complete_statements():
+    tree, errors = parse_with_errors("var a = 1;\n{ b = 2;")
+    assert [e.message for e in errors] == ["Error de sintaxis: fin de archivo inesperado"]
+    assert [n.type for n in tree.children[0].children] == ['declaration', 'error']
+    # el nodo `error` cubre la sentencia sin terminar
+    error = tree.children[0].children[-1]
+    assert (error.start, error.end, error.lineno) == (11, 19, 2)
+    # también cuando PLY ya descartó todos los tokens: toma la posición del error
+    tree, _ = parse_with_errors("= ;")
+    error = tree.children[0].children[-1]
+    assert (error.type, error.start, error.end, error.lineno) == ('error', 0, 1, 1)
+
+
+def test_parse_without_collector_prints_errors(capsys):
+    assert parse("var x = (1;").children[0].children[0].type == 'error'
+    assert "Error de sintaxis en ';'" in capsys.readouterr().out